@@ -34,3 +34,10 @@ CREATE TABLE IF NOT EXISTS llm_inspire_results (
     model_name TEXT,
     PRIMARY KEY (source, problem_id, locale)
 );
+
+CREATE TABLE IF NOT EXISTS api_cache (
+    cache_key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    fetched_at INTEGER NOT NULL,
+    validator TEXT
+);
@@ -1,13 +1,64 @@
 import asyncio
+import contextlib
+import contextvars
+import email.utils
 import json
 import logging
+import sqlite3
 import time
-from urllib.parse import quote
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+from urllib.parse import quote, urljoin
 
 import aiohttp
 
+from bot.utils import codec, compression, deadline, httpx_session
+from bot.utils.batching import MicroBatcher
+from bot.utils.cache import PrefetchPool, TTLCache
+from bot.utils.cassette import RecordingSession, ReplaySession
+from bot.utils.config import ApiClientConfig
+from bot.utils.database import ApiCacheDatabaseManager
+from bot.utils.httpx_session import HttpxSession
+from bot.utils.metrics import EndpointMetrics
+from bot.utils.payloads import problem_record, similar_payload
+from bot.utils.problem_refs import normalize_query, parse_problem_ref
+from bot.utils.resilience import (
+    AdaptiveLimiter,
+    CircuitBreaker,
+    LatencyWindow,
+    PriorityLane,
+    RateLimiter,
+    RetryBudget,
+    RetryPolicy,
+)
+from bot.utils.routing import Replica, ReplicaRouter
+from bot.utils.tag_index import TagIndex
+from bot.utils.ui_constants import SOURCE_LABELS
+
 logger = logging.getLogger("api_client")
 
+# Hours ahead of UTC at which each LeetCode domain's daily challenge rolls over.
+_DAILY_UTC_OFFSETS = {"com": 0, "cn": 8}
+
+# Problem sources with their own tag vocabularies; "all" searches their union.
+TAG_SOURCES = tuple(SOURCE_LABELS)
+
+LANE_INTERACTIVE = "interactive"
+LANE_BACKGROUND = "background"
+
+_current_lane: contextvars.ContextVar[str] = contextvars.ContextVar("api_lane", default=LANE_INTERACTIVE)
+
+
+@contextlib.contextmanager
+def traffic_lane(lane: str):
+    """Route API requests made inside this block (and tasks it spawns) through ``lane``."""
+    token = _current_lane.set(lane)
+    try:
+        yield
+    finally:
+        _current_lane.reset(token)
+
 
 class ApiError(Exception):
     def __init__(self, status: int, detail: str):
@@ -17,8 +68,16 @@ class ApiError(Exception):
 
 
 class ApiProcessingError(Exception):
-    def __init__(self, detail: str = "Resource is being processed"):
+    def __init__(
+        self,
+        detail: str = "Resource is being processed",
+        *,
+        retry_after: float | None = None,
+        location: str | None = None,
+    ):
         self.detail = detail
+        self.retry_after = retry_after
+        self.location = location
         super().__init__(detail)
 
 
@@ -53,57 +112,649 @@ class ApiEmbeddingTimeoutError(Exception):
 
 class OjApiClient:
     _TAGS_CACHE_TTL = 86400
+    _HEDGED_FAMILIES = frozenset({"problems", "resolve", "daily"})
 
-    def __init__(self, base_url: str, token: str | None = None, timeout: int = 10):
+    def __init__(
+        self,
+        base_url: str,
+        token: str | None = None,
+        timeout: int = 10,
+        *,
+        config: ApiClientConfig | None = None,
+        cache_db: ApiCacheDatabaseManager | None = None,
+    ):
         self._base_url = base_url.rstrip("/")
         self._token = token if token else None
         self._timeout = timeout
+        self._config = config or ApiClientConfig()
         self._session: aiohttp.ClientSession | None = None
+        # base_url first, then any extra replicas; a router is only set up for more than one.
+        self._endpoints = list(dict.fromkeys([self._base_url, *(url.rstrip("/") for url in self._config.replicas)]))
+        self._router: ReplicaRouter | None = None
+        self._probe_task: asyncio.Task | None = None
         self._inflight: dict[str, asyncio.Future] = {}
         self._tags_cache: dict[str, tuple[float, list[str]]] = {}
+        self._tag_indexes: dict[str, tuple[tuple[list[str], ...], TagIndex]] = {}
+        self._cache_db = cache_db
+        self._problem_cache = self._new_response_cache()
+        self._resolve_cache = self._new_response_cache()
+        self._daily_cache = self._new_response_cache()
+        # The current daily changes at rollover, so it is never served stale (see get_daily).
+        self._current_daily_cache = TTLCache(8, self._config.daily_cache_ttl)
+        self._negative_cache = TTLCache(self._config.negative_cache_size, self._config.negative_cache_ttl)
+        # Embedding searches are slow server-side; results are kept per (target, threshold).
+        self._similar_cache = TTLCache(self._config.similar_cache_size, self._config.similar_cache_ttl)
+        self._random_pool: PrefetchPool | None = None
+        if self._config.random_pool_batch > 1:
+            self._random_pool = PrefetchPool(
+                self._refill_random_pool,
+                low_water=self._config.random_pool_low_water,
+                max_keys=self._config.random_pool_max_keys,
+                idle_ttl=self._config.random_pool_idle_ttl,
+            )
+        self._problem_batcher: MicroBatcher | None = None
+        self._resolve_batcher: MicroBatcher | None = None
+        if self._config.batch_window > 0:
+            window, max_size = self._config.batch_window, self._config.batch_max_size
+            self._problem_batcher = MicroBatcher(self._dispatch_problems, window=window, max_size=max_size)
+            self._resolve_batcher = MicroBatcher(self._dispatch_resolves, window=window, max_size=max_size)
+        self._refresh_tasks: dict[str, asyncio.Task] = {}
+        self._rate_limiter = RateLimiter(
+            self._config.rate_limit,
+            self._config.rate_limit_burst,
+            self._config.rate_limit_families,
+        )
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._retry_policy = RetryPolicy(
+            self._config.retry_max_attempts,
+            self._config.retry_base_delay,
+            self._config.retry_max_delay,
+            RetryBudget(self._config.retry_budget_ratio, self._config.retry_budget_min_retries),
+        )
+        self._latencies: dict[str, LatencyWindow] = {}
+        self._hedge_budget = RetryBudget(self._config.hedge_budget_ratio, min_retries=0)
+        self._hedge_counts = {"sent": 0, "won": 0}
+        self._poll_counts = {"started": 0, "polls": 0, "ready": 0, "gave_up": 0}
+        self._metrics: dict[str, EndpointMetrics] = {}
+        self._warm_task: asyncio.Task | None = None
+        self._warming: asyncio.Task | None = None
+        self._lanes = {
+            LANE_INTERACTIVE: PriorityLane(LANE_INTERACTIVE, self._config.interactive_concurrency),
+            LANE_BACKGROUND: PriorityLane(LANE_BACKGROUND, self._config.background_concurrency),
+        }
+        # Caps all upstream requests in flight; pinned at its initial value unless adaptive.
+        adaptive = self._config.adaptive_concurrency
+        self._concurrency = AdaptiveLimiter(
+            self._config.concurrency_initial,
+            min_limit=self._config.concurrency_min if adaptive else self._config.concurrency_initial,
+            max_limit=self._config.concurrency_max if adaptive else self._config.concurrency_initial,
+            tolerance=self._config.concurrency_latency_tolerance,
+            backoff=self._config.concurrency_backoff,
+        )
+        self._last_request_at = 0.0
 
-    async def start(self):
-        if self._session and not self._session.closed:
-            return
+    def _open_session(
+        self, base_url: str | None = None
+    ) -> aiohttp.ClientSession | HttpxSession | RecordingSession | ReplaySession:
+        mode = self._config.cassette_mode
+        if mode == "replay":
+            logger.info("Replaying API responses from cassette %s", self._config.cassette_path)
+            return ReplaySession(self._config.cassette_path, latency=self._config.cassette_latency)
         headers = {"Accept": "application/json"}
         if self._token:
             headers["Authorization"] = f"Bearer {self._token}"
-        connector = aiohttp.TCPConnector(limit=50, limit_per_host=10, keepalive_timeout=30)
-        base_url = self._base_url.rstrip("/") + "/"
-        self._session = aiohttp.ClientSession(
+        # Bodies are decompressed by _decode so both sizes can be measured and large ones offloaded.
+        headers["Accept-Encoding"] = compression.accept_encoding() if self._config.compression else "identity"
+        base_url = (base_url or self._base_url).rstrip("/") + "/"
+        session = self._open_transport(base_url, headers)
+        if mode == "record":
+            logger.info("Recording API responses to cassette %s", self._config.cassette_path)
+            return RecordingSession(session, self._config.cassette_path)
+        return session
+
+    def _open_transport(self, base_url: str, headers: dict[str, str]) -> aiohttp.ClientSession | HttpxSession:
+        if self._config.transport == "http2":
+            if httpx_session.available():
+                return HttpxSession(
+                    base_url,
+                    headers=headers,
+                    timeout=self._timeout,
+                    max_connections=self._config.connector_limit,
+                    keepalive_timeout=self._config.keepalive_timeout,
+                )
+            logger.warning("HTTP/2 transport needs httpx[http2]; falling back to HTTP/1.1")
+        connector = aiohttp.TCPConnector(
+            limit=self._config.connector_limit,
+            limit_per_host=self._config.connector_limit_per_host,
+            keepalive_timeout=self._config.keepalive_timeout,
+            use_dns_cache=self._config.dns_cache_ttl > 0,
+            ttl_dns_cache=self._config.dns_cache_ttl,
+        )
+        return aiohttp.ClientSession(
             base_url=base_url,
             headers=headers,
             connector=connector,
             timeout=aiohttp.ClientTimeout(total=self._timeout),
+            auto_decompress=False,
+        )
+
+    def _new_response_cache(self) -> TTLCache:
+        return TTLCache(
+            self._config.problem_cache_size,
+            self._config.problem_cache_ttl,
+            self._config.problem_cache_stale_ttl,
         )
-        logger.info("API client session started (base_url=%s)", self._base_url)
+
+    async def start(self):
+        if self._session and not self._session.closed:
+            return
+        self._session = self._open_session()
+        if len(self._endpoints) > 1 and self._config.cassette_mode != "replay":
+            replicas = [Replica(self._base_url, self._session)]
+            replicas += [Replica(url, self._open_session(url)) for url in self._endpoints[1:]]
+            self._router = ReplicaRouter(
+                replicas,
+                alpha=self._config.routing_ewma_alpha,
+                eject_after=self._config.routing_eject_after,
+                eject_duration=self._config.routing_eject_duration,
+            )
+            if self._config.routing_probe_interval > 0:
+                self._probe_task = asyncio.create_task(self._probe_replicas())
+        if self._cache_db is not None:
+            try:
+                # Tag catalogs are served stale until refreshed and overwritten in place, so they are never pruned.
+                self._cache_db.prune(
+                    self._config.problem_cache_ttl + self._config.problem_cache_stale_ttl, keep_prefixes=("tags:",)
+                )
+            except sqlite3.Error as e:
+                logger.warning("Failed to prune persistent API cache: %s", e)
+        if self._config.warm_connections > 0 and self._config.cassette_mode != "replay":
+            self._warm_task = asyncio.create_task(self._keep_warm())
+        logger.info("API client session started (endpoints=%s)", ", ".join(self._endpoints))
 
     async def close(self):
+        if self._warm_task is not None:
+            self._warm_task.cancel()
+            self._warm_task = None
+        for task in list(self._refresh_tasks.values()):
+            task.cancel()
+        self._refresh_tasks.clear()
+        if self._random_pool is not None:
+            self._random_pool.close()
+        for batcher in (self._problem_batcher, self._resolve_batcher):
+            if batcher is not None:
+                batcher.close()
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            self._probe_task = None
+        if self._router is not None:
+            for replica in self._router.replicas:
+                if replica.session is not self._session and not replica.session.closed:
+                    await replica.session.close()
+            self._router = None
         if self._session and not self._session.closed:
             await self._session.close()
             logger.info("API client session closed")
 
+    # -- Connection warming --
+
+    async def warm_up(self, connections: int | None = None) -> int:
+        """Open pooled connections ahead of traffic with lightweight HEAD requests.
+
+        Pings bypass rate limiting, circuit breakers and metrics. Concurrent calls
+        share one warm-up. Returns how many pings succeeded; failures are only logged.
+        """
+        if not self._session or self._session.closed:
+            return 0
+        if self._warming is None or self._warming.done():
+            self._warming = asyncio.create_task(self._ping_pool(connections))
+        return await asyncio.shield(self._warming)
+
+    def _sessions(self) -> list:
+        """Return the session of every replica, or just the one session without replicas."""
+        if self._router is None:
+            return [self._session]
+        return [replica.session for replica in self._router.replicas]
+
+    async def _ping_pool(self, connections: int | None) -> int:
+        count = self._config.warm_connections if connections is None else connections
+        timeout = aiohttp.ClientTimeout(total=5)
+
+        async def ping(session) -> bool:
+            try:
+                async with session.request("HEAD", self._config.warm_path, timeout=timeout) as resp:
+                    await resp.read()
+                return True
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.debug("Connection warm-up ping failed: %s", e)
+                return False
+
+        # Concurrent pings make the pool open one connection per ping.
+        results = await asyncio.gather(*(ping(session) for session in self._sessions() for _ in range(count)))
+        return sum(results)
+
+    async def _keep_warm(self) -> None:
+        """Warm the pool at startup, then ping whenever the client has been idle for ``warm_interval``."""
+        await self.warm_up()
+        interval = self._config.warm_interval
+        if interval <= 0:
+            return
+        while True:
+            await asyncio.sleep(interval)
+            if time.monotonic() - self._last_request_at >= interval:
+                await self.warm_up()
+
+    # -- Replica routing --
+
+    async def _probe_replicas(self) -> None:
+        """HEAD every replica each ``routing_probe_interval`` so failed ones rejoin once they answer again."""
+        while True:
+            await asyncio.sleep(self._config.routing_probe_interval)
+            router = self._router
+            if router is None:
+                return
+            await asyncio.gather(*(self._probe_replica(router, replica) for replica in router.replicas))
+
+    async def _probe_replica(self, router: ReplicaRouter, replica: Replica) -> None:
+        timeout = aiohttp.ClientTimeout(total=5)
+        try:
+            async with replica.session.request("HEAD", self._config.routing_probe_path, timeout=timeout) as resp:
+                await resp.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.debug("Health probe of %s failed: %s", replica.url, e)
+            router.record_failure(replica)
+            return
+        if resp.status >= 500:
+            router.record_failure(replica)
+        elif replica.consecutive_failures:
+            logger.info("oj-api replica %s is answering again", replica.url)
+            router.mark_up(replica)
+
+    @contextlib.asynccontextmanager
+    async def _routed_request(self, method: str, path: str, **kwargs):
+        """Send a request to the best replica, failing over to the others when one cannot be reached.
+
+        Any GET that fails with a connection error moves on; other methods only
+        when the connection was never established, so they are not sent twice.
+        5xx responses, timeouts and broken connections count against the replica.
+        """
+        router = self._router
+        failover = aiohttp.ClientConnectionError if method.upper() == "GET" else aiohttp.ClientConnectorError
+        tried: list[Replica] = []
+        while True:
+            replica = router.pick(exclude=tried)
+            tried.append(replica)
+            replica.inflight += 1
+            started = time.monotonic()
+            try:
+                async with contextlib.AsyncExitStack() as stack:
+                    try:
+                        resp = await stack.enter_async_context(replica.session.request(method, path, **kwargs))
+                    except failover as e:
+                        router.record_failure(replica)
+                        if len(tried) >= len(router.replicas):
+                            raise
+                        logger.warning("oj-api replica %s unreachable, failing over: %s", replica.url, e)
+                        continue
+                    except (aiohttp.ClientError, asyncio.TimeoutError):
+                        router.record_failure(replica)
+                        raise
+                    failed: bool | None = resp.status >= 500
+                    try:
+                        yield resp
+                    except (aiohttp.ClientError, asyncio.TimeoutError):
+                        failed = True
+                        raise
+                    except asyncio.CancelledError:
+                        # e.g. the losing side of a hedge; says nothing about the replica
+                        failed = None
+                        raise
+                    finally:
+                        if failed:
+                            router.record_failure(replica)
+                        elif failed is not None:
+                            router.record_success(replica, time.monotonic() - started)
+                    return
+            finally:
+                replica.inflight -= 1
+
     # -- HTTP layer --
 
-    async def _do_request(self, method: str, path: str, **kwargs) -> dict | None:
+    @staticmethod
+    def _endpoint_family(path: str) -> str:
+        """Group a request path by its top-level endpoint, e.g. ``problems/leetcode/1`` -> ``problems``."""
+        return path.lstrip("/").split("/", 1)[0].split("?", 1)[0]
+
+    @staticmethod
+    def _parse_retry_after(value: str | None, default: float = 5.0) -> float:
+        if not value:
+            return default
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return default
+        return max(0.0, retry_at.timestamp() - time.time())
+
+    def _breaker(self, family: str) -> CircuitBreaker:
+        breaker = self._breakers.get(family)
+        if breaker is None:
+            breaker = self._breakers[family] = CircuitBreaker(
+                self._config.circuit_failure_threshold,
+                self._config.circuit_recovery_timeout,
+            )
+        return breaker
+
+    async def _do_request(self, method: str, path: str, *, meta: dict | None = None, **kwargs) -> dict | None:
         assert self._session, "Call start() before making requests"
+        family = self._endpoint_family(path)
+        breaker = self._breaker(family)
+        if not breaker.allow_request():
+            detail = f"{family} endpoints unavailable (circuit open, retry in {breaker.retry_in:.0f}s)"
+            if family == "similar":
+                raise ApiEmbeddingError(detail)
+            raise ApiNetworkError(detail)
+        try:
+            result = await self._send(method, path, family, meta, **kwargs)
+        except (ApiNetworkError, ApiEmbeddingError, ApiEmbeddingTimeoutError):
+            breaker.record_failure()
+            raise
+        except ApiError as e:
+            if e.status >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+        except (ApiProcessingError, ApiRateLimitError):
+            breaker.record_success()
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        breaker.record_success()
+        return result
+
+    def _is_retryable(self, exc: BaseException) -> bool:
+        """Transient failures worth another attempt.
+
+        Timeouts are excluded: the attempt already used the caller's whole wait.
+        202s are left to the poller when processing polling is enabled.
+        """
+        if isinstance(exc, ApiProcessingError):
+            return not self._config.processing_poll
+        if isinstance(exc, ApiNetworkError):
+            return not exc.is_timeout
+        return isinstance(exc, ApiError) and exc.status >= 500
+
+    async def _do_request_with_retries(self, method: str, path: str, **kwargs) -> dict | None:
+        """Run ``_do_request``, retrying idempotent GETs per the client's retry policy."""
+        policy = self._retry_policy
+        if policy.budget is not None:
+            policy.budget.record_request()
+        if method != "GET":
+            return await self._do_request(method, path, **self._within_deadline(kwargs))
+        family = self._endpoint_family(path)
+        attempt_once = self._hedged_request if self._should_hedge(family) else self._do_request
+        breaker = self._breaker(family)
+        attempt = 1
+        delay = 0.0
+        while True:
+            try:
+                return await attempt_once(method, path, **self._within_deadline(kwargs))
+            except (ApiNetworkError, ApiError, ApiProcessingError) as e:
+                if not self._is_retryable(e) or breaker.state == CircuitBreaker.OPEN:
+                    raise
+                next_delay = policy.next_delay(delay)
+                left = deadline.remaining()
+                if left is not None and next_delay >= left:
+                    raise
+                if not policy.can_retry(attempt):
+                    raise
+                delay = next_delay
+                logger.info("Retrying GET %s in %.2fs (attempt %d failed: %s)", path, delay, attempt, e)
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _do_request_until_ready(self, method: str, path: str, **kwargs) -> dict | None:
+        """Run ``_do_request_with_retries``, polling a 202 until the resource is ready if enabled.
+
+        Called from the leading request in ``_request``, so concurrent callers of the
+        same request share one poller.
+        """
+        if method != "GET" or not self._config.processing_poll:
+            return await self._do_request_with_retries(method, path, **kwargs)
         try:
-            async with self._session.request(method, path, **kwargs) as resp:
-                if resp.status == 200:
-                    return await resp.json()
-                if resp.status == 429:
-                    retry_after = float(resp.headers.get("Retry-After", 5))
-                    await asyncio.sleep(retry_after)
-                    async with self._session.request(method, path, **kwargs) as retry_resp:
-                        if retry_resp.status == 200:
-                            return await retry_resp.json()
-                        return await self._handle_error_response(retry_resp, path)
-                return await self._handle_error_response(resp, path)
+            return await self._do_request_with_retries(method, path, **kwargs)
+        except ApiProcessingError as e:
+            return await self._poll_processing(method, path, e, kwargs)
+
+    def _poll_path(self, location: str | None) -> str | None:
+        """Turn a 202's Location into a path under the API base URL, ignoring other origins."""
+        if not location:
+            return None
+        base = self._base_url + "/"
+        url = urljoin(base, location)
+        if not url.startswith(base):
+            logger.warning("Ignoring processing Location outside the API: %s", location)
+            return None
+        return url[len(base) :]
+
+    async def _poll_processing(self, method: str, path: str, pending: ApiProcessingError, kwargs: dict) -> dict | None:
+        """Re-request ``path`` (or the 202's Location) until it stops answering 202.
+
+        Waits for Retry-After when given, otherwise backs off exponentially. Gives up,
+        re-raising the last ApiProcessingError, when the next poll would land after
+        ``processing_poll_timeout`` or the caller's deadline.
+        """
+        config = self._config
+        self._poll_counts["started"] += 1
+        give_up_at = time.monotonic() + config.processing_poll_timeout
+        delay = config.processing_poll_initial_delay
+        poll_path = None
+        while True:
+            wait = pending.retry_after if pending.retry_after is not None else delay
+            left = give_up_at - time.monotonic()
+            deadline_left = deadline.remaining()
+            if deadline_left is not None:
+                left = min(left, deadline_left)
+            if wait >= left:
+                self._poll_counts["gave_up"] += 1
+                raise pending
+            # A Location stays in effect until a later 202 names another one.
+            poll_path = self._poll_path(pending.location) or poll_path
+            poll_kwargs = kwargs if poll_path is None else {k: v for k, v in kwargs.items() if k != "params"}
+            logger.debug("GET %s still processing, polling again in %.2fs", path, wait)
+            await asyncio.sleep(wait)
+            if pending.retry_after is None:
+                delay = min(config.processing_poll_max_delay, delay * 2)
+            self._poll_counts["polls"] += 1
+            try:
+                result = await self._do_request_with_retries(method, poll_path or path, **poll_kwargs)
+            except ApiProcessingError as e:
+                pending = e
+                continue
+            self._poll_counts["ready"] += 1
+            return result
+
+    @staticmethod
+    def _deadline_error() -> ApiNetworkError:
+        return ApiNetworkError("Interaction deadline exceeded", is_timeout=True)
+
+    def _within_deadline(self, kwargs: dict) -> dict:
+        """Clamp the request timeout to the caller's deadline; fail fast once it has passed."""
+        left = deadline.remaining()
+        if left is None:
+            return kwargs
+        if left <= 0:
+            raise self._deadline_error()
+        timeout = kwargs.get("timeout")
+        total = timeout.total if timeout is not None and timeout.total else self._timeout
+        if total and total <= left:
+            return kwargs
+        return {**kwargs, "timeout": aiohttp.ClientTimeout(total=left)}
+
+    def _latency(self, family: str) -> LatencyWindow:
+        window = self._latencies.get(family)
+        if window is None:
+            window = self._latencies[family] = LatencyWindow(min_samples=self._config.hedge_min_samples)
+        return window
+
+    def _should_hedge(self, family: str) -> bool:
+        if not self._config.hedge_enabled or family not in self._HEDGED_FAMILIES:
+            return False
+        if _current_lane.get() != LANE_INTERACTIVE:
+            return False
+        self._hedge_budget.record_request()
+        return True
+
+    async def _hedged_request(self, method: str, path: str, *, meta: dict | None = None, **kwargs) -> dict | None:
+        """Send a second identical request if the first is slower than the family's tail latency.
+
+        The first successful answer wins and the other attempt is cancelled. Each attempt
+        fills its own metadata so the caller only sees the winner's.
+        """
+        family = self._endpoint_family(path)
+        window = self._latency(family)
+        threshold = window.percentile(self._config.hedge_percentile)
+        attempts: dict[asyncio.Task, dict] = {}
+
+        def launch() -> None:
+            attempt_meta: dict = {}
+            started = time.monotonic()
+
+            async def run():
+                result = await self._do_request(method, path, meta=attempt_meta, **kwargs)
+                window.record(time.monotonic() - started)
+                return result
+
+            attempts[asyncio.create_task(run())] = attempt_meta
+
+        launch()
+        primary = next(iter(attempts))
+        try:
+            if threshold is not None:
+                await asyncio.wait({primary}, timeout=max(self._config.hedge_min_delay, threshold))
+                if not primary.done() and self._hedge_budget.try_spend():
+                    self._hedge_counts["sent"] += 1
+                    launch()
+            pending = set(attempts)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((task for task in done if task.exception() is None), None)
+                if winner is not None:
+                    if winner is not primary:
+                        self._hedge_counts["won"] += 1
+                    if meta is not None:
+                        meta.update(attempts[winner])
+                    return winner.result()
+            raise primary.exception()
+        finally:
+            for task in attempts:
+                task.cancel()
+            await asyncio.gather(*attempts, return_exceptions=True)
+
+    def _endpoint_metrics(self, family: str) -> EndpointMetrics:
+        metrics = self._metrics.get(family)
+        if metrics is None:
+            metrics = self._metrics[family] = EndpointMetrics()
+        return metrics
+
+    @staticmethod
+    def _content_length(resp: aiohttp.ClientResponse) -> int | None:
+        length = getattr(resp, "content_length", None)
+        return length if isinstance(length, int) else None
+
+    @contextlib.asynccontextmanager
+    async def _exchange(self, metrics: EndpointMetrics, family: str, method: str, path: str, **kwargs):
+        """Open a request in the caller's lane and time it until the response has been consumed.
+
+        The outcome feeds the adaptive concurrency limit: 429, 5xx and network
+        errors count as overload, cancellations (e.g. a lost hedge) not at all,
+        and latency is judged against the endpoint family's own baseline.
+        """
+        lane = _current_lane.get()
+        background = lane == LANE_BACKGROUND
+        async with self._lanes[lane].slot():
+            admitted = await self._concurrency.acquire(background=background)
+            started = self._last_request_at = time.monotonic()
+            request = self._session.request if self._router is None else self._routed_request
+            overloaded: bool | None = None
+            try:
+                async with request(method, path, **kwargs) as resp:
+                    metrics.record_response(resp.status, self._content_length(resp))
+                    overloaded = resp.status == 429 or resp.status >= 500
+                    yield resp
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                overloaded = True
+                raise
+            except asyncio.CancelledError:
+                overloaded = None
+                raise
+            finally:
+                metrics.latency.observe(time.monotonic() - started)
+                self._concurrency.release(admitted, overloaded, family=family, background=background)
+
+    async def _send(self, method: str, path: str, family: str, meta: dict | None, **kwargs) -> dict | None:
+        metrics = self._endpoint_metrics(family)
+        try:
+            await self._rate_limiter.acquire(family)
+            async with self._exchange(metrics, family, method, path, **kwargs) as resp:
+                if resp.status != 429:
+                    return await self._read_response(resp, path, meta)
+                retry_after = self._parse_retry_after(resp.headers.get("Retry-After"))
+            # Pause every caller, not just this one, then retry once when the window reopens.
+            self._rate_limiter.pause(retry_after)
+            await self._rate_limiter.acquire(family)
+            async with self._exchange(metrics, family, method, path, **kwargs) as retry_resp:
+                return await self._read_response(retry_resp, path, meta)
         except asyncio.TimeoutError as e:
+            metrics.timeouts += 1
             raise ApiNetworkError(str(e), is_timeout=True) from e
         except aiohttp.ClientError as e:
+            metrics.network_errors += 1
             raise ApiNetworkError(str(e)) from e
 
+    async def _read_response(self, resp: aiohttp.ClientResponse, path: str, meta: dict | None) -> dict | None:
+        if meta is not None:
+            meta["status"] = resp.status
+            meta["validator"] = resp.headers.get("ETag")
+        if resp.status == 200:
+            return await self._decode(resp, self._endpoint_family(path))
+        if resp.status == 304:
+            return None
+        if resp.status in (429, 503) and resp.headers.get("Retry-After"):
+            self._rate_limiter.pause(self._parse_retry_after(resp.headers.get("Retry-After")))
+        return await self._handle_error_response(resp, path)
+
+    async def _decode(self, resp: aiohttp.ClientResponse, family: str | None = None):
+        """Decompress and decode the body, in a worker thread when it is large.
+
+        Wire (compressed) and decoded sizes are recorded for ``family``.
+        """
+        body = await resp.read()
+        if not isinstance(body, (bytes, bytearray)):
+            # Session stand-ins without raw bodies
+            return await resp.json()
+        encoding = resp.headers.get("Content-Encoding")
+        try:
+            if len(body) >= self._config.decompress_offload_bytes:
+                decoded_size, payload = await asyncio.to_thread(self._decompress_and_load, body, encoding)
+            else:
+                decoded_size, payload = self._decompress_and_load(body, encoding)
+        except (ValueError, zlib.error) as e:
+            raise ApiNetworkError(f"Undecodable response body: {e}") from e
+        if family is not None:
+            self._endpoint_metrics(family).record_body(len(body), decoded_size)
+        return payload
+
+    @staticmethod
+    def _decompress_and_load(body: bytes, encoding: str | None) -> tuple[int, object]:
+        data = compression.decompress(body, encoding)
+        return len(data), codec.loads(data) if data else None
+
     async def _handle_error_response(self, resp: aiohttp.ClientResponse, path: str) -> None:
         status = resp.status
         is_similar_path = path == "similar" or path.startswith("similar/")
@@ -111,10 +762,14 @@ class OjApiClient:
             return None
         if status == 202:
             detail = await self._parse_detail(resp)
-            raise ApiProcessingError(detail)
+            retry_after = resp.headers.get("Retry-After")
+            raise ApiProcessingError(
+                detail,
+                retry_after=self._parse_retry_after(retry_after) if retry_after else None,
+                location=resp.headers.get("Location"),
+            )
         if status == 429:
-            retry_after = float(resp.headers.get("Retry-After", 5))
-            raise ApiRateLimitError(retry_after)
+            raise ApiRateLimitError(self._parse_retry_after(resp.headers.get("Retry-After")))
         if status == 502 and is_similar_path:
             detail = await self._parse_detail(resp)
             raise ApiEmbeddingError(detail)
@@ -124,28 +779,45 @@ class OjApiClient:
         detail = await self._parse_detail(resp)
         raise ApiError(status, detail)
 
-    @staticmethod
-    async def _parse_detail(resp: aiohttp.ClientResponse) -> str:
+    async def _parse_detail(self, resp: aiohttp.ClientResponse) -> str:
         try:
-            body = await resp.json()
+            body = await self._decode(resp)
             return body.get("detail", body.get("title", str(body)))
         except Exception:
             return "Invalid response body"
 
-    async def _request(self, method: str, path: str, *, timeout=None, **kwargs) -> dict | None:
+    async def _request(
+        self, method: str, path: str, *, timeout=None, meta: dict | None = None, **kwargs
+    ) -> dict | None:
         params = kwargs.get("params")
         json_body = kwargs.get("json")
+        headers = kwargs.get("headers")
         key = f"{method}:{path}"
         if params:
             sorted_params = "&".join(f"{k}={v}" for k, v in sorted(params.items()) if v is not None)
             key = f"{key}?{sorted_params}"
         if json_body is not None:
             key = f"{key}|{json.dumps(json_body, sort_keys=True)}"
+        if headers:
+            key = f"{key}|{json.dumps(headers, sort_keys=True)}"
         if timeout is not None:
             key = f"{key}|timeout={timeout.total}"
 
+        left = deadline.remaining()
+        if left is not None and left <= 0:
+            raise self._deadline_error()
+
         if key in self._inflight:
-            return await self._inflight[key]
+            self._endpoint_metrics(self._endpoint_family(path)).coalesced += 1
+            if left is None:
+                return await self._inflight[key]
+            # Stop waiting at our own deadline without cancelling the shared request.
+            try:
+                return await asyncio.wait_for(asyncio.shield(self._inflight[key]), left)
+            except asyncio.TimeoutError:
+                if deadline.remaining() > 0:
+                    raise
+                raise self._deadline_error() from None
 
         future: asyncio.Future = asyncio.get_event_loop().create_future()
         self._inflight[key] = future
@@ -153,7 +825,9 @@ class OjApiClient:
             request_kwargs = kwargs.copy()
             if timeout is not None:
                 request_kwargs["timeout"] = timeout
-            result = await self._do_request(method, path, **request_kwargs)
+            if meta is not None:
+                request_kwargs["meta"] = meta
+            result = await self._do_request_until_ready(method, path, **request_kwargs)
             future.set_result(result)
             return result
         except BaseException as exc:
@@ -162,31 +836,378 @@ class OjApiClient:
         finally:
             self._inflight.pop(key, None)
 
+    # -- Caching --
+
+    def _schedule_refresh(self, cache: TTLCache, key: str, refresh_entry) -> None:
+        """Revalidate a stale cache entry in the background, at most once per key."""
+        if key in self._refresh_tasks:
+            return
+
+        async def refresh():
+            _current_lane.set(LANE_BACKGROUND)
+            try:
+                await refresh_entry()
+                cache.stats.refreshes += 1
+            except Exception as e:
+                cache.stats.refresh_errors += 1
+                logger.warning("Background refresh failed for %s: %s", key, e)
+            finally:
+                self._refresh_tasks.pop(key, None)
+
+        self._refresh_tasks[key] = asyncio.create_task(refresh())
+
+    def _load_persisted(self, cache: TTLCache, key: str, shape: Callable | None = None) -> tuple[dict, bool] | None:
+        """Promote a live entry from the persistent tier into the in-memory cache."""
+        if self._cache_db is None:
+            return None
+        try:
+            record = self._cache_db.get_entry(key)
+        except sqlite3.Error as e:
+            logger.warning("Persistent cache read failed for %s: %s", key, e)
+            return None
+        if not record:
+            return None
+        payload = shape(record["payload"]) if shape else record["payload"]
+        cache.set(key, payload, age=max(0.0, time.time() - record["fetched_at"]))
+        found = cache.peek(key)
+        if found is None:
+            cache.pop(key)
+            return None
+        cache.stats.persistent_hits += 1
+        return found
+
+    def _persisted_validator(self, key: str) -> str | None:
+        if self._cache_db is None:
+            return None
+        try:
+            record = self._cache_db.get_entry(key)
+        except sqlite3.Error:
+            return None
+        return record["validator"] if record else None
+
+    def _persist(self, key: str, payload: dict, validator: str | None) -> None:
+        if self._cache_db is None:
+            return
+        try:
+            self._cache_db.save_entry(key, payload, validator)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning("Persistent cache write failed for %s: %s", key, e)
+
+    async def _fetch_into_cache(
+        self,
+        cache: TTLCache,
+        key: str,
+        path: str,
+        params: dict | None = None,
+        shape: Callable | None = None,
+        *,
+        persist: bool = True,
+    ) -> dict | None:
+        """Fetch ``path`` and store a positive result (wrapped by ``shape``) in both cache tiers.
+
+        Revalidations of an entry with a known validator are sent conditionally;
+        a 304 keeps the cached payload and only bumps its fetch time. With
+        ``persist=False`` only the in-memory tier is used.
+        """
+        kwargs = {}
+        if params:
+            kwargs["params"] = params
+        cached = cache.peek(key)
+        validator = self._persisted_validator(key) if cached is not None and persist else None
+        if validator:
+            kwargs["headers"] = {"If-None-Match": validator}
+        meta: dict = {}
+        result = await self._request("GET", path, meta=meta, **kwargs)
+        if shape is not None:
+            result = shape(result)
+        if meta.get("status") == 304 and cached is not None:
+            cache.set(key, cached[0])
+            if self._cache_db is not None and persist:
+                try:
+                    self._cache_db.touch_entry(key)
+                except sqlite3.Error as e:
+                    logger.warning("Persistent cache write failed for %s: %s", key, e)
+            return cached[0]
+        if result is None:
+            self._negative_cache.set(key, True)
+        else:
+            self._negative_cache.pop(key)
+        if result:
+            cache.set(key, result)
+            # Coalesced waiters get no response metadata; the leading request persists.
+            if meta and persist:
+                self._persist(key, result, meta.get("validator"))
+        return result
+
+    async def _cached_get(
+        self,
+        cache: TTLCache,
+        key: str,
+        path: str,
+        params: dict | None = None,
+        shape: Callable | None = None,
+        *,
+        persist: bool = True,
+    ) -> dict | None:
+        cached = cache.lookup(key)
+        if cached is None and persist:
+            cached = self._load_persisted(cache, key, shape)
+        if cached is not None:
+            value, is_stale = cached
+            if is_stale:
+                self._schedule_refresh(
+                    cache, key, lambda: self._fetch_into_cache(cache, key, path, params, shape, persist=persist)
+                )
+            return value
+        if self._negative_cache.lookup(key) is not None:
+            return None
+        return await self._fetch_into_cache(cache, key, path, params, shape, persist=persist)
+
+    def rate_limit_stats(self) -> dict:
+        """Return how many requests are queued per endpoint family and any active Retry-After pause."""
+        return self._rate_limiter.stats()
+
+    def circuit_stats(self) -> dict[str, dict]:
+        """Return the circuit breaker state for each endpoint family seen so far."""
+        return {family: breaker.stats() for family, breaker in self._breakers.items()}
+
+    def retry_stats(self) -> dict:
+        """Return retry budget usage over its sliding window."""
+        budget = self._retry_policy.budget
+        return budget.stats() if budget is not None else {}
+
+    def endpoint_stats(self) -> dict[str, dict]:
+        """Return latency/size histograms, status counts, coalesced waiters and timeouts per endpoint family.
+
+        Latency is measured from sending the request until its body has been read,
+        excluding time spent waiting on the client-side rate limiter.
+        """
+        return {family: metrics.snapshot() for family, metrics in sorted(self._metrics.items())}
+
+    def concurrency_stats(self) -> dict:
+        """Return the current adaptive concurrency limit, requests in flight and queued, and its adjustments."""
+        return self._concurrency.stats()
+
+    def lane_stats(self) -> dict[str, dict]:
+        """Return concurrency, queue depth and queue-wait histograms per traffic lane."""
+        return {name: lane.stats() for name, lane in self._lanes.items()}
+
+    def hedge_stats(self) -> dict:
+        """Return how many hedged requests were sent and won, plus the current hedging thresholds."""
+        thresholds = {
+            family: self._latency(family).percentile(self._config.hedge_percentile)
+            for family in sorted(self._HEDGED_FAMILIES)
+        }
+        return {**self._hedge_counts, "thresholds": thresholds}
+
+    def processing_stats(self) -> dict[str, int]:
+        """Return how many 202 pollers were started, polls sent, and pollers that got a result or gave up."""
+        return dict(self._poll_counts)
+
+    def random_pool_stats(self) -> dict:
+        """Return hit/miss/refill counters and how many problems are buffered for /random."""
+        return self._random_pool.stats() if self._random_pool is not None else {}
+
+    def replica_stats(self) -> dict[str, dict]:
+        """Return health, latency EWMA, in-flight and failure counts per oj-api replica."""
+        return self._router.stats() if self._router is not None else {}
+
+    def cache_stats(self) -> dict[str, dict[str, int]]:
+        """Return hit/miss/refresh counters for the client-side caches."""
+        caches = {
+            "problems": self._problem_cache,
+            "resolve": self._resolve_cache,
+            "daily": self._daily_cache,
+            "current_daily": self._current_daily_cache,
+            "not_found": self._negative_cache,
+            "similar": self._similar_cache,
+        }
+        return {name: {**cache.stats.as_dict(), "size": len(cache)} for name, cache in caches.items()}
+
     # -- Public API --
 
     async def get_problem(self, source: str, id: str) -> dict | None:
-        return await self._request("GET", f"problems/{quote(source)}/{quote(id)}")
+        key = f"problem:{source}/{id}"
+        if self._should_batch(self._problem_batcher, self._problem_cache, key):
+            return await self._load_batched(self._problem_batcher, (source, id))
+        return await self._get_problem(source, id)
+
+    async def _get_problem(self, source: str, id: str) -> dict | None:
+        return await self._cached_get(
+            self._problem_cache, f"problem:{source}/{id}", f"problems/{quote(source)}/{quote(id)}", shape=problem_record
+        )
 
     async def get_daily(self, domain: str = "com", date: str | None = None) -> dict | None:
-        params = {"domain": domain}
         if date:
-            params["date"] = date
-        return await self._request("GET", "daily", params=params)
+            return await self._cached_get(
+                self._daily_cache,
+                f"daily:{domain}:{date}",
+                "daily",
+                {"domain": domain, "date": date},
+                shape=problem_record,
+            )
+        # Keyed by the domain's current date so nothing cached before a rollover is served after it.
+        # Not persisted: after a restart the previous day's entry would look fresh.
+        today = self._daily_date(domain)
+        key = f"daily:{domain}:current:{today}"
+        daily = await self._cached_get(
+            self._current_daily_cache, key, "daily", {"domain": domain}, shape=problem_record, persist=False
+        )
+        if daily and daily.get("date"):
+            self._daily_cache.set(f"daily:{domain}:{daily['date']}", daily)
+            if daily["date"] != today:
+                # Upstream has not rolled over yet; ask again next time.
+                self._current_daily_cache.pop(key)
+        return daily
+
+    @staticmethod
+    def _daily_date(domain: str) -> str:
+        """Today's date where ``domain``'s daily challenge rolls over (UTC, or Beijing time for cn)."""
+        offset = timedelta(hours=_DAILY_UTC_OFFSETS.get(domain, 0))
+        return (datetime.now(timezone.utc) + offset).strftime("%Y-%m-%d")
 
     async def resolve(self, query: str) -> dict | None:
-        return await self._request("GET", f"resolve/{quote(query, safe='')}")
+        """Resolve a problem reference (ID, slug, URL or ``source:id``).
+
+        References that carry the canonical ID (see ``parse_problem_ref``) are fetched
+        with ``get_problem`` and never reach the resolve endpoint, not even on a miss;
+        LeetCode slugs, URLs and other ambiguous input are resolved upstream.
+        Its answers are cached under the query's canonical form, so different spellings
+        of the same reference share one entry, and the resolved problem seeds the
+        problem cache.
+        """
+        query = query.strip()
+        ref = parse_problem_ref(query)
+        if ref is not None:
+            cache, key = self._problem_cache, f"problem:{ref[0]}/{ref[1]}"
+        else:
+            cache, key = self._resolve_cache, f"resolve:{normalize_query(query)}"
+        if self._should_batch(self._resolve_batcher, cache, key):
+            return await self._load_batched(self._resolve_batcher, query)
+        return await self._resolve(query)
+
+    async def _resolve(self, query: str) -> dict | None:
+        ref = parse_problem_ref(query)
+        if ref is not None:
+            # The reference carries the canonical ID, so a miss is final: the resolve
+            # endpoint would only look up the same ID again.
+            problem = await self._get_problem(*ref)
+            if problem is None:
+                return None
+            source, id = problem.get("source", ref[0]), problem.get("id", ref[1])
+            key = f"problem:{source}/{id}"
+            if key != f"problem:{ref[0]}/{ref[1]}":
+                # Spelled differently than the upstream ID (e.g. ``luogu:p1001``): cache it under that ID too.
+                self._problem_cache.set(key, problem)
+                self._negative_cache.pop(key)
+            return {"source": source, "id": id, "problem": problem}
+        return await self._cached_get(
+            self._resolve_cache,
+            f"resolve:{normalize_query(query)}",
+            f"resolve/{quote(query, safe='')}",
+            shape=self._link_resolved,
+        )
+
+    def _link_resolved(self, payload):
+        """Share a resolved problem with the problem cache instead of keeping a second copy."""
+        if not isinstance(payload, dict) or not isinstance(payload.get("problem"), dict):
+            return payload
+        problem = problem_record(payload["problem"])
+        source, id = problem.get("source"), problem.get("id")
+        if source and id is not None:
+            key = f"problem:{source}/{id}"
+            cached = self._problem_cache.peek(key)
+            if cached is not None and not cached[1]:
+                problem = cached[0]
+            else:
+                self._problem_cache.set(key, problem)
+                self._negative_cache.pop(key)
+        return {**payload, "problem": problem}
+
+    # -- Micro-batching --
+
+    def _should_batch(self, batcher: MicroBatcher | None, cache: TTLCache, key: str) -> bool:
+        """Batch interactive lookups that will have to go upstream; cache hits and background work go direct."""
+        if batcher is None or _current_lane.get() != LANE_INTERACTIVE:
+            return False
+        return cache.peek(key) is None and self._negative_cache.peek(key) is None
+
+    async def _load_batched(self, batcher: MicroBatcher, key):
+        """Wait for ``key`` from the next batch, giving up at our own deadline without failing the batch."""
+        left = deadline.remaining()
+        if left is not None and left <= 0:
+            raise self._deadline_error()
+        result = asyncio.shield(batcher.load(key))
+        if left is None:
+            return await result
+        try:
+            return await asyncio.wait_for(result, left)
+        except asyncio.TimeoutError:
+            if deadline.remaining() > 0:
+                raise
+            raise self._deadline_error() from None
+
+    async def _dispatch_problems(self, refs: list[tuple[str, str]]) -> list:
+        return await self._gather_unique(refs, lambda ref: self._get_problem(*ref), return_exceptions=True)
+
+    async def _dispatch_resolves(self, queries: list[str]) -> list:
+        # Different spellings of one reference are resolved once.
+        canonical: dict[str, str] = {}
+        for query in queries:
+            canonical.setdefault(normalize_query(query), query)
+        representatives = [canonical[normalize_query(query)] for query in queries]
+        return await self._gather_unique(representatives, self._resolve, return_exceptions=True)
+
+    def batch_stats(self) -> dict[str, dict]:
+        """Return loads, dispatched batches and average batch size for batched problem and resolve lookups."""
+        batchers = {"problems": self._problem_batcher, "resolve": self._resolve_batcher}
+        return {name: batcher.stats() for name, batcher in batchers.items() if batcher is not None}
+
+    async def _gather_unique(self, keys: list, fetch, *, return_exceptions: bool = False) -> list:
+        """Run ``fetch`` once per distinct key, returning results in input order.
+
+        Parallelism follows the current adaptive concurrency limit, so a bulk call
+        cannot queue more requests than the upstream is taking right now.
+        """
+        sem = asyncio.Semaphore(self._concurrency.current)
+        unique = list(dict.fromkeys(keys))
+
+        async def fetch_one(key):
+            async with sem:
+                return await fetch(key)
+
+        results = await asyncio.gather(*[fetch_one(key) for key in unique], return_exceptions=return_exceptions)
+        by_key = dict(zip(unique, results))
+        return [by_key[key] for key in keys]
+
+    async def get_problems_bulk(self, refs: list[tuple[str, str]]) -> list[dict | None]:
+        """Fetch several problems at once, returning one result (or None) per ``(source, id)`` in order.
+
+        oj-api has no multi-ID endpoint, so cached and known-missing problems are answered
+        locally and only the distinct remaining IDs go upstream, with bounded parallelism.
+        """
+        return await self._gather_unique(list(refs), lambda ref: self._get_problem(*ref))
+
+    async def resolve_many(self, queries: list[str]) -> list[dict | None]:
+        """Resolve several queries at once, returning one result (or None) per query in order."""
+        return await self._gather_unique([query.strip() for query in queries], self._resolve)
 
     async def search_similar_by_id(
         self, source: str, id: str, top_k: int = 5, min_similarity: float = 0.7, timeout: int | None = None
     ) -> dict | None:
+        key = ("id", source, id, float(min_similarity))
+        cached = self._cached_similar(key, top_k)
+        if cached is not None:
+            return cached
         params = {"limit": str(top_k), "threshold": str(min_similarity)}
         client_timeout = aiohttp.ClientTimeout(total=timeout) if timeout is not None else None
-        return await self._request(
+        result = await self._request(
             "GET",
             f"similar/{quote(source)}/{quote(id)}",
             params=params,
             timeout=client_timeout,
         )
+        return self._store_similar(key, top_k, similar_payload(result))
 
     async def search_similar_by_text(
         self,
@@ -196,11 +1217,39 @@ class OjApiClient:
         min_similarity: float = 0.7,
         timeout: int | None = None,
     ) -> dict | None:
+        key = ("text", source or "", " ".join(query.split()).casefold(), float(min_similarity))
+        cached = self._cached_similar(key, top_k)
+        if cached is not None:
+            return cached
         payload: dict[str, str | int | float] = {"query": query, "limit": top_k, "threshold": min_similarity}
         if source:
             payload["source"] = source
         client_timeout = aiohttp.ClientTimeout(total=timeout) if timeout is not None else None
-        return await self._request("POST", "similar", json=payload, timeout=client_timeout)
+        result = similar_payload(await self._request("POST", "similar", json=payload, timeout=client_timeout))
+        return self._store_similar(key, top_k, result)
+
+    def _cached_similar(self, key: tuple, top_k: int) -> dict | None:
+        """Serve a similar search from a cached one with at least as many results.
+
+        A cached answer covers ``top_k`` if it was asked for that many or more, or if it
+        came back short of its own limit (there are no further matches to find).
+        """
+        found = self._similar_cache.peek(key)
+        if found is not None:
+            limit, payload = found[0]
+            results = payload["results"]
+            if limit >= top_k or len(results) < limit:
+                self._similar_cache.lookup(key)
+                return {**payload, "results": results[:top_k]}
+        self._similar_cache.stats.misses += 1
+        return None
+
+    def _store_similar(self, key: tuple, top_k: int, payload):
+        if isinstance(payload, dict) and isinstance(payload.get("results"), list):
+            found = self._similar_cache.peek(key)
+            if found is None or found[0][0] <= top_k:
+                self._similar_cache.set(key, (top_k, payload))
+        return payload
 
     @staticmethod
     def _list_total(response: dict) -> int:
@@ -226,7 +1275,11 @@ class OjApiClient:
         rating_min: int | None = None,
         rating_max: int | None = None,
     ) -> dict | None:
-        """Fetch a random problem via the native random endpoint."""
+        """Fetch a random problem via the native random endpoint.
+
+        With ``random_pool_batch`` set, problems are fetched in batches per filter
+        combination and served from a local pool that refills in the background.
+        """
         if rating_min is not None and rating_max is not None and rating_min > rating_max:
             rating_min, rating_max = rating_max, rating_min
 
@@ -242,12 +1295,31 @@ class OjApiClient:
         if rating_max is not None:
             params["rating_max"] = rating_max
 
+        if self._random_pool is not None:
+            return await self._random_pool.get(self._random_pool_key(params))
+
+        items = await self._fetch_random(params)
+        return items[0] if items else None
+
+    @staticmethod
+    def _random_pool_key(params: dict) -> tuple:
+        """Filter combination as a hashable key; tag order and spacing do not matter."""
+        tags = params.get("tags")
+        if tags:
+            tags = ",".join(sorted({tag.strip() for tag in str(tags).split(",") if tag.strip()}))
+        key = {**params, "tags": tags or None, "count": None}
+        return tuple(sorted((name, value) for name, value in key.items() if value is not None))
+
+    async def _fetch_random(self, params: dict) -> list:
         response = await self._request("GET", "random", params=params)
         if not response:
-            return None
+            return []
+        return [problem_record(item) for item in self._list_items(response)]
 
-        items = self._list_items(response)
-        return items[0] if items else None
+    async def _refill_random_pool(self, key: tuple, background: bool) -> list:
+        if background:
+            _current_lane.set(LANE_BACKGROUND)
+        return await self._fetch_random({**dict(key), "count": self._config.random_pool_batch})
 
     async def get_tags(self, source: str) -> list[str]:
         """Fetch valid tags for a problem source via GET /api/v1/tags/{source}."""
@@ -264,7 +1336,7 @@ class OjApiClient:
     async def get_tags_cached(self, source: str) -> list[str]:
         """Return cached tags within TTL; on cache miss or expiry, call API with stale fallback."""
         now = time.time()
-        cached = self._tags_cache.get(source)
+        cached = self._tags_cache.get(source) or self._load_persisted_tags(source)
         if cached is not None:
             ts, tags = cached
             if now - ts < self._TAGS_CACHE_TTL:
@@ -272,6 +1344,8 @@ class OjApiClient:
         try:
             tags = await self.get_tags(source)
             self._tags_cache[source] = (now, tags)
+            if tags:
+                self._persist(f"tags:{source}", tags, None)
             return tags
         except Exception as e:
             if cached is not None:
@@ -279,3 +1353,56 @@ class OjApiClient:
                 return cached[1]
             logger.warning("Tags cache miss and API failure for %s: %s", source, e)
             return []
+
+    def _load_persisted_tags(self, source: str) -> tuple[float, list[str]] | None:
+        """Restore a source's tag list saved by a previous run, keeping its original fetch time."""
+        if self._cache_db is None:
+            return None
+        try:
+            record = self._cache_db.get_entry(f"tags:{source}")
+        except sqlite3.Error as e:
+            logger.warning("Persistent cache read failed for tags of %s: %s", source, e)
+            return None
+        if not record or not isinstance(record["payload"], list):
+            return None
+        cached = self._tags_cache[source] = (float(record["fetched_at"]), record["payload"])
+        return cached
+
+    def _refresh_tags(self, source: str) -> None:
+        """Refetch a source's expired tags in the background, at most once at a time."""
+        key = f"tags:{source}"
+        if key in self._refresh_tasks:
+            return
+
+        async def refresh():
+            _current_lane.set(LANE_BACKGROUND)
+            try:
+                await self.get_tags_cached(source)
+            finally:
+                self._refresh_tasks.pop(key, None)
+
+        self._refresh_tasks[key] = asyncio.create_task(refresh())
+
+    async def _catalog_tags(self, source: str) -> list[str]:
+        """Tags for autocomplete: served from memory or disk even when expired, fetched only when cold."""
+        cached = self._tags_cache.get(source) or self._load_persisted_tags(source)
+        if cached is None:
+            return await self.get_tags_cached(source)
+        if time.time() - cached[0] >= self._TAGS_CACHE_TTL:
+            self._refresh_tags(source)
+        return cached[1]
+
+    async def get_tag_index(self, source: str) -> TagIndex:
+        """Return a search index over the tags of ``source``; ``"all"`` merges every source.
+
+        Indexes are rebuilt only when the underlying tag lists change, so repeated
+        autocomplete lookups are answered from memory.
+        """
+        sources = TAG_SOURCES if source == "all" else (source,)
+        lists = tuple(await asyncio.gather(*(self._catalog_tags(name) for name in sources)))
+        built = self._tag_indexes.get(source)
+        if built is not None and len(built[0]) == len(lists) and all(a is b for a, b in zip(built[0], lists)):
+            return built[1]
+        index = TagIndex(tag for tags in lists for tag in tags)
+        self._tag_indexes[source] = (lists, index)
+        return index
@@ -118,11 +118,14 @@ def _register_runtime_handlers(bot: commands.Bot) -> None:
         bot.logger.info("Bot is ready and operational!")
 
         async def _preload_tags():
-            for src in ["leetcode", "codeforces"]:
-                try:
-                    await bot.api.get_tags_cached(src)
-                except Exception as e:
-                    bot.logger.warning("Failed to preload tags for %s: %s", src, e)
+            from bot.api_client import LANE_BACKGROUND, TAG_SOURCES, traffic_lane
+
+            with traffic_lane(LANE_BACKGROUND):
+                for src in TAG_SOURCES:
+                    try:
+                        await bot.api.get_tags_cached(src)
+                    except Exception as e:
+                        bot.logger.warning("Failed to preload tags for %s: %s", src, e)
 
         asyncio.create_task(_preload_tags())
 
@@ -154,7 +157,7 @@ async def create_bot_runtime(*, config, logger):
     from bot.leetcode import LeetCodeClient
     from bot.llms import GeminiLLM
     from bot.utils import SettingsDatabaseManager
-    from bot.utils.database import LLMInspireDatabaseManager, LLMTranslateDatabaseManager
+    from bot.utils.database import ApiCacheDatabaseManager, LLMInspireDatabaseManager, LLMTranslateDatabaseManager
 
     i18n = I18nService(
         default_locale=config.default_locale,
@@ -170,8 +173,17 @@ async def create_bot_runtime(*, config, logger):
         db_path=db_path, expire_seconds=config.get_cache_expire_seconds("inspiration")
     )
 
+    api_config = config.get_api_client_config()
+    api_cache_db = ApiCacheDatabaseManager(db_path=db_path) if api_config.persistent_cache else None
+
     lcus = LeetCodeClient()
-    api = OjApiClient(config.api_base_url, config.api_token, config.api_timeout)
+    api = OjApiClient(
+        config.api_base_url,
+        config.api_token,
+        config.api_timeout,
+        config=api_config,
+        cache_db=api_cache_db,
+    )
 
     intents = discord.Intents.default()
     intents.message_content = True
@@ -7,7 +7,7 @@ from pathlib import Path
 from dotenv import load_dotenv
 
 from bot.app import create_bot_runtime
-from bot.utils.config import SimilarConfig, get_config
+from bot.utils.config import ApiClientConfig, SimilarConfig, get_config
 from bot.utils.logger import get_core_logger
 from bot.utils.paths import find_repo_root, resolve_repo_path
 
@@ -58,6 +58,9 @@ class EnvConfig:
     def get_similar_config(self):
         return SimilarConfig()
 
+    def get_api_client_config(self):
+        return ApiClientConfig()
+
     @property
     def database_path(self):
         return str(resolve_repo_path("data/data.db", self.repo_root))
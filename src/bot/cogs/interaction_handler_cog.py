@@ -14,6 +14,7 @@ from bot.api_client import (
     ApiRateLimitError,
 )
 from bot.leetcode import html_to_text
+from bot.utils.deadline import start_interaction_deadline
 from bot.utils.logger import get_commands_logger
 from bot.utils.ui_helpers import (
     _get_locale,
@@ -122,6 +123,7 @@ class InteractionHandlerCog(commands.Cog):
                 submissions = cached[0]
             else:
                 await interaction.response.defer(ephemeral=True)
+                start_interaction_deadline()
                 limit = cached[2] if cached and len(cached) > 2 else 50
                 submissions = await self.bot.lcus.fetch_recent_ac_submissions(username, limit)
                 if not submissions:
@@ -143,6 +145,7 @@ class InteractionHandlerCog(commands.Cog):
 
             if not interaction.response.is_done():
                 await interaction.response.defer(ephemeral=True)
+                start_interaction_deadline()
 
             detailed = await slash_cog._get_submission_details(submissions[new_page])
             if not detailed:
@@ -176,6 +179,7 @@ class InteractionHandlerCog(commands.Cog):
     async def _handle_problem_action(self, interaction: discord.Interaction, source: str, pid: str, action: str):
         try:
             await interaction.response.defer(ephemeral=True)
+            start_interaction_deadline()
         except discord.HTTPException:
             self.logger.warning("Failed to defer interaction %s", interaction.id)
             return
@@ -8,11 +8,17 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from discord.ext import commands
 
-from bot.api_client import ApiProcessingError, ApiRateLimitError
+from bot.api_client import LANE_BACKGROUND, ApiProcessingError, ApiRateLimitError, traffic_lane
 from bot.utils.config import DEFAULT_POST_TIME, DEFAULT_TIMEZONE, parse_timezone
 from bot.utils.logger import get_scheduler_logger
 from bot.utils.ui_helpers import send_daily_challenge
 
+# Waits between scheduled-post attempts while the API answers 202 (still processing)
+PROCESSING_RETRY_DELAYS = (2, 4, 8)
+
+# Seconds before a scheduled post at which API connections are pre-opened
+PREWARM_LEAD_SECONDS = 60
+
 
 class ScheduleManagerCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
@@ -87,6 +93,19 @@ class ScheduleManagerCog(commands.Cog):
             # Create cron trigger for daily execution
             trigger = CronTrigger(hour=hour, minute=minute, timezone=target_timezone)
 
+            # Open API connections shortly before the post so it does not pay for a cold handshake
+            lead_at = (hour * 3600 + minute * 60 - PREWARM_LEAD_SECONDS) % 86400
+            self.scheduler.add_job(
+                func=self.prewarm_api_connections,
+                trigger=CronTrigger(
+                    hour=lead_at // 3600, minute=lead_at % 3600 // 60, second=lead_at % 60, timezone=target_timezone
+                ),
+                id=f"prewarm_{server_id}",
+                replace_existing=True,
+                misfire_grace_time=PREWARM_LEAD_SECONDS,
+                name=f"API pre-warm for Server {server_id}",
+            )
+
             job_id = f"daily_challenge_{server_id}"
 
             # Remove existing job if it exists
@@ -113,6 +132,14 @@ class ScheduleManagerCog(commands.Cog):
         except Exception as e:
             self.logger.error(f"Server {server_id}: Error adding schedule: {e}", exc_info=True)
 
+    async def prewarm_api_connections(self):
+        """Job function: open pooled API connections ahead of a scheduled post."""
+        try:
+            opened = await self.bot.api.warm_up()
+            self.logger.debug(f"Pre-warmed {opened} API connection(s)")
+        except Exception as e:
+            self.logger.warning(f"API connection pre-warm failed: {e}")
+
     async def _mark_scheduled_delivery_started(self, delivery_key: tuple[int, int, str, str]) -> bool:
         async with self.scheduled_delivery_lock:
             if delivery_key in self.scheduled_deliveries_in_progress:
@@ -140,8 +167,6 @@ class ScheduleManagerCog(commands.Cog):
             config_default=self.bot.config.default_locale,
         )
 
-        delays = [2, 4, 8]
-
         scheduled_timezone = parse_timezone(timezone_str)
         daily_date = datetime.now(scheduled_timezone).strftime("%Y-%m-%d")
         delivery_key = (server_id, channel_id, "com", daily_date)
@@ -157,36 +182,38 @@ class ScheduleManagerCog(commands.Cog):
             return
 
         try:
-            for attempt in range(len(delays) + 1):
+            # The API client retries transient failures within a few seconds. A 202 ("still
+            # processing") right after the rollover can last longer, and a scheduled post has
+            # no second chance that day, so keep waiting here on top of the client's retries.
+            for attempt in range(len(PROCESSING_RETRY_DELAYS) + 1):
                 try:
-                    result = await send_daily_challenge(
-                        bot=self.bot,
-                        channel_id=channel_id,
-                        role_id=role_id,
-                        guild_locale=guild_locale,
-                    )
-                    if result:
-                        self.logger.info(f"Sent daily challenge for server {server_id}: {result.get('title')}")
-                    else:
-                        self.logger.warning(f"Failed to send daily challenge for server {server_id}")
-                    return
-                except ApiProcessingError:
-                    if attempt < len(delays):
-                        delay = delays[attempt] + random.uniform(-0.5, 0.5)
-                        self.logger.warning(
-                            f"Server {server_id}: API processing (attempt {attempt + 1}/{len(delays) + 1}), "
-                            f"retry in {delay:.1f}s"
+                    with traffic_lane(LANE_BACKGROUND):
+                        result = await send_daily_challenge(
+                            bot=self.bot,
+                            channel_id=channel_id,
+                            role_id=role_id,
+                            guild_locale=guild_locale,
                         )
-                        await asyncio.sleep(delay)
-                        continue
-                except ApiRateLimitError:
-                    self.logger.warning(f"Server {server_id}: rate limited, skipping daily challenge")
-                    return
-                except Exception as e:
-                    self.logger.error(f"Error in send_daily_challenge_job for server {server_id}: {e}", exc_info=True)
-                    return
-
-            self.logger.warning(f"Server {server_id}: API still processing after {len(delays) + 1} attempts, skipping")
+                    break
+                except ApiProcessingError:
+                    if attempt == len(PROCESSING_RETRY_DELAYS):
+                        raise
+                    delay = PROCESSING_RETRY_DELAYS[attempt] + random.uniform(-0.5, 0.5)
+                    self.logger.warning(
+                        f"Server {server_id}: API processing (attempt {attempt + 1}/"
+                        f"{len(PROCESSING_RETRY_DELAYS) + 1}), retry in {delay:.1f}s"
+                    )
+                    await asyncio.sleep(delay)
+            if result:
+                self.logger.info(f"Sent daily challenge for server {server_id}: {result.get('title')}")
+            else:
+                self.logger.warning(f"Failed to send daily challenge for server {server_id}")
+        except ApiProcessingError:
+            self.logger.warning(f"Server {server_id}: API still processing after retries, skipping")
+        except ApiRateLimitError:
+            self.logger.warning(f"Server {server_id}: rate limited, skipping daily challenge")
+        except Exception as e:
+            self.logger.error(f"Error in send_daily_challenge_job for server {server_id}: {e}", exc_info=True)
         finally:
             await self._cleanup_scheduled_delivery(delivery_key)
 
@@ -200,6 +227,8 @@ class ScheduleManagerCog(commands.Cog):
             if self.scheduler.get_job(job_id):
                 self.scheduler.remove_job(job_id)
                 self.logger.info(f"Removed existing schedule for server {server_id}")
+            if self.scheduler.get_job(f"prewarm_{server_id}"):
+                self.scheduler.remove_job(f"prewarm_{server_id}")
 
             # Get server settings and add new schedule
             server_settings = self.bot.db.get_server_settings(server_id)
@@ -10,6 +10,7 @@ from bot.api_client import (
     ApiProcessingError,
     ApiRateLimitError,
 )
+from bot.utils.deadline import start_interaction_deadline
 from bot.utils.logger import get_commands_logger
 from bot.utils.ui_helpers import _get_locale, create_similar_results_message, send_api_error
 
@@ -48,6 +49,7 @@ class SimilarCog(commands.Cog):
         cfg = self.bot.config.get_similar_config()
         top_k = max(1, min(top_k, 20))
         await interaction.response.defer(ephemeral=not public)
+        start_interaction_deadline()
 
         try:
             if problem:
@@ -1,4 +1,3 @@
-import asyncio
 import re
 import time
 
@@ -8,6 +7,7 @@ from discord.ext import commands
 
 from bot.api_client import ApiError, ApiNetworkError, ApiProcessingError, ApiRateLimitError
 from bot.utils.config import DEFAULT_POST_TIME, DEFAULT_TIMEZONE, parse_timezone
+from bot.utils.deadline import start_interaction_deadline
 from bot.utils.logger import get_commands_logger
 from bot.utils.ui_helpers import (
     _get_locale,
@@ -43,6 +43,7 @@ class SlashCommandsCog(commands.Cog):
     )
     async def daily_command(self, interaction: discord.Interaction, date: str = None, public: bool = False):
         await interaction.response.defer(ephemeral=not public)
+        start_interaction_deadline()
         if date:
             await self._daily_by_date(interaction, "com", date, public)
         else:
@@ -55,6 +56,7 @@ class SlashCommandsCog(commands.Cog):
     )
     async def daily_cn_command(self, interaction: discord.Interaction, date: str = None, public: bool = False):
         await interaction.response.defer(ephemeral=not public)
+        start_interaction_deadline()
         if date:
             await self._daily_by_date(interaction, "cn", date, public)
         else:
@@ -145,6 +147,7 @@ class SlashCommandsCog(commands.Cog):
             rating_min, rating_max = rating_max, rating_min
 
         await interaction.response.defer(ephemeral=not public)
+        start_interaction_deadline()
 
         try:
             problem = await self.bot.api.get_random_problem(
@@ -207,14 +210,11 @@ class SlashCommandsCog(commands.Cog):
     @random_command.autocomplete("tags")
     async def random_tags_autocomplete(self, interaction: discord.Interaction, current: str):
         source = (interaction.namespace.source if interaction.namespace else None) or "leetcode"
-        if source == "all":
-            source = "leetcode"
         try:
-            tags = await self.bot.api.get_tags_cached(source)
+            index = await self.bot.api.get_tag_index(source)
         except Exception:
-            tags = []
-        filtered = [t for t in tags if current.lower() in t.lower()]
-        return [app_commands.Choice(name=t, value=t) for t in filtered[:25]]
+            return []
+        return [app_commands.Choice(name=t, value=t) for t in index.search(current, 25)]
 
     # ── /problem ──────────────────────────────────────────────────────
 
@@ -269,24 +269,21 @@ class SlashCommandsCog(commands.Cog):
             return
 
         await interaction.response.defer(ephemeral=not public)
+        start_interaction_deadline()
 
         try:
-            sem = asyncio.Semaphore(5)
-
-            async def resolve_one(query: str):
-                async with sem:
-                    full_query = f"{source}:{query}" if source and source != "leetcode" else query
-                    result = await self.bot.api.resolve(full_query)
-                    if result and result.get("problem"):
-                        return result["problem"]
-                    if not source or source == "leetcode":
-                        problem = await self.bot.api.get_problem("leetcode", query)
-                        if problem:
-                            return problem
-                    return None
-
-            results = await asyncio.gather(*[resolve_one(q) for q in id_strings])
-            problems = [r for r in results if r is not None]
+            queries = [f"{source}:{query}" if source and source != "leetcode" else query for query in id_strings]
+            resolved = await self.bot.api.resolve_many(queries)
+            found = [result["problem"] if result and result.get("problem") else None for result in resolved]
+
+            if not source or source == "leetcode":
+                missing = [i for i, problem in enumerate(found) if problem is None]
+                if missing:
+                    fallbacks = await self.bot.api.get_problems_bulk([("leetcode", id_strings[i]) for i in missing])
+                    for i, problem in zip(missing, fallbacks):
+                        found[i] = problem
+
+            problems = [problem for problem in found if problem]
 
             if not problems:
                 await interaction.followup.send(
@@ -634,6 +631,7 @@ class SlashCommandsCog(commands.Cog):
             limit = 50
 
         await interaction.response.defer(ephemeral=not public)
+        start_interaction_deadline()
 
         try:
             submissions = await self.bot.lcus.fetch_recent_ac_submissions(username, limit)
@@ -5,6 +5,7 @@ from datetime import datetime
 import aiohttp
 from bs4 import BeautifulSoup
 
+from bot.utils import deadline
 from bot.utils.html_converter import normalize_math_delimiters
 
 logger = logging.getLogger("leetcode")
@@ -61,6 +62,9 @@ def generate_history_dates(anchor_date: str, years: int = 5) -> list[str]:
 class LeetCodeClient:
     """LeetCode API Client. Supports both leetcode.com and leetcode.cn."""
 
+    # aiohttp's default total timeout; shortened to the caller's deadline when one is set
+    REQUEST_TIMEOUT = 300
+
     def __init__(self, domain="com"):
         self.domain = domain.lower()
         if self.domain not in ("com", "cn"):
@@ -112,10 +116,15 @@ class LeetCodeClient:
             "operationName": "recentAcSubmissions",
         }
 
+        timeout = deadline.clamp_timeout(self.REQUEST_TIMEOUT)
+        if timeout <= 0:
+            logger.warning(f"Deadline exceeded before fetching submissions for user: {username}")
+            return []
+
         try:
             logger.info(f"Fetching recent AC submissions for user: {username}")
 
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
                 async with session.post(self.graphql_url, headers=headers, json=payload) as response:
                     if response.status != 200:
                         error_text = await response.text()
@@ -7,6 +7,7 @@ from google.genai import types
 from pydantic import BaseModel, Field
 
 from bot.llms.base import InspireOutput, LLMBase, TranslationOutput
+from bot.utils import deadline
 
 logger = logging.getLogger("llm")
 
@@ -81,6 +82,26 @@ class GeminiLLM(LLMBase):
             http_options=http_options,
         )
 
+    async def _generate_content(self, contents: str, config: dict | None) -> object:
+        """Call the blocking SDK in a worker thread, bounded by the caller's deadline.
+
+        The per-request HTTP timeout is shortened as well, so the worker thread
+        gives up too instead of finishing a response nobody will read.
+        """
+        timeout = deadline.clamp_timeout(None)
+        if timeout is not None:
+            if timeout <= 0:
+                raise deadline.DeadlineExceeded()
+            config = {**(config or {}), "http_options": {"timeout": max(1, int(timeout * 1000))}}
+        return await deadline.within_deadline(
+            asyncio.to_thread(
+                self.genai_client.models.generate_content,
+                model=self.model_name,
+                contents=contents,
+                config=config,
+            )
+        )
+
     @staticmethod
     def _schema_to_json(schema: type) -> dict | None:
         if hasattr(schema, "model_json_schema"):
@@ -121,12 +142,9 @@ class GeminiLLM(LLMBase):
             }
             if self.temperature is not None:
                 config_kwargs["temperature"] = self.temperature
-            response = await asyncio.to_thread(
-                self.genai_client.models.generate_content,
-                model=self.model_name,
-                contents=prompt,
-                config=config_kwargs,
-            )
+            response = await self._generate_content(prompt, config_kwargs)
+        except deadline.DeadlineExceeded:
+            raise
         except Exception as exc:
             logger.warning("Structured output failed: %s", exc, exc_info=True)
             return None
@@ -155,12 +173,7 @@ class GeminiLLM(LLMBase):
         if self.max_tokens is not None:
             config_kwargs["max_output_tokens"] = self.max_tokens
 
-        response = await asyncio.to_thread(
-            self.genai_client.models.generate_content,
-            model=self.model_name,
-            contents=prompt,
-            config=config_kwargs if config_kwargs else None,
-        )
+        response = await self._generate_content(prompt, config_kwargs if config_kwargs else None)
         return getattr(response, "text", "") or ""
 
 
@@ -0,0 +1,124 @@
+"""
+Micro-batching of independent lookups (the DataLoader pattern).
+
+Callers ask for one key at a time; keys requested within a short window are
+handed to a single dispatch call, and each caller gets back its own result or
+its own exception.
+"""
+
+import asyncio
+import contextvars
+import logging
+from typing import Awaitable, Callable, Generic, Hashable, Sequence, TypeVar
+
+logger = logging.getLogger("api_client")
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+def _consume_exception(future: asyncio.Future) -> None:
+    # Callers may stop waiting (e.g. at their deadline); don't log their errors as unretrieved.
+    if not future.cancelled():
+        future.exception()
+
+
+class MicroBatcher(Generic[K, V]):
+    """
+    Collect keys requested within ``window`` seconds and dispatch them together.
+
+    ``load`` returns a future per key, shared by everyone asking for that key in
+    the same window. ``dispatch`` receives the distinct keys of a batch and
+    returns one result per key in order; an exception instance in place of a
+    result fails only that key. A batch is dispatched early once it holds
+    ``max_size`` keys. Dispatch runs outside the callers' context, so no single
+    caller's traffic lane or deadline applies to the whole batch.
+    """
+
+    def __init__(
+        self,
+        dispatch: Callable[[list[K]], Awaitable[Sequence[V | BaseException]]],
+        *,
+        window: float,
+        max_size: int = 50,
+    ):
+        self._dispatch = dispatch
+        self.window = window
+        self.max_size = max(1, max_size)
+        self._pending: dict[K, asyncio.Future] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self.loads = 0
+        self.batches = 0
+        self.keys = 0
+
+    def load(self, key: K) -> asyncio.Future:
+        """Queue ``key`` for the next batch and return the future of its result."""
+        self.loads += 1
+        future = self._pending.get(key)
+        if future is not None:
+            return future
+        loop = asyncio.get_running_loop()
+        future = self._pending[key] = loop.create_future()
+        future.add_done_callback(_consume_exception)
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+        self.batches += 1
+        self.keys += len(batch)
+        loop = asyncio.get_running_loop()
+        task = contextvars.Context().run(loop.create_task, self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict[K, asyncio.Future]) -> None:
+        keys = list(batch)
+        try:
+            results = await self._dispatch(keys)
+            if len(results) != len(keys):
+                raise RuntimeError(f"Batch dispatch returned {len(results)} results for {len(keys)} keys")
+        except asyncio.CancelledError:
+            for future in batch.values():
+                future.cancel()
+            raise
+        except Exception as e:
+            logger.warning("Batch of %d keys failed: %s", len(keys), e)
+            results = [e] * len(keys)
+        for key, result in zip(keys, results):
+            future = batch[key]
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def close(self) -> None:
+        """Cancel the pending batch and any batch still being dispatched."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        for task in self._tasks:
+            task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "loads": self.loads,
+            "batches": self.batches,
+            "keys": self.keys,
+            "pending": len(self._pending),
+            "avg_batch": round(self.keys / self.batches, 2) if self.batches else None,
+        }
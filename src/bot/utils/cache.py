@@ -0,0 +1,206 @@
+"""
+In-memory caching primitives shared by the API client.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Hashable
+
+logger = logging.getLogger("api_client")
+
+
+@dataclass
+class CacheStats:
+    """Counters reported by a TTLCache"""
+
+    hits: int = 0
+    stale_hits: int = 0
+    persistent_hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return dict(self.__dict__)
+
+
+class TTLCache:
+    """
+    Bounded LRU cache with stale-while-revalidate semantics.
+
+    An entry is fresh for ``ttl`` seconds, then stale for another ``stale_ttl``
+    seconds (still served, but the caller should refresh it), then expired.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        stale_ttl: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.peek(key) is not None
+
+    def peek(self, key: Hashable) -> tuple[Any, bool] | None:
+        """Return ``(value, is_stale)`` without touching LRU order or counters."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        age = self._clock() - stored_at
+        if age >= self.ttl + self.stale_ttl:
+            return None
+        return value, age >= self.ttl
+
+    def lookup(self, key: Hashable) -> tuple[Any, bool] | None:
+        """Return ``(value, is_stale)`` for a live entry, or None on a miss."""
+        found = self.peek(key)
+        if found is None:
+            self._entries.pop(key, None)
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        if found[1]:
+            self.stats.stale_hits += 1
+        else:
+            self.stats.hits += 1
+        return found
+
+    def set(self, key: Hashable, value: Any, *, age: float = 0.0) -> None:
+        """Store a value; ``age`` back-dates entries loaded from an older source."""
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (self._clock() - age, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def pop(self, key: Hashable) -> Any:
+        entry = self._entries.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+@dataclass
+class _Pool:
+    items: deque = field(default_factory=deque)
+    last_used: float = 0.0
+    refill: asyncio.Task | None = None
+
+
+class PrefetchPool:
+    """
+    Per-key buffers of interchangeable items fetched in batches.
+
+    ``get`` serves from the key's buffer and starts a background refill once it
+    drops to ``low_water`` items; it only waits on ``fetch(key, background)``
+    when the buffer is empty, and concurrent callers then share one fetch. Keys idle for
+    ``idle_ttl`` seconds, and the least recently used beyond ``max_keys``, are
+    dropped.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[Hashable, bool], Awaitable[list]],
+        *,
+        low_water: int,
+        max_keys: int,
+        idle_ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._fetch = fetch
+        self.low_water = low_water
+        self.max_keys = max_keys
+        self.idle_ttl = idle_ttl
+        self._clock = clock
+        self._pools: OrderedDict[Hashable, _Pool] = OrderedDict()
+        self.counters = {"hits": 0, "misses": 0, "refills": 0, "refill_errors": 0, "evictions": 0}
+
+    def _evict(self, now: float, keep: Hashable) -> None:
+        idle = [key for key, pool in self._pools.items() if key != keep and now - pool.last_used >= self.idle_ttl]
+        for key in idle:
+            self._drop(key)
+        while len(self._pools) > self.max_keys:
+            self._drop(next(iter(self._pools)))
+
+    def _drop(self, key: Hashable) -> None:
+        pool = self._pools.pop(key)
+        if pool.refill is not None:
+            pool.refill.cancel()
+        self.counters["evictions"] += 1
+
+    def _start_refill(self, key: Hashable, pool: _Pool, background: bool = False) -> asyncio.Task:
+        async def refill():
+            try:
+                batch = await self._fetch(key, background)
+            finally:
+                pool.refill = None
+            self.counters["refills"] += 1
+            pool.items.extend(batch)
+            return batch
+
+        pool.refill = asyncio.create_task(refill())
+        return pool.refill
+
+    def _refill_in_background(self, key: Hashable, pool: _Pool) -> None:
+        def log_failure(task: asyncio.Task) -> None:
+            if not task.cancelled() and task.exception() is not None:
+                self.counters["refill_errors"] += 1
+                logger.warning("Background refill failed for %s: %s", key, task.exception())
+
+        self._start_refill(key, pool, background=True).add_done_callback(log_failure)
+
+    async def get(self, key: Hashable) -> Any | None:
+        """Take one item for ``key``, or None when a fresh batch for it comes back empty."""
+        now = self._clock()
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = _Pool()
+        pool.last_used = now
+        self._pools.move_to_end(key)
+        self._evict(now, key)
+        if pool.items:
+            self.counters["hits"] += 1
+        else:
+            self.counters["misses"] += 1
+        # Other waiters may drain a shared batch first; fetch again until one is left.
+        while not pool.items:
+            batch = await asyncio.shield(pool.refill or self._start_refill(key, pool))
+            if not batch:
+                return None
+        item = pool.items.popleft()
+        if len(pool.items) <= self.low_water and pool.refill is None:
+            self._refill_in_background(key, pool)
+        return item
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "keys": len(self._pools),
+            "buffered": sum(len(pool.items) for pool in self._pools.values()),
+        }
+
+    def close(self) -> None:
+        """Cancel pending refills and discard every buffer."""
+        for pool in self._pools.values():
+            if pool.refill is not None:
+                pool.refill.cancel()
+        self._pools.clear()
@@ -0,0 +1,158 @@
+"""
+Record/replay of oj-api traffic for offline load tests and benchmarks.
+
+A cassette is a JSON-lines file (gzip-compressed when the name ends in ``.gz``)
+with one recorded exchange per line. ``RecordingSession`` wraps a live aiohttp
+session and appends every exchange; ``ReplaySession`` serves them back without
+touching the network, optionally re-enacting the recorded latency. Both expose
+the small slice of the ``aiohttp.ClientSession`` interface the API client uses.
+"""
+
+import asyncio
+import contextlib
+import gzip
+import json
+import logging
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+import aiohttp
+
+from bot.utils import compression
+
+logger = logging.getLogger("api_client")
+
+# Response headers worth keeping; the rest only bloat the cassette.
+RECORDED_HEADERS = ("ETag", "Retry-After", "Content-Type", "Location")
+
+
+class CassetteMissError(aiohttp.ClientError):
+    """A replayed request has no recorded counterpart."""
+
+
+def _open(path: Path, mode: str):
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def exchange_key(method: str, path: str, params: dict | None = None, json_body: Any = None) -> str:
+    """Identify a request independently of parameter order."""
+    key = f"{method.upper()} {path.lstrip('/')}"
+    if params:
+        key += "?" + "&".join(f"{k}={v}" for k, v in sorted(params.items()) if v is not None)
+    if json_body is not None:
+        key += " " + json.dumps(json_body, sort_keys=True, ensure_ascii=False)
+    return key
+
+
+class CassetteResponse:
+    """Response stand-in backed by a fully read body."""
+
+    def __init__(self, status: int, headers: dict[str, str], body: bytes):
+        self.status = status
+        self.headers = headers
+        self.content_length = len(body)
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self) -> str:
+        return self._body.decode("utf-8")
+
+    async def json(self) -> Any:
+        return json.loads(self._body) if self._body else None
+
+
+class RecordingSession:
+    """Pass requests through to ``session`` and append each exchange to ``path``."""
+
+    def __init__(self, session: aiohttp.ClientSession, path: str | Path):
+        self._session = session
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.recorded = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._session.closed
+
+    @property
+    def connector(self):
+        return self._session.connector
+
+    async def close(self) -> None:
+        await self._session.close()
+
+    @contextlib.asynccontextmanager
+    async def request(self, method: str, path: str, **kwargs) -> AsyncIterator[CassetteResponse]:
+        started = time.monotonic()
+        async with self._session.request(method, path, **kwargs) as resp:
+            # Stored decompressed, so replays need no Content-Encoding handling.
+            body = compression.decompress(await resp.read(), resp.headers.get("Content-Encoding"))
+            elapsed = time.monotonic() - started
+            headers = {name: resp.headers[name] for name in RECORDED_HEADERS if name in resp.headers}
+        if method.upper() != "HEAD":
+            self._append(
+                {
+                    "key": exchange_key(method, path, kwargs.get("params"), kwargs.get("json")),
+                    "status": resp.status,
+                    "headers": headers,
+                    "body": body.decode("utf-8", errors="replace"),
+                    "elapsed": round(elapsed, 4),
+                }
+            )
+        yield CassetteResponse(resp.status, headers, body)
+
+    def _append(self, entry: dict) -> None:
+        with _open(self.path, "a") as f:
+            f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.recorded += 1
+
+
+class ReplaySession:
+    """
+    Serve recorded exchanges in their original order per request.
+
+    Once a request's recordings are used up, the last one is repeated so load
+    tests can run for longer than the recording. With ``latency="original"``
+    each reply is delayed by its recorded duration (times ``latency_scale``).
+    """
+
+    def __init__(self, path: str | Path, *, latency: str = "none", latency_scale: float = 1.0):
+        if latency not in ("none", "original"):
+            raise ValueError("latency must be 'none' or 'original'")
+        self.path = Path(path)
+        self.latency = latency
+        self.latency_scale = latency_scale
+        self.closed = False
+        self.connector = None
+        self.replayed = 0
+        self._entries: dict[str, deque[dict]] = defaultdict(deque)
+        with _open(self.path, "r") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries[entry["key"]].append(entry)
+        logger.info("Loaded %d recorded exchanges from %s", sum(map(len, self._entries.values())), self.path)
+
+    async def close(self) -> None:
+        self.closed = True
+
+    def keys(self) -> list[str]:
+        return list(self._entries)
+
+    @contextlib.asynccontextmanager
+    async def request(self, method: str, path: str, **kwargs) -> AsyncIterator[CassetteResponse]:
+        key = exchange_key(method, path, kwargs.get("params"), kwargs.get("json"))
+        recorded = self._entries.get(key)
+        if not recorded:
+            raise CassetteMissError(f"No recorded response for {key}")
+        entry = recorded.popleft() if len(recorded) > 1 else recorded[0]
+        if self.latency == "original":
+            await asyncio.sleep(entry["elapsed"] * self.latency_scale)
+        self.replayed += 1
+        yield CassetteResponse(entry["status"], entry["headers"], entry["body"].encode("utf-8"))
@@ -0,0 +1,51 @@
+"""
+JSON codec used at the API boundary.
+
+Picks the fastest installed backend (orjson, then msgspec) and falls back to
+the standard library, so the speed-up is opt-in by installing a package.
+"""
+
+import json
+from collections.abc import Mapping
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - depends on the environment
+    msgspec = None
+
+
+def _stdlib_loads(data: bytes | str) -> Any:
+    return json.loads(data)
+
+
+def _select_loads() -> tuple[str, Callable[[bytes | str], Any]]:
+    if orjson is not None:
+        return "orjson", orjson.loads
+    if msgspec is not None:
+        return "msgspec", msgspec.json.decode
+    return "json", _stdlib_loads
+
+
+BACKEND, _loads = _select_loads()
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode a JSON document straight from response bytes."""
+    return _loads(data)
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> str:
+    """Encode to a JSON string; typed payload records are written as plain objects."""
+    return json.dumps(obj, ensure_ascii=False, default=_default)
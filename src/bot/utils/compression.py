@@ -0,0 +1,73 @@
+"""
+Content-Encoding negotiation and decoding for API responses.
+
+gzip and deflate are always available; brotli and zstd are advertised only when
+one of their optional packages is installed.
+"""
+
+import zlib
+from typing import Callable
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+
+def _gunzip(data: bytes) -> bytes:
+    return zlib.decompress(data, wbits=zlib.MAX_WBITS | 16)
+
+
+def _inflate(data: bytes) -> bytes:
+    try:
+        return zlib.decompress(data)
+    except zlib.error:
+        # Some servers send raw deflate without the zlib header.
+        return zlib.decompress(data, wbits=-zlib.MAX_WBITS)
+
+
+def _unzstd(data: bytes) -> bytes:
+    return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+
+def _decoders() -> dict[str, Callable[[bytes], bytes]]:
+    decoders: dict[str, Callable[[bytes], bytes]] = {}
+    if zstandard is not None:
+        decoders["zstd"] = _unzstd
+    if brotli is not None:
+        decoders["br"] = brotli.decompress
+    decoders["gzip"] = _gunzip
+    decoders["x-gzip"] = _gunzip
+    decoders["deflate"] = _inflate
+    return decoders
+
+
+DECODERS = _decoders()
+
+
+def accept_encoding() -> str:
+    """Accept-Encoding value listing the installed codecs, best compression first."""
+    return ", ".join(name for name in DECODERS if name != "x-gzip")
+
+
+def decompress(data: bytes, content_encoding: str | None) -> bytes:
+    """Undo ``content_encoding`` (possibly a comma-separated chain) on ``data``."""
+    if not content_encoding:
+        return data
+    codings = [c.strip().lower() for c in content_encoding.split(",") if c.strip()]
+    for coding in reversed(codings):
+        if coding == "identity":
+            continue
+        decoder = DECODERS.get(coding)
+        if decoder is None:
+            raise ValueError(f"Unsupported Content-Encoding: {coding}")
+        data = decoder(data)
+    return data
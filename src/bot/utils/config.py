@@ -6,7 +6,7 @@ import logging
 import os
 import re
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict, Optional
@@ -227,6 +227,92 @@ class ConfigManager:
     def api_timeout(self) -> int:
         return self.get("api.timeout", 10)
 
+    def get_api_client_config(self) -> "ApiClientConfig":
+        """Get oj-api client tuning (caching, resilience) configuration"""
+        cache = self.get("api.cache", {})
+        rate_limit = self.get("api.rate_limit", {})
+        circuit_breaker = self.get("api.circuit_breaker", {})
+        retry = self.get("api.retry", {})
+        hedging = self.get("api.hedging", {})
+        processing = self.get("api.processing", {})
+        connection = self.get("api.connection", {})
+        lanes = self.get("api.lanes", {})
+        cassette = self.get("api.cassette", {})
+        compression = self.get("api.compression", {})
+        random_pool = self.get("api.random_pool", {})
+        routing = self.get("api.routing", {})
+        concurrency = self.get("api.concurrency", {})
+        batching = self.get("api.batching", {})
+        rate, burst = rate_limit.get("rate", 20), rate_limit.get("burst", 40)
+        return ApiClientConfig(
+            problem_cache_size=cache.get("problem_size", 512),
+            problem_cache_ttl=cache.get("problem_ttl", 600),
+            problem_cache_stale_ttl=cache.get("problem_stale_ttl", 86400),
+            daily_cache_ttl=cache.get("daily_ttl", 300),
+            persistent_cache=cache.get("persistent", True),
+            negative_cache_size=cache.get("not_found_size", 1024),
+            negative_cache_ttl=cache.get("not_found_ttl", 60),
+            similar_cache_size=cache.get("similar_size", 256),
+            similar_cache_ttl=cache.get("similar_ttl", 3600),
+            rate_limit=rate,
+            rate_limit_burst=burst,
+            rate_limit_families={
+                # Overrides may set only rate or burst; the other comes from the top level.
+                family: (limits.get("rate", rate), limits.get("burst", burst))
+                for family, limits in rate_limit.items()
+                if isinstance(limits, dict)
+            },
+            circuit_failure_threshold=circuit_breaker.get("failure_threshold", 5),
+            circuit_recovery_timeout=circuit_breaker.get("recovery_timeout", 30),
+            retry_max_attempts=retry.get("max_attempts", 3),
+            retry_base_delay=retry.get("base_delay", 1.0),
+            retry_max_delay=retry.get("max_delay", 8.0),
+            retry_budget_ratio=retry.get("budget_ratio", 0.2),
+            retry_budget_min_retries=retry.get("budget_min_retries", 10),
+            hedge_enabled=hedging.get("enabled", False),
+            hedge_percentile=hedging.get("percentile", 0.95),
+            hedge_min_delay=hedging.get("min_delay", 0.05),
+            hedge_min_samples=hedging.get("min_samples", 20),
+            hedge_budget_ratio=hedging.get("budget_ratio", 0.1),
+            processing_poll=processing.get("poll", False),
+            processing_poll_timeout=processing.get("timeout", 60.0),
+            processing_poll_initial_delay=processing.get("initial_delay", 1.0),
+            processing_poll_max_delay=processing.get("max_delay", 10.0),
+            adaptive_concurrency=concurrency.get("adaptive", True),
+            concurrency_initial=concurrency.get("initial", 10),
+            concurrency_min=concurrency.get("min", 2),
+            concurrency_max=concurrency.get("max", 64),
+            concurrency_latency_tolerance=concurrency.get("latency_tolerance", 2.0),
+            concurrency_backoff=concurrency.get("backoff", 0.75),
+            transport=connection.get("transport", "http1"),
+            connector_limit=connection.get("limit", 100),
+            connector_limit_per_host=connection.get("limit_per_host", 0),
+            keepalive_timeout=connection.get("keepalive_timeout", 30),
+            dns_cache_ttl=connection.get("dns_cache_ttl", 300),
+            warm_connections=connection.get("warm_connections", 2),
+            warm_interval=connection.get("warm_interval", 20),
+            warm_path=connection.get("warm_path", ""),
+            replicas=list(routing.get("replicas", [])),
+            routing_ewma_alpha=routing.get("ewma_alpha", 0.3),
+            routing_eject_after=routing.get("eject_after", 3),
+            routing_eject_duration=routing.get("eject_duration", 30.0),
+            routing_probe_interval=routing.get("probe_interval", 10.0),
+            routing_probe_path=routing.get("probe_path", ""),
+            interactive_concurrency=lanes.get("interactive", 0),
+            background_concurrency=lanes.get("background", 2),
+            random_pool_batch=random_pool.get("batch", 10),
+            random_pool_low_water=random_pool.get("low_water", 3),
+            random_pool_max_keys=random_pool.get("max_keys", 64),
+            random_pool_idle_ttl=random_pool.get("idle_ttl", 1800),
+            batch_window=batching.get("window", 0.0),
+            batch_max_size=batching.get("max_size", 50),
+            compression=compression.get("enabled", True),
+            decompress_offload_bytes=compression.get("offload_bytes", 131072),
+            cassette_mode=cassette.get("mode", "off"),
+            cassette_path=cassette.get("path", "data/api-cassette.jsonl.gz"),
+            cassette_latency=cassette.get("latency", "none"),
+        )
+
     @property
     def default_locale(self) -> str:
         return self.get("i18n.default_locale", "zh-TW")
@@ -245,6 +331,73 @@ class SimilarConfig:
     timeout: int = 300
 
 
+@dataclass
+class ApiClientConfig:
+    """oj-api client tuning configuration"""
+
+    problem_cache_size: int = 512
+    problem_cache_ttl: float = 600
+    problem_cache_stale_ttl: float = 86400
+    daily_cache_ttl: float = 300
+    persistent_cache: bool = True
+    negative_cache_size: int = 1024
+    negative_cache_ttl: float = 60
+    similar_cache_size: int = 256
+    similar_cache_ttl: float = 3600
+    rate_limit: float = 20
+    rate_limit_burst: int = 40
+    rate_limit_families: Dict[str, tuple[float, int]] = field(default_factory=dict)
+    circuit_failure_threshold: int = 5
+    circuit_recovery_timeout: float = 30
+    retry_max_attempts: int = 3
+    retry_base_delay: float = 1.0
+    retry_max_delay: float = 8.0
+    retry_budget_ratio: float = 0.2
+    retry_budget_min_retries: int = 10
+    hedge_enabled: bool = False
+    hedge_percentile: float = 0.95
+    hedge_min_delay: float = 0.05
+    hedge_min_samples: int = 20
+    hedge_budget_ratio: float = 0.1
+    processing_poll: bool = False
+    processing_poll_timeout: float = 60.0
+    processing_poll_initial_delay: float = 1.0
+    processing_poll_max_delay: float = 10.0
+    adaptive_concurrency: bool = True
+    concurrency_initial: int = 10
+    concurrency_min: int = 2
+    concurrency_max: int = 64
+    concurrency_latency_tolerance: float = 2.0
+    concurrency_backoff: float = 0.75
+    transport: str = "http1"
+    connector_limit: int = 100
+    connector_limit_per_host: int = 0
+    keepalive_timeout: float = 30
+    dns_cache_ttl: int = 300
+    warm_connections: int = 2
+    warm_interval: float = 20
+    warm_path: str = ""
+    replicas: list[str] = field(default_factory=list)
+    routing_ewma_alpha: float = 0.3
+    routing_eject_after: int = 3
+    routing_eject_duration: float = 30.0
+    routing_probe_interval: float = 10.0
+    routing_probe_path: str = ""
+    interactive_concurrency: int = 0
+    background_concurrency: int = 2
+    random_pool_batch: int = 10
+    random_pool_low_water: int = 3
+    random_pool_max_keys: int = 64
+    random_pool_idle_ttl: float = 1800
+    batch_window: float = 0.0
+    batch_max_size: int = 50
+    compression: bool = True
+    decompress_offload_bytes: int = 131072
+    cassette_mode: str = "off"
+    cassette_path: str = "data/api-cassette.jsonl.gz"
+    cassette_latency: str = "none"
+
+
 # Global configuration instance
 _config: Optional[ConfigManager] = None
 
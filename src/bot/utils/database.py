@@ -5,6 +5,7 @@ import sqlite3
 import time
 from pathlib import Path
 
+from . import codec
 from .paths import get_repo_root, resolve_repo_path
 
 # Module-level logger
@@ -393,6 +394,111 @@ class LLMInspireDatabaseManager:
         logger.info(f"Saved LLM inspire for {source}/{problem_id}/{locale}, model={model_name}")
 
 
+class ApiCacheDatabaseManager:
+    """
+    Persistent cache tier for oj-api responses, keyed by the client's cache key.
+    """
+
+    def __init__(self, db_path="data/data.db"):
+        self.db_path = resolve_db_path(db_path)
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+        logger.info(f"API cache DB manager initialized with database at {self.db_path}")
+
+    def _init_db(self):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS api_cache (
+            cache_key TEXT PRIMARY KEY,
+            payload TEXT NOT NULL,
+            fetched_at INTEGER NOT NULL,
+            validator TEXT
+        )
+        """)
+        conn.commit()
+        conn.close()
+
+    def get_entry(self, cache_key):
+        """Get a cached response
+
+        Args:
+            cache_key (str): The client cache key, e.g. "problem:leetcode/1"
+
+        Returns:
+            dict: payload, fetched_at (unix seconds) and validator, or None if not cached
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("SELECT payload, fetched_at, validator FROM api_cache WHERE cache_key = ?", (cache_key,))
+        row = cursor.fetchone()
+        conn.close()
+        if not row:
+            return None
+        try:
+            payload = json.loads(row[0])
+        except json.JSONDecodeError:
+            logger.warning(f"Discarding unreadable API cache entry {cache_key}")
+            self.delete_entry(cache_key)
+            return None
+        return {"payload": payload, "fetched_at": row[1], "validator": row[2]}
+
+    def save_entry(self, cache_key, payload, validator=None, fetched_at=None):
+        if fetched_at is None:
+            fetched_at = int(time.time())
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT OR REPLACE INTO api_cache (cache_key, payload, fetched_at, validator) VALUES (?, ?, ?, ?)",
+            (cache_key, codec.dumps(payload), int(fetched_at), validator),
+        )
+        conn.commit()
+        conn.close()
+
+    def touch_entry(self, cache_key, fetched_at=None):
+        """Mark an entry as revalidated without rewriting its payload"""
+        if fetched_at is None:
+            fetched_at = int(time.time())
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("UPDATE api_cache SET fetched_at = ? WHERE cache_key = ?", (int(fetched_at), cache_key))
+        conn.commit()
+        conn.close()
+
+    def delete_entry(self, cache_key):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM api_cache WHERE cache_key = ?", (cache_key,))
+        conn.commit()
+        conn.close()
+
+    def prune(self, max_age_seconds, keep_prefixes=()):
+        """Delete entries fetched more than max_age_seconds ago
+
+        Args:
+            max_age_seconds: age after which an entry is deleted
+            keep_prefixes: cache key prefixes whose entries are kept regardless of age
+
+        Returns:
+            int: number of deleted entries
+        """
+        cutoff = int(time.time()) - int(max_age_seconds)
+        query = "DELETE FROM api_cache WHERE fetched_at < ?"
+        params = [cutoff]
+        for prefix in keep_prefixes:
+            query += " AND substr(cache_key, 1, ?) != ?"
+            params += [len(prefix), prefix]
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        deleted = cursor.rowcount
+        conn.commit()
+        conn.close()
+        if deleted:
+            logger.info(f"Pruned {deleted} expired API cache entries")
+        return deleted
+
+
 if __name__ == "__main__":
     # Example usage
     db_manager = SettingsDatabaseManager()
@@ -0,0 +1,96 @@
+"""
+Per-task deadlines propagated from Discord interactions down to outbound calls.
+
+A deadline lives in a context variable, so it follows the command handler into
+everything it awaits (and any task it spawns) without threading it through
+every signature. Clients clamp their own timeouts to what is left and give up
+early once it has passed.
+"""
+
+import asyncio
+import contextlib
+import inspect
+import time
+from contextvars import ContextVar
+from typing import Awaitable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# Discord accepts followups on an interaction token for 15 minutes.
+FOLLOWUP_WINDOW = 15 * 60
+# Headroom for the pre-defer ack and for sending the final (error) followup.
+FOLLOWUP_MARGIN = 10
+
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """Raised when work cannot finish before the current deadline."""
+
+    def __init__(self, detail: str = "Interaction deadline exceeded"):
+        self.detail = detail
+        super().__init__(detail)
+
+
+def set_deadline(seconds: float) -> None:
+    """Require the current task to finish within ``seconds``; an earlier deadline is kept."""
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    _deadline.set(deadline if current is None else min(current, deadline))
+
+
+def start_interaction_deadline(budget: float | None = None) -> None:
+    """Start the deadline for a deferred interaction: its followup window, or ``budget`` if shorter."""
+    window = FOLLOWUP_WINDOW - FOLLOWUP_MARGIN
+    set_deadline(window if budget is None else min(window, budget))
+
+
+@contextlib.contextmanager
+def deadline_scope(seconds: float) -> Iterator[None]:
+    """Apply a deadline to the enclosed block only."""
+    token = _deadline.set(_deadline.get())
+    try:
+        set_deadline(seconds)
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> float | None:
+    """Seconds left before the current deadline, or None when there is none."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check_deadline() -> None:
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded()
+
+
+def clamp_timeout(timeout: float | None) -> float | None:
+    """Shrink ``timeout`` (seconds, None = unbounded) to the time left before the deadline."""
+    left = remaining()
+    if left is None:
+        return timeout
+    left = max(0.0, left)
+    return left if timeout is None else min(timeout, left)
+
+
+async def within_deadline(awaitable: Awaitable[T]) -> T:
+    """Await ``awaitable``, cancelling it and raising DeadlineExceeded if the deadline passes first."""
+    left = remaining()
+    if left is None:
+        return await awaitable
+    if left <= 0:
+        if inspect.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceeded()
+    try:
+        return await asyncio.wait_for(awaitable, left)
+    except asyncio.TimeoutError as e:
+        if isinstance(e, DeadlineExceeded) or remaining() > 0:
+            raise
+        raise DeadlineExceeded() from e
@@ -0,0 +1,123 @@
+"""
+HTTP/2 transport for the API client, built on httpx.
+
+aiohttp only speaks HTTP/1.1, so concurrent requests need one connection each.
+Over HTTP/2 they are multiplexed as streams on a few connections instead.
+``HttpxSession`` exposes the small slice of the ``aiohttp.ClientSession``
+interface the API client uses (like the cassette sessions) and translates
+httpx errors into their aiohttp/asyncio counterparts, so retries, circuit
+breakers and failover treat both transports alike.
+
+Requires httpx with its HTTP/2 extra (``pip install 'httpx[http2]'``).
+"""
+
+import asyncio
+import contextlib
+from typing import Any, AsyncIterator
+
+import aiohttp
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - depends on the environment
+    httpx = None
+
+try:
+    import h2
+except ImportError:  # pragma: no cover - depends on the environment
+    h2 = None
+
+
+def available(http2: bool = True) -> bool:
+    """Whether ``HttpxSession`` can be used (with HTTP/2 when ``http2`` is set)."""
+    return httpx is not None and (h2 is not None or not http2)
+
+
+def _translate(error: Exception) -> Exception:
+    if isinstance(error, httpx.TimeoutException):
+        return asyncio.TimeoutError(str(error) or type(error).__name__)
+    if isinstance(error, httpx.TransportError):
+        return aiohttp.ClientConnectionError(str(error) or type(error).__name__)
+    return aiohttp.ClientError(str(error) or type(error).__name__)
+
+
+def _timeout(timeout: Any) -> Any:
+    # aiohttp.ClientTimeout(total=...) becomes a per-phase httpx timeout of the same length.
+    if isinstance(timeout, aiohttp.ClientTimeout):
+        return httpx.Timeout(timeout.total)
+    return timeout
+
+
+class HttpxResponse:
+    """Response stand-in whose ``read`` returns the body as sent (still compressed)."""
+
+    def __init__(self, response: "httpx.Response"):
+        self._response = response
+        self.status = response.status_code
+        self.headers = response.headers
+        self.http_version = response.http_version
+        length = response.headers.get("Content-Length")
+        self.content_length = int(length) if length and length.isdigit() else None
+        self._body: bytes | None = None
+
+    async def read(self) -> bytes:
+        if self._body is None:
+            try:
+                self._body = b"".join([chunk async for chunk in self._response.aiter_raw()])
+            except httpx.HTTPError as e:
+                raise _translate(e) from e
+        return self._body
+
+
+class HttpxSession:
+    """Send requests through an ``httpx.AsyncClient``, over HTTP/2 unless ``http2`` is off."""
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+        max_connections: int | None = None,
+        keepalive_timeout: float | None = None,
+        http2: bool = True,
+    ):
+        if not available(http2):
+            raise RuntimeError("The HTTP/2 transport needs httpx with HTTP/2 support: pip install 'httpx[http2]'")
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            http2=http2,
+            limits=httpx.Limits(max_connections=max_connections or None, keepalive_expiry=keepalive_timeout),
+        )
+        self.connector = None
+
+    @property
+    def closed(self) -> bool:
+        return self._client.is_closed
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+    @contextlib.asynccontextmanager
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: dict | None = None,
+        json: Any = None,
+        headers: dict | None = None,
+        timeout: Any = None,
+    ) -> AsyncIterator[HttpxResponse]:
+        options = {} if timeout is None else {"timeout": _timeout(timeout)}
+        request = self._client.build_request(method, path, params=params, json=json, headers=headers, **options)
+        try:
+            response = await self._client.send(request, stream=True)
+        except httpx.HTTPError as e:
+            raise _translate(e) from e
+        try:
+            yield HttpxResponse(response)
+        finally:
+            await response.aclose()
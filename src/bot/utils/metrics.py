@@ -0,0 +1,88 @@
+"""
+Lightweight request metrics for the API client.
+
+Everything here is a handful of integer counters per observation, cheap enough
+to leave on in production.
+"""
+
+from bisect import bisect_left
+from collections import Counter
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    """Fixed-bucket histogram; each bucket counts observations ``<=`` its upper bound."""
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate the ``q`` quantile as the upper bound of the bucket that contains it."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, bucket_count in zip(self.bounds, self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> dict:
+        labels = [str(bound) for bound in self.bounds] + ["+Inf"]
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "buckets": dict(zip(labels, self.counts)),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class EndpointMetrics:
+    """Latency, status, size, coalescing and timeout metrics for one endpoint family."""
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.response_bytes = Histogram(SIZE_BUCKETS)
+        self.statuses: Counter[int] = Counter()
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self.network_errors = 0
+
+    def record_response(self, status: int, size: int | None) -> None:
+        self.statuses[status] += 1
+        if size is not None:
+            self.response_bytes.observe(size)
+
+    def record_body(self, wire: int, decoded: int) -> None:
+        """Count a decoded body's size on the wire (compressed) and after decompression."""
+        self.wire_bytes += wire
+        self.decoded_bytes += decoded
+
+    def snapshot(self) -> dict:
+        return {
+            "requests": self.latency.count,
+            "latency": self.latency.snapshot(),
+            "response_bytes": self.response_bytes.snapshot(),
+            "wire_bytes": self.wire_bytes,
+            "decoded_bytes": self.decoded_bytes,
+            "compression_ratio": round(self.decoded_bytes / self.wire_bytes, 2) if self.wire_bytes else None,
+            "statuses": dict(sorted(self.statuses.items())),
+            "coalesced": self.coalesced,
+            "timeouts": self.timeouts,
+            "network_errors": self.network_errors,
+        }
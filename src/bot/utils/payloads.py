@@ -0,0 +1,108 @@
+"""
+Compact typed records for oj-api payloads.
+
+Records keep the known fields in slots instead of a per-object ``__dict__``,
+and keep any unknown fields in a small overflow dict. They are read-only
+``Mapping`` objects, so code written against plain dicts (``.get()``,
+``["key"]``, ``in``, ``==``) keeps working, and ``copy()`` returns a mutable
+``dict`` for callers that want to add fields.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Iterator
+
+_MISSING: Any = object()
+
+
+class Record(Mapping):
+    """Base for slotted, dict-compatible payload records."""
+
+    __slots__ = ("_extra",)
+    FIELDS: tuple[str, ...] = ()
+    _FIELD_SET: frozenset[str] = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._FIELD_SET = frozenset(cls.FIELDS)
+
+    def __init__(self, data: Mapping[str, Any]):
+        for name in self.FIELDS:
+            object.__setattr__(self, name, data.get(name, _MISSING))
+        extra = {key: value for key, value in data.items() if key not in self._FIELD_SET}
+        object.__setattr__(self, "_extra", extra or None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only; use copy() for a mutable dict")
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._FIELD_SET:
+            value = getattr(self, key)
+            if value is not _MISSING:
+                return value
+        elif self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for name in self.FIELDS:
+            if getattr(self, name) is not _MISSING:
+                yield name
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+    def copy(self) -> dict[str, Any]:
+        return dict(self)
+
+
+class ProblemRecord(Record):
+    """A problem as returned by ``problems/{source}/{id}``, ``daily`` and ``random``."""
+
+    __slots__ = (
+        "id",
+        "source",
+        "slug",
+        "title",
+        "title_cn",
+        "difficulty",
+        "rating",
+        "ac_rate",
+        "link",
+        "tags",
+        "content",
+        "content_cn",
+        "date",
+        "domain",
+        "similar_questions",
+    )
+    FIELDS = __slots__
+
+
+class SimilarResult(Record):
+    """One hit in a similar-problem search."""
+
+    __slots__ = ("source", "id", "title", "difficulty", "rating", "link", "similarity")
+    FIELDS = __slots__
+
+
+def problem_record(payload: Any) -> Any:
+    """Wrap a problem-shaped payload; anything else is returned unchanged."""
+    if isinstance(payload, dict):
+        return ProblemRecord(payload)
+    return payload
+
+
+def similar_payload(payload: Any) -> Any:
+    """Wrap each hit of a similar-search response in a SimilarResult."""
+    if not isinstance(payload, dict) or not isinstance(payload.get("results"), list):
+        return payload
+    results = [SimilarResult(item) if isinstance(item, dict) else item for item in payload["results"]]
+    return {**payload, "results": results}
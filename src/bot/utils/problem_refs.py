@@ -0,0 +1,120 @@
+"""
+Canonical forms of the problem references users type.
+
+The same problem can be asked for as ``Two-Sum``, ``two-sum/``,
+``https://leetcode.com/problems/two-sum/description/`` or ``leetcode:two-sum``;
+``normalize_query`` maps all of these to one key so they share cache entries.
+``parse_problem_ref`` recognizes the forms that already carry a problem's
+canonical ID (LeetCode numbers, Codeforces/AtCoder/Luogu/SPOJ URLs and IDs) so
+they can skip the resolve endpoint. LeetCode slugs and URLs are not among them:
+LeetCode problems are identified by their frontend number.
+"""
+
+import re
+from typing import Callable
+from urllib.parse import urlsplit
+
+from bot.utils.ui_constants import SOURCE_LABELS
+
+# Source that bare queries (without a ``source:`` prefix) resolve against.
+DEFAULT_SOURCE = "leetcode"
+
+_LEETCODE_PROBLEM_PATH = re.compile(r"/problems/([^/]+)")
+# "leetcode.com/problems/..." typed without a scheme
+_SCHEMELESS_URL = re.compile(r"[a-z0-9-]+(?:\.[a-z0-9-]+)+/")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Canonical cache key for a resolve query.
+
+    Trims whitespace and trailing slashes and case-folds. leetcode.com problem
+    URLs reduce to their slug and a ``leetcode:`` prefix is dropped, since bare
+    queries resolve against LeetCode. Other URLs keep host and path without
+    scheme, ``www.``, query string or fragment.
+    """
+    text = query.strip().casefold()
+    if "://" in text or _SCHEMELESS_URL.match(text):
+        parts = urlsplit(text if "://" in text else f"https://{text}")
+        host = (parts.hostname or "").removeprefix("www.")
+        path = parts.path.rstrip("/")
+        match = _LEETCODE_PROBLEM_PATH.match(path)
+        if host == "leetcode.com" and match:
+            return match.group(1)
+        return f"{host}{path}"
+    text = text.rstrip("/")
+    source, sep, ident = text.partition(":")
+    if not sep:
+        return text
+    source, ident = source.strip(), ident.strip()
+    if source == DEFAULT_SOURCE:
+        return ident
+    return f"{source}:{ident}"
+
+
+# (host, path pattern, source, id builder) per judge URL format that names the problem ID.
+_URL_FORMATS: tuple[tuple[str, re.Pattern, str, Callable[[re.Match], str]], ...] = (
+    (
+        "codeforces.com",
+        re.compile(r"/(?:contest/(\d+)/problem|problemset/problem/(\d+))/([^/]+)", re.IGNORECASE),
+        "codeforces",
+        lambda m: f"{m.group(1) or m.group(2)}{m.group(3)}",
+    ),
+    ("atcoder.jp", re.compile(r"/contests/[^/]+/tasks/([^/]+)"), "atcoder", lambda m: m.group(1)),
+    ("luogu.com.cn", re.compile(r"/problem/([^/]+)"), "luogu", lambda m: m.group(1)),
+    ("spoj.com", re.compile(r"/problems/([^/]+)"), "spoj", lambda m: m.group(1)),
+)
+
+# (ID pattern, canonical spelling) per source; anything else is left to the resolve endpoint.
+_ID_FORMATS: dict[str, tuple[re.Pattern, Callable[[re.Match], str]]] = {
+    "leetcode": (re.compile(r"\d{1,5}"), lambda m: m.group(0)),
+    "codeforces": (re.compile(r"(\d+)([a-z]\d?)", re.IGNORECASE), lambda m: f"{m.group(1)}{m.group(2).upper()}"),
+    "atcoder": (re.compile(r"[a-z0-9]+_[a-z0-9]+", re.IGNORECASE), lambda m: m.group(0).lower()),
+    "luogu": (
+        re.compile(r"at_([a-z0-9]+_[a-z0-9]+)|[a-z]+\d+(?:[a-z]\d?)?", re.IGNORECASE),
+        lambda m: f"AT_{m.group(1).lower()}" if m.group(1) else m.group(0).upper(),
+    ),
+    "spoj": (re.compile(r"[a-z0-9_]{1,8}", re.IGNORECASE), lambda m: m.group(0).upper()),
+}
+
+
+def _canonical_id(source: str, ident: str) -> str | None:
+    """Spell ``ident`` the way ``source`` does, or None if it is not shaped like one of its IDs."""
+    id_format = _ID_FORMATS.get(source)
+    if id_format is None:
+        return None
+    pattern, canonical = id_format
+    match = pattern.fullmatch(ident)
+    return canonical(match) if match else None
+
+
+def parse_problem_ref(query: str) -> tuple[str, str] | None:
+    """
+    Return ``(source, id)`` when the reference carries the problem's canonical ID, else None.
+
+    Recognizes Codeforces, AtCoder, Luogu and SPOJ problem URLs, ``source:id``
+    with a known source, and plain LeetCode problem numbers, as long as the ID
+    has its judge's shape; it is returned in the judge's own spelling (e.g.
+    ``spoj:prime1`` becomes ``PRIME1``). LeetCode slugs and URLs, titles and
+    bare IDs of other judges are left to the resolve endpoint.
+    """
+    text = query.strip()
+    lowered = text.lower()
+    if "://" in lowered or _SCHEMELESS_URL.match(lowered):
+        parts = urlsplit(text if "://" in text else f"https://{text}")
+        host = (parts.hostname or "").lower().removeprefix("www.")
+        for format_host, pattern, source, build in _URL_FORMATS:
+            if host == format_host:
+                match = pattern.match(parts.path)
+                ident = _canonical_id(source, build(match)) if match else None
+                return (source, ident) if ident else None
+        return None
+    source, sep, ident = text.partition(":")
+    if sep:
+        source, ident = source.strip().lower(), ident.strip().rstrip("/")
+        if source in SOURCE_LABELS and ident:
+            ident = _canonical_id(source, ident)
+            return (source, ident) if ident else None
+        return None
+    ident = _canonical_id(DEFAULT_SOURCE, text)
+    return (DEFAULT_SOURCE, ident) if ident else None
@@ -0,0 +1,467 @@
+"""
+Flow-control primitives shared by the API client.
+"""
+
+import asyncio
+import contextlib
+import random
+import time
+from collections import deque
+from typing import AsyncIterator, Callable
+
+from bot.utils.metrics import LATENCY_BUCKETS, Histogram
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens per second, holding at most ``burst``."""
+
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+
+    def try_acquire(self) -> float:
+        """Take a token; return 0 on success, otherwise seconds until one is available."""
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        if self.rate <= 0:
+            return 1.0
+        return (1 - self._tokens) / self.rate
+
+
+class RateLimiter:
+    """
+    Client-wide rate limiter with one token bucket per endpoint family.
+
+    A ``Retry-After`` from the server pauses every family at once, so concurrent
+    callers wait out the penalty instead of collecting their own 429s.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        family_limits: dict[str, tuple[float, int]] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._rate = rate
+        self._burst = burst
+        self._family_limits = family_limits or {}
+        self._clock = clock
+        self._buckets: dict[str, TokenBucket] = {}
+        self._paused_until = 0.0
+        self._waiting: dict[str, int] = {}
+
+    def _bucket(self, family: str) -> TokenBucket | None:
+        bucket = self._buckets.get(family)
+        if bucket is None:
+            rate, burst = self._family_limits.get(family, (self._rate, self._burst))
+            if rate is None or rate <= 0:
+                return None
+            bucket = self._buckets[family] = TokenBucket(rate, burst, self._clock)
+        return bucket
+
+    async def acquire(self, family: str) -> None:
+        """Wait until a request for ``family`` may be sent."""
+        self._waiting[family] = self._waiting.get(family, 0) + 1
+        try:
+            while True:
+                delay = self._paused_until - self._clock()
+                if delay <= 0:
+                    bucket = self._bucket(family)
+                    if bucket is None:
+                        return
+                    delay = bucket.try_acquire()
+                    if delay <= 0:
+                        return
+                await asyncio.sleep(delay)
+        finally:
+            self._waiting[family] -= 1
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all callers for ``seconds`` (e.g. from a Retry-After header)."""
+        self._paused_until = max(self._paused_until, self._clock() + max(0.0, seconds))
+
+    @property
+    def paused_for(self) -> float:
+        return max(0.0, self._paused_until - self._clock())
+
+    def stats(self) -> dict:
+        return {
+            "waiting": {family: count for family, count in self._waiting.items() if count},
+            "queued": sum(self._waiting.values()),
+            "paused_for": round(self.paused_for, 3),
+        }
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    ``closed`` lets everything through; after ``failure_threshold`` consecutive
+    failures it turns ``open`` and rejects calls for ``recovery_timeout`` seconds,
+    then goes ``half_open`` and admits a single probe whose outcome closes or
+    re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until an open circuit admits a probe."""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.recovery_timeout - (self._clock() - self._opened_at))
+
+    def allow_request(self) -> bool:
+        if self.failure_threshold <= 0:
+            return True
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        self._state = self.CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probe_in_flight = False
+        if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold > 0:
+            self._state = self.OPEN
+            self._opened_at = self._clock()
+
+    def release(self) -> None:
+        """Give back a half-open probe slot when the call ended without a verdict (e.g. cancelled)."""
+        self._probe_in_flight = False
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "rejected": self.rejected,
+            "retry_in": round(self.retry_in, 3),
+        }
+
+
+class RetryBudget:
+    """
+    Caps retries (or hedged requests) at a fraction of recent traffic so they
+    cannot amplify an outage.
+
+    Within a sliding ``window`` (seconds), at most ``max(min_retries, ratio * requests)``
+    retries are allowed.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.2,
+        min_retries: int = 10,
+        window: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._clock = clock
+        self._requests: deque[float] = deque()
+        self._retries: deque[float] = deque()
+        self.exhausted = 0
+
+    def _trim(self, now: float) -> None:
+        for events in (self._requests, self._retries):
+            while events and now - events[0] > self.window:
+                events.popleft()
+
+    def record_request(self) -> None:
+        now = self._clock()
+        self._trim(now)
+        self._requests.append(now)
+
+    def try_spend(self) -> bool:
+        """Reserve one retry; return False when the budget is exhausted."""
+        now = self._clock()
+        self._trim(now)
+        if len(self._retries) >= max(self.min_retries, self.ratio * len(self._requests)):
+            self.exhausted += 1
+            return False
+        self._retries.append(now)
+        return True
+
+    def stats(self) -> dict:
+        self._trim(self._clock())
+        return {"requests": len(self._requests), "retries": len(self._retries), "exhausted": self.exhausted}
+
+
+class RetryPolicy:
+    """Bounded retries with "decorrelated jitter" exponential backoff."""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 8.0,
+        budget: RetryBudget | None = None,
+        rng: Callable[[float, float], float] = random.uniform,
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self._rng = rng
+
+    def next_delay(self, previous: float) -> float:
+        """Pick the next sleep from ``uniform(base, previous * 3)``, capped at ``max_delay``."""
+        upper = max(self.base_delay, previous * 3)
+        return min(self.max_delay, self._rng(self.base_delay, upper))
+
+    def can_retry(self, attempt: int) -> bool:
+        """Whether another attempt may follow attempt number ``attempt`` (1-based)."""
+        if attempt >= self.max_attempts:
+            return False
+        return self.budget is None or self.budget.try_spend()
+
+
+class LatencyWindow:
+    """Rolling window of recent latencies (seconds) answering percentile queries."""
+
+    def __init__(self, size: int = 256, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> float | None:
+        """Return the ``q`` quantile (0-1), or None until ``min_samples`` were recorded."""
+        if len(self._samples) < max(1, self.min_samples):
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class PriorityLane:
+    """
+    Concurrency limit with its own FIFO queue for one class of traffic.
+
+    Giving background work a lane of its own means it can only ever occupy
+    ``limit`` connections, however much of it is queued.
+    """
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        self._semaphore = asyncio.Semaphore(limit) if limit > 0 else None
+        self.active = 0
+        self.queued = 0
+        self.completed = 0
+        self.queue_wait = Histogram(LATENCY_BUCKETS)
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        started = time.monotonic()
+        self.queued += 1
+        try:
+            if self._semaphore is not None:
+                await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+        self.queue_wait.observe(time.monotonic() - started)
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self.completed += 1
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "queued": self.queued,
+            "completed": self.completed,
+            "queue_wait": self.queue_wait.snapshot(),
+        }
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit that follows upstream health (AIMD).
+
+    While responses arrive within ``tolerance`` times the baseline latency (plus
+    a small slack) and the limit is actually in use, the limit grows by about one
+    per ``limit`` completed requests. A slower response, a 429/5xx or a network
+    error multiplies it by ``backoff``. Only requests admitted after the last
+    decrease can cause another, so one burst of slow responses backs off once.
+    Background requests queue behind interactive ones and leave at least one
+    slot to interactive traffic whenever the limit allows more than one, so a
+    backed-off limit cannot be filled by background work alone.
+    Each endpoint family keeps its own baseline, so a slow family (e.g. similarity
+    searches) is only judged against itself and never reads as overload of the
+    fast ones. A baseline is the lowest recent latency and drifts slowly towards
+    new samples, so a lasting change in upstream latency becomes the new normal.
+    """
+
+    BASELINE_DRIFT = 0.01
+    LATENCY_SLACK = 0.01
+
+    def __init__(
+        self,
+        initial: int,
+        *,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        tolerance: float = 2.0,
+        backoff: float = 0.75,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self._clock = clock
+        self.limit = float(min(self.max_limit, max(self.min_limit, initial)))
+        self.baselines: dict[str, float] = {}
+        self.active = 0
+        self.increases = 0
+        self.decreases = 0
+        self.queue_wait = Histogram(LATENCY_BUCKETS)
+        self.background_active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._background_waiters: deque[asyncio.Future] = deque()
+        self._last_decrease = float("-inf")
+
+    @property
+    def current(self) -> int:
+        """The limit as a whole number of concurrent requests."""
+        return int(self.limit)
+
+    def _admits(self, background: bool) -> bool:
+        if self.active >= self.current:
+            return False
+        return not background or self.background_active < max(1, self.current - 1)
+
+    def _admit(self, background: bool) -> None:
+        self.active += 1
+        if background:
+            self.background_active += 1
+
+    async def acquire(self, *, background: bool = False) -> float:
+        """Wait for a slot; returns the admission time to hand back to ``release``."""
+        started = self._clock()
+        waiters = self._background_waiters if background else self._waiters
+        if waiters or not self._admits(background):
+            waiter = asyncio.get_running_loop().create_future()
+            waiters.append(waiter)
+            try:
+                await waiter
+            except BaseException:
+                if not waiter.done():
+                    waiters.remove(waiter)
+                elif not waiter.cancelled():
+                    # Granted a slot just as we were cancelled: pass it on.
+                    self._free(background)
+                    self._wake()
+                raise
+        else:
+            self._admit(background)
+        admitted = self._clock()
+        self.queue_wait.observe(admitted - started)
+        return admitted
+
+    def _free(self, background: bool) -> None:
+        self.active -= 1
+        if background:
+            self.background_active -= 1
+
+    def release(
+        self, admitted: float, overloaded: bool | None = False, *, family: str = "default", background: bool = False
+    ) -> None:
+        """Free a slot and adapt the limit; ``overloaded=None`` means no verdict (e.g. cancelled).
+
+        Latency is compared with the baseline of the request's endpoint ``family``;
+        ``background`` must match what the slot was acquired with.
+        """
+        in_use = self.active
+        self._free(background)
+        if overloaded is not None:
+            now = self._clock()
+            latency = now - admitted
+            if not overloaded:
+                baseline = self.baselines.get(family)
+                if baseline is None or latency < baseline:
+                    baseline = latency
+                else:
+                    baseline += (latency - baseline) * self.BASELINE_DRIFT
+                self.baselines[family] = baseline
+                overloaded = latency > baseline * self.tolerance + self.LATENCY_SLACK
+            if overloaded:
+                if admitted >= self._last_decrease:
+                    self._last_decrease = now
+                    self.limit = max(self.min_limit, self.limit * self.backoff)
+                    self.decreases += 1
+            elif in_use * 2 >= self.current and self.limit < self.max_limit:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+                self.increases += 1
+        self._wake()
+
+    def _wake(self) -> None:
+        for background, waiters in ((False, self._waiters), (True, self._background_waiters)):
+            while waiters and self._admits(background):
+                waiter = waiters.popleft()
+                if not waiter.done():
+                    self._admit(background)
+                    waiter.set_result(None)
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.current,
+            "active": self.active,
+            "background_active": self.background_active,
+            "queued": len(self._waiters) + len(self._background_waiters),
+            "baselines_ms": {family: round(baseline * 1000, 2) for family, baseline in self.baselines.items()},
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "queue_wait": self.queue_wait.snapshot(),
+        }
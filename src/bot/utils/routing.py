@@ -0,0 +1,99 @@
+"""
+Routing across several oj-api replicas.
+
+Each replica keeps an exponentially weighted moving average (EWMA) of its
+latency and a count of consecutive failures. Requests go to the healthy
+replica with the lowest expected wait (EWMA scaled by requests in flight); a
+replica that fails ``eject_after`` times in a row is skipped for
+``eject_duration`` seconds, or until a health probe succeeds.
+"""
+
+import time
+from typing import Any, Callable, Iterable
+
+
+class Replica:
+    """One oj-api base URL and the session that talks to it."""
+
+    def __init__(self, url: str, session: Any = None):
+        self.url = url
+        self.session = session
+        self.ewma: float | None = None
+        self.inflight = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+
+
+class ReplicaRouter:
+    """Pick the fastest healthy replica and track replica health from request outcomes."""
+
+    def __init__(
+        self,
+        replicas: Iterable[Replica],
+        *,
+        alpha: float = 0.3,
+        eject_after: int = 3,
+        eject_duration: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.replicas = list(replicas)
+        self.alpha = alpha
+        self.eject_after = eject_after
+        self.eject_duration = eject_duration
+        self._clock = clock
+
+    def is_healthy(self, replica: Replica) -> bool:
+        return replica.ejected_until <= self._clock()
+
+    @staticmethod
+    def _score(replica: Replica) -> tuple[int, float]:
+        # Recent failures rank first; replicas without latency samples score 0, so each gets tried early on.
+        return replica.consecutive_failures, (replica.ewma or 0.0) * (replica.inflight + 1)
+
+    def pick(self, exclude: Iterable[Replica] = ()) -> Replica:
+        """Return the healthy replica with the lowest expected wait, skipping ``exclude``.
+
+        Replicas that failed since their last success are only picked when no
+        other healthy one is left. When every candidate is ejected, the one due back soonest is returned
+        rather than failing outright.
+        """
+        excluded = set(map(id, exclude))
+        candidates = [replica for replica in self.replicas if id(replica) not in excluded] or self.replicas
+        healthy = [replica for replica in candidates if self.is_healthy(replica)]
+        if healthy:
+            return min(healthy, key=self._score)
+        return min(candidates, key=lambda replica: replica.ejected_until)
+
+    def record_success(self, replica: Replica, latency: float) -> None:
+        replica.requests += 1
+        self.mark_up(replica)
+        if replica.ewma is None:
+            replica.ewma = latency
+        else:
+            replica.ewma += self.alpha * (latency - replica.ewma)
+
+    def mark_up(self, replica: Replica) -> None:
+        """Return ``replica`` to rotation after a successful health probe, leaving its latency as is."""
+        replica.consecutive_failures = 0
+        replica.ejected_until = 0.0
+
+    def record_failure(self, replica: Replica) -> None:
+        replica.requests += 1
+        replica.failures += 1
+        replica.consecutive_failures += 1
+        if replica.consecutive_failures >= self.eject_after:
+            replica.ejected_until = self._clock() + self.eject_duration
+
+    def stats(self) -> dict[str, dict]:
+        return {
+            replica.url: {
+                "healthy": self.is_healthy(replica),
+                "ewma_ms": round(replica.ewma * 1000, 2) if replica.ewma is not None else None,
+                "inflight": replica.inflight,
+                "requests": replica.requests,
+                "failures": replica.failures,
+            }
+            for replica in self.replicas
+        }
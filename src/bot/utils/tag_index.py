@@ -0,0 +1,86 @@
+"""
+In-memory search index for problem tags, used by autocomplete.
+
+Tags are few (hundreds per source) but autocomplete runs on every keystroke,
+so matching goes through a sorted prefix table and an n-gram posting table
+instead of scanning and lower-casing every tag per request.
+"""
+
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Iterable
+
+# Longest n-gram indexed; longer queries intersect the postings of their n-grams.
+GRAM_SIZE = 3
+
+_WORD_START = re.compile(r"[\s\-_/&]+(\w)")
+
+RANK_EXACT = 0
+RANK_PREFIX = 1
+RANK_WORD_PREFIX = 2
+RANK_SUBSTRING = 3
+
+
+class TagIndex:
+    """
+    Case-insensitive ranked substring search over a list of tags.
+
+    Matches rank as: the whole tag, a prefix of the tag, a prefix of a later
+    word in the tag, then any other substring. Ties keep catalog order.
+    """
+
+    def __init__(self, tags: Iterable[str]):
+        self.tags = list(dict.fromkeys(tags))
+        self._folded = [tag.casefold() for tag in self.tags]
+        grams: dict[str, set[int]] = defaultdict(set)
+        prefixes: list[tuple[str, int]] = []
+        for i, folded in enumerate(self._folded):
+            for n in range(1, GRAM_SIZE + 1):
+                for start in range(len(folded) - n + 1):
+                    grams[folded[start : start + n]].add(i)
+            prefixes.append((folded, i))
+            prefixes.extend((folded[m.start(1) :], i) for m in _WORD_START.finditer(folded))
+        self._grams = dict(grams)
+        self._prefixes = sorted(prefixes)
+
+    def __len__(self) -> int:
+        return len(self.tags)
+
+    def _prefix_ranks(self, query: str) -> dict[int, int]:
+        ranks: dict[int, int] = {}
+        pos = bisect_left(self._prefixes, (query,))
+        while pos < len(self._prefixes) and self._prefixes[pos][0].startswith(query):
+            key, i = self._prefixes[pos]
+            folded = self._folded[i]
+            if key == folded:
+                rank = RANK_EXACT if folded == query else RANK_PREFIX
+            else:
+                rank = RANK_WORD_PREFIX
+            ranks[i] = min(rank, ranks.get(i, RANK_SUBSTRING))
+            pos += 1
+        return ranks
+
+    def _substring_candidates(self, query: str) -> set[int]:
+        n = min(GRAM_SIZE, len(query))
+        postings = [self._grams.get(query[start : start + n]) for start in range(len(query) - n + 1)]
+        if not all(postings):
+            return set()
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+        if len(query) > GRAM_SIZE:
+            candidates = {i for i in candidates if query in self._folded[i]}
+        return candidates
+
+    def search(self, query: str, limit: int = 25) -> list[str]:
+        """Return up to ``limit`` tags containing ``query``, best matches first."""
+        query = query.strip().casefold()
+        if not query:
+            return self.tags[:limit]
+        ranks = self._prefix_ranks(query)
+        for i in self._substring_candidates(query):
+            ranks.setdefault(i, RANK_SUBSTRING)
+        best = sorted(ranks, key=lambda i: (ranks[i], i))
+        return [self.tags[i] for i in best[:limit]]
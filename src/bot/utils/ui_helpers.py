@@ -973,14 +973,13 @@ async def _fetch_daily_history(bot: Any, domain: str, anchor_date: str) -> List[
     if not history_dates:
         return []
 
-    sem = asyncio.Semaphore(5)
-
+    # Concurrency is bounded by the API client; requests run in the caller's lane, so
+    # interactive /daily does not queue behind background work.
     async def fetch_one(d: str):
-        async with sem:
-            try:
-                return await bot.api.get_daily(domain, d)
-            except Exception:
-                return None
+        try:
+            return await bot.api.get_daily(domain, d)
+        except Exception:
+            return None
 
     results = await asyncio.gather(*[fetch_one(d) for d in history_dates])
     return [r for r in results if r]
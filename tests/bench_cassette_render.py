@@ -0,0 +1,62 @@
+"""
+Benchmark problem rendering against recorded production payloads.
+
+Record a cassette first by running the bot with ``[api.cassette] mode = "record"``,
+then run:
+
+    uv run python tests/bench_cassette_render.py data/api-cassette.jsonl.gz
+
+Not collected by pytest (see ``python_files`` in pyproject.toml).
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from bot.api_client import OjApiClient  # noqa: E402
+from bot.leetcode import html_to_text  # noqa: E402
+from bot.utils.config import ApiClientConfig  # noqa: E402
+
+
+async def main(path: str, rounds: int) -> None:
+    config = ApiClientConfig(cassette_mode="replay", cassette_path=path, persistent_cache=False, problem_cache_size=0)
+    api = OjApiClient("http://replay.invalid", config=config)
+    await api.start()
+    problem_paths = [key.split(" ", 1)[1] for key in api._session.keys() if key.startswith("GET problems/")]
+    problem_paths = [p for p in problem_paths if p.count("/") == 2]
+    if not problem_paths:
+        print("No problem responses in cassette")
+        return
+
+    fetch_times, render_times = [], []
+    for _ in range(rounds):
+        for problem_path in problem_paths:
+            _, source, pid = problem_path.split("/")
+            started = time.perf_counter()
+            problem = await api.get_problem(source, pid)
+            fetched = time.perf_counter()
+            if problem and problem.get("content"):
+                html_to_text(problem["content"])
+            render_times.append(time.perf_counter() - fetched)
+            fetch_times.append(fetched - started)
+    await api.close()
+
+    for label, samples in (("fetch+decode", fetch_times), ("html_to_text", render_times)):
+        ordered = sorted(samples)
+        print(
+            f"{label:>13}: n={len(samples)} mean={statistics.mean(samples) * 1e3:.3f}ms "
+            f"p95={ordered[int(0.95 * (len(ordered) - 1))] * 1e3:.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("cassette")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.cassette, args.rounds))
@@ -0,0 +1,96 @@
+"""
+Benchmark concurrent problem lookups over the HTTP/1.1 and HTTP/2 transports.
+
+Needs a reachable oj-api-rs instance (served over TLS or h2c for HTTP/2) and
+httpx with HTTP/2 support (``pip install 'httpx[http2]'``), then run:
+
+    uv run python tests/bench_http2.py https://oj-api.gdst.dev/api/v1 --ids 1-200 --concurrency 50
+
+Caching is disabled so every lookup goes upstream. Not collected by pytest
+(see ``python_files`` in pyproject.toml).
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from bot.api_client import OjApiClient  # noqa: E402
+from bot.utils import httpx_session  # noqa: E402
+from bot.utils.config import ApiClientConfig  # noqa: E402
+
+
+def parse_ids(spec: str) -> list[str]:
+    ids = []
+    for part in spec.split(","):
+        start, _, end = part.partition("-")
+        ids.extend(str(i) for i in range(int(start), int(end or start) + 1))
+    return ids
+
+
+async def run(base_url: str, transport: str, source: str, ids: list[str], concurrency: int) -> None:
+    config = ApiClientConfig(
+        transport=transport,
+        persistent_cache=False,
+        problem_cache_size=0,
+        negative_cache_size=0,
+        warm_connections=0,
+        rate_limit=0,
+        retry_max_attempts=1,
+        adaptive_concurrency=False,
+        concurrency_initial=concurrency,
+        random_pool_batch=0,
+    )
+    api = OjApiClient(base_url, config=config)
+    await api.start()
+    sem = asyncio.Semaphore(concurrency)
+    latencies, errors = [], 0
+
+    async def fetch(pid: str) -> None:
+        nonlocal errors
+        async with sem:
+            started = time.perf_counter()
+            try:
+                await api.get_problem(source, pid)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    try:
+        await api.warm_up(1)
+        started = time.perf_counter()
+        await asyncio.gather(*(fetch(pid) for pid in ids))
+        elapsed = time.perf_counter() - started
+    finally:
+        await api.close()
+
+    ordered = sorted(latencies)
+    print(
+        f"{transport:>5}: n={len(ids)} wall={elapsed:.2f}s throughput={len(ids) / elapsed:.1f} req/s "
+        f"mean={statistics.mean(latencies) * 1e3:.1f}ms p95={ordered[int(0.95 * (len(ordered) - 1))] * 1e3:.1f}ms "
+        f"errors={errors}"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    ids = parse_ids(args.ids)
+    transports = ["http1", "http2"] if httpx_session.available() else ["http1"]
+    if len(transports) == 1:
+        print("httpx[http2] is not installed; only benchmarking HTTP/1.1")
+    for _ in range(args.rounds):
+        for transport in transports:
+            await run(args.base_url, transport, args.source, ids, args.concurrency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("base_url")
+    parser.add_argument("--source", default="leetcode")
+    parser.add_argument("--ids", default="1-100", help="e.g. 1-100 or 1,5,20-40")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=2)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from bot.api_client import ApiNetworkError, OjApiClient
+from bot.utils.cassette import ReplaySession, exchange_key
+from bot.utils.config import ApiClientConfig
+
+PROBLEM = {"id": "1", "source": "leetcode", "title": "Two Sum", "content": "<p>" + "x" * 5000 + "</p>"}
+
+
+@pytest.fixture
+async def oj_server():
+    calls = []
+
+    async def problem(request):
+        calls.append(request.path)
+        await asyncio.sleep(0.05)
+        return web.json_response(PROBLEM, headers={"ETag": '"v1"', "X-Noise": "dropped"})
+
+    async def daily(request):
+        calls.append(request.path)
+        return web.json_response({"date": request.query["date"]})
+
+    app = web.Application()
+    app.router.add_get("/api/v1/problems/leetcode/1", problem)
+    app.router.add_get("/api/v1/daily", daily)
+    server = TestServer(app)
+    await server.start_server()
+    server.calls = calls
+    yield server
+    await server.close()
+
+
+def _config(tmp_path, mode, **kwargs):
+    return ApiClientConfig(
+        cassette_mode=mode,
+        cassette_path=str(tmp_path / "oj.jsonl.gz"),
+        persistent_cache=False,
+        warm_connections=0,
+        **kwargs,
+    )
+
+
+async def test_recorded_responses_replay_without_network(tmp_path, oj_server):
+    recorder = OjApiClient(str(oj_server.make_url("/api/v1")), config=_config(tmp_path, "record"))
+    await recorder.start()
+    try:
+        assert await recorder.get_problem("leetcode", "1") == PROBLEM
+        await recorder.get_daily("com", "2026-01-01")
+    finally:
+        await recorder.close()
+    await oj_server.close()
+
+    replayer = OjApiClient("http://unreachable.invalid", config=_config(tmp_path, "replay"))
+    await replayer.start()
+    try:
+        assert await replayer.get_problem("leetcode", "1") == PROBLEM
+        assert await replayer.get_daily("com", "2026-01-01") == {"date": "2026-01-01"}
+        with pytest.raises(ApiNetworkError, match="No recorded response"):
+            await replayer.get_daily("com", "2026-01-02")
+    finally:
+        await replayer.close()
+    assert replayer.endpoint_stats()["problems"]["response_bytes"]["count"] == 1
+
+
+async def test_replay_keeps_only_useful_headers_and_can_reenact_latency(tmp_path, oj_server):
+    recorder = OjApiClient(str(oj_server.make_url("/api/v1")), config=_config(tmp_path, "record"))
+    await recorder.start()
+    await recorder.get_problem("leetcode", "1")
+    await recorder.close()
+
+    session = ReplaySession(tmp_path / "oj.jsonl.gz", latency="original")
+    started = time.monotonic()
+    async with session.request("GET", "problems/leetcode/1") as resp:
+        assert resp.headers == {"ETag": '"v1"', "Content-Type": "application/json; charset=utf-8"}
+        assert await resp.json() == PROBLEM
+    assert time.monotonic() - started >= 0.05
+    assert session.keys() == [exchange_key("GET", "problems/leetcode/1")]
+
+
+def test_exchange_key_ignores_param_order():
+    assert exchange_key("get", "/daily", {"date": "d", "domain": "com"}) == exchange_key(
+        "GET", "daily", {"domain": "com", "date": "d"}
+    )
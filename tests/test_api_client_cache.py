@@ -0,0 +1,548 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+
+from bot.api_client import LANE_BACKGROUND, ApiNetworkError, OjApiClient, traffic_lane
+from bot.utils.batching import MicroBatcher
+from bot.utils.cache import TTLCache
+from bot.utils.config import ApiClientConfig
+from bot.utils.database import ApiCacheDatabaseManager
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _problem(problem_id: str = "1", title: str = "Two Sum") -> dict:
+    return {"id": problem_id, "source": "leetcode", "title": title}
+
+
+# -- TTLCache --
+
+
+def test_ttl_cache_reports_fresh_stale_and_expired_entries():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=4, ttl=10, stale_ttl=20, clock=clock)
+    cache.set("a", 1)
+
+    assert cache.lookup("a") == (1, False)
+    clock.now += 15
+    assert cache.lookup("a") == (1, True)
+    clock.now += 20
+    assert cache.lookup("a") is None
+
+    assert cache.stats.hits == 1
+    assert cache.stats.stale_hits == 1
+    assert cache.stats.misses == 1
+    assert len(cache) == 0
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.lookup("a")
+    cache.set("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.stats.evictions == 1
+
+
+def test_ttl_cache_set_with_age_backdates_entry():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=2, ttl=10, stale_ttl=10, clock=clock)
+    cache.set("a", 1, age=12)
+
+    assert cache.peek("a") == (1, True)
+
+
+# -- OjApiClient problem cache --
+
+
+@pytest.mark.asyncio
+async def test_get_problem_serves_repeat_lookups_from_cache():
+    api = OjApiClient("http://test")
+    api._request = AsyncMock(return_value=_problem())
+
+    first = await api.get_problem("leetcode", "1")
+    second = await api.get_problem("leetcode", "1")
+
+    assert first == second == _problem()
+    api._request.assert_awaited_once_with("GET", "problems/leetcode/1", meta={})
+    stats = api.cache_stats()["problems"]
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_problem_does_not_cache_missing_problem():
+    api = OjApiClient("http://test")
+    api._request = AsyncMock(return_value=None)
+
+    assert await api.get_problem("leetcode", "404") is None
+
+    assert "problem:leetcode/404" not in api._problem_cache
+
+
+@pytest.mark.asyncio
+async def test_get_problem_serves_stale_entry_and_refreshes_in_background():
+    api = OjApiClient("http://test", config=ApiClientConfig(problem_cache_ttl=0, problem_cache_stale_ttl=60))
+    api._request = AsyncMock(side_effect=[_problem(title="Old"), _problem(title="New")])
+
+    assert (await api.get_problem("leetcode", "1"))["title"] == "Old"
+    assert (await api.get_problem("leetcode", "1"))["title"] == "Old"
+    await asyncio.gather(*api._refresh_tasks.values())
+
+    assert api._problem_cache.peek("problem:leetcode/1")[0]["title"] == "New"
+    stats = api.cache_stats()["problems"]
+    assert stats["stale_hits"] == 1
+    assert stats["refreshes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_problem_keeps_stale_entry_when_refresh_fails():
+    api = OjApiClient("http://test", config=ApiClientConfig(problem_cache_ttl=0, problem_cache_stale_ttl=60))
+    api._request = AsyncMock(side_effect=[_problem(title="Old"), ApiNetworkError("down")])
+
+    await api.get_problem("leetcode", "1")
+    assert (await api.get_problem("leetcode", "1"))["title"] == "Old"
+    await asyncio.gather(*api._refresh_tasks.values())
+
+    assert api._problem_cache.peek("problem:leetcode/1")[0]["title"] == "Old"
+    assert api.cache_stats()["problems"]["refresh_errors"] == 1
+    assert api._refresh_tasks == {}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_stale_hits_share_one_background_refresh():
+    api = OjApiClient("http://test", config=ApiClientConfig(problem_cache_ttl=0, problem_cache_stale_ttl=60))
+    api._request = AsyncMock(return_value=_problem())
+
+    await api.get_problem("leetcode", "1")
+    await asyncio.gather(*[api.get_problem("leetcode", "1") for _ in range(5)])
+    await asyncio.gather(*api._refresh_tasks.values())
+
+    assert api._request.await_count == 2
+
+
+# -- Persistent cache tier --
+
+
+def _fake_do_request(responses: list, calls: list | None = None):
+    """Build a _do_request replacement that fills response metadata like the real one."""
+
+    async def do_request(method, path, *, meta=None, **kwargs):
+        if calls is not None:
+            calls.append((method, path, kwargs))
+        status, payload, validator = responses.pop(0)
+        if meta is not None:
+            meta["status"] = status
+            meta["validator"] = validator
+        return payload
+
+    return do_request
+
+
+@pytest.fixture
+def cache_db(tmp_path):
+    return ApiCacheDatabaseManager(db_path=tmp_path / "api-cache.db")
+
+
+def test_api_cache_database_round_trips_entries(cache_db):
+    cache_db.save_entry("problem:leetcode/1", _problem(), validator='"v1"', fetched_at=100)
+
+    entry = cache_db.get_entry("problem:leetcode/1")
+
+    assert entry == {"payload": _problem(), "fetched_at": 100, "validator": '"v1"'}
+    cache_db.touch_entry("problem:leetcode/1", fetched_at=200)
+    assert cache_db.get_entry("problem:leetcode/1")["fetched_at"] == 200
+    assert cache_db.prune(max_age_seconds=60) == 1
+    assert cache_db.get_entry("problem:leetcode/1") is None
+
+    cache_db.save_entry("tags:leetcode", ["Array"], fetched_at=100)
+    assert cache_db.prune(max_age_seconds=60, keep_prefixes=("tags:",)) == 0
+    assert cache_db.get_entry("tags:leetcode")["payload"] == ["Array"]
+
+
+@pytest.mark.asyncio
+async def test_restarted_client_serves_problem_from_persistent_tier(cache_db):
+    first = OjApiClient("http://test", cache_db=cache_db)
+    first._do_request = _fake_do_request([(200, _problem(), None)])
+    await first.get_problem("leetcode", "1")
+
+    restarted = OjApiClient("http://test", cache_db=cache_db)
+    restarted._do_request = AsyncMock(side_effect=AssertionError("should not hit the network"))
+
+    assert await restarted.get_problem("leetcode", "1") == _problem()
+    assert restarted.cache_stats()["problems"]["persistent_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_persistent_entry_is_revalidated_with_validator(cache_db):
+    cache_db.save_entry("resolve:two-sum", {"problem": _problem()}, validator='"v1"', fetched_at=time.time() - 3600)
+    api = OjApiClient(
+        "http://test",
+        config=ApiClientConfig(problem_cache_ttl=60, problem_cache_stale_ttl=86400),
+        cache_db=cache_db,
+    )
+    calls = []
+    api._do_request = _fake_do_request([(304, None, '"v1"')], calls)
+
+    assert await api.resolve("two-sum") == {"problem": _problem()}
+    await asyncio.gather(*api._refresh_tasks.values())
+
+    assert calls == [("GET", "resolve/two-sum", {"headers": {"If-None-Match": '"v1"'}})]
+    assert time.time() - cache_db.get_entry("resolve:two-sum")["fetched_at"] < 5
+    assert api._resolve_cache.peek("resolve:two-sum") == ({"problem": _problem()}, False)
+
+
+@pytest.fixture
+def today(monkeypatch):
+    dates = {"com": "2026-06-01", "cn": "2026-06-01"}
+    monkeypatch.setattr(OjApiClient, "_daily_date", staticmethod(lambda domain: dates[domain]))
+    return dates
+
+
+@pytest.mark.asyncio
+async def test_current_daily_is_also_cached_under_its_date_but_not_persisted(cache_db, today):
+    daily = {"date": "2026-06-01", "problem": _problem()}
+    api = OjApiClient("http://test", cache_db=cache_db)
+    api._do_request = _fake_do_request([(200, daily, None)])
+
+    assert await api.get_daily("com") == daily
+    assert await api.get_daily("com") == daily
+    assert await api.get_daily("com", "2026-06-01") == daily
+    assert cache_db.get_entry("daily:com:current:2026-06-01") is None
+
+
+@pytest.mark.asyncio
+async def test_current_daily_is_refetched_after_rollover(today):
+    api = OjApiClient("http://test")
+    api._do_request = _fake_do_request(
+        [(200, {"date": "2026-06-01"}, None), (200, {"date": "2026-06-01"}, None), (200, {"date": "2026-06-02"}, None)]
+    )
+
+    assert await api.get_daily("com") == {"date": "2026-06-01"}
+    today["com"] = "2026-06-02"
+    # Upstream still serves yesterday's problem right after midnight; it is not kept as today's.
+    assert await api.get_daily("com") == {"date": "2026-06-01"}
+    assert await api.get_daily("com") == {"date": "2026-06-02"}
+    assert await api.get_daily("com") == {"date": "2026-06-02"}
+
+
+def test_daily_date_follows_each_domains_rollover():
+    com, cn = OjApiClient._daily_date("com"), OjApiClient._daily_date("cn")
+    assert com <= cn
+    assert cn == (datetime.now(timezone.utc) + timedelta(hours=8)).strftime("%Y-%m-%d")
+
+
+# -- Resolve normalization --
+
+
+@pytest.mark.asyncio
+async def test_resolve_spellings_share_one_entry_and_seed_problem_cache():
+    api = OjApiClient("http://test")
+    api._request = AsyncMock(return_value={"source": "leetcode", "id": "1", "problem": _problem()})
+
+    for query in ("two-sum", " Two-Sum/", "https://leetcode.com/problems/two-sum/description/"):
+        assert (await api.resolve(query))["problem"] == _problem()
+    assert await api.get_problem("leetcode", "1") == _problem()
+
+    assert api._request.await_count == 1
+    assert api._request.await_args.args[1] == "resolve/two-sum"
+    resolved = await api.resolve("two-sum")
+    assert resolved["problem"] is api._problem_cache.peek("problem:leetcode/1")[0]
+
+
+@pytest.mark.asyncio
+async def test_source_id_resolve_is_answered_from_problem_cache():
+    api = OjApiClient("http://test")
+    api._request = AsyncMock(return_value={"id": "1A", "source": "codeforces", "title": "Theatre Square"})
+    await api.get_problem("codeforces", "1A")
+
+    resolved = await api.resolve("Codeforces:1A")
+
+    assert resolved["source"] == "codeforces" and resolved["id"] == "1A"
+    assert resolved["problem"]["title"] == "Theatre Square"
+    assert api._request.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_unambiguous_references_skip_the_resolve_endpoint():
+    api = OjApiClient("http://test")
+
+    async def request(method, path, **kwargs):
+        if path == "problems/atcoder/abc300_a":
+            return {"id": "abc300_a", "source": "atcoder", "title": "N-choice question"}
+        if path == "resolve/leetcode%3Atwo-sum":
+            return {"source": "leetcode", "id": "1", "problem": _problem()}
+        return None
+
+    api._request = AsyncMock(side_effect=request)
+
+    resolved = await api.resolve("https://atcoder.jp/contests/abc300/tasks/abc300_a")
+    assert (resolved["source"], resolved["id"]) == ("atcoder", "abc300_a")
+    assert resolved["problem"]["title"] == "N-choice question"
+    # The problem endpoint already looked up the canonical ID; resolve would only repeat the miss.
+    assert await api.resolve("leetcode:99999") is None
+    # LeetCode slugs are not canonical IDs and still go to resolve.
+    assert (await api.resolve("leetcode:two-sum"))["id"] == "1"
+
+    assert [call.args[1] for call in api._request.await_args_list] == [
+        "problems/atcoder/abc300_a",
+        "problems/leetcode/99999",
+        "resolve/leetcode%3Atwo-sum",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_fast_path_seeds_the_problem_cache_under_the_returned_id():
+    api = OjApiClient("http://test")
+    api._request = AsyncMock(return_value=_problem())
+
+    resolved = await api.resolve("leetcode:0001")
+
+    assert (resolved["source"], resolved["id"]) == ("leetcode", "1")
+    assert resolved["problem"] is api._problem_cache.peek("problem:leetcode/1")[0]
+    assert await api.get_problem("leetcode", "1") == resolved["problem"]
+    assert api._request.await_args.args[1] == "problems/leetcode/0001"
+    assert api._request.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_titles_with_a_source_prefix_still_go_to_resolve():
+    api = OjApiClient("http://test")
+    api._request = AsyncMock(return_value={"source": "luogu", "id": "P1001", "problem": {"id": "P1001"}})
+
+    assert (await api.resolve("luogu:a+b problem"))["id"] == "P1001"
+    assert api._request.await_args.args[1] == "resolve/luogu%3Aa%2Bb%20problem"
+
+
+# -- Similar results --
+
+
+def _similar(count: int) -> dict:
+    return {"results": [{"source": "leetcode", "id": str(i), "similarity": 0.99 - i / 100} for i in range(count)]}
+
+
+@pytest.mark.asyncio
+async def test_smaller_top_k_is_served_from_cached_larger_similar_search():
+    api = OjApiClient("http://test")
+    api._request = AsyncMock(side_effect=lambda method, path, **kwargs: _similar(int(kwargs["params"]["limit"])))
+
+    assert len((await api.search_similar_by_id("leetcode", "1", top_k=20))["results"]) == 20
+    top5 = await api.search_similar_by_id("leetcode", "1", top_k=5)
+    await api.search_similar_by_id("leetcode", "1", top_k=5, min_similarity=0.8)
+    await api.search_similar_by_id("leetcode", "1", top_k=25)
+
+    assert [item["id"] for item in top5["results"]] == ["0", "1", "2", "3", "4"]
+    assert [call.kwargs["params"] for call in api._request.await_args_list] == [
+        {"limit": "20", "threshold": "0.7"},
+        {"limit": "5", "threshold": "0.8"},
+        {"limit": "25", "threshold": "0.7"},
+    ]
+    assert api.cache_stats()["similar"]["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_short_similar_answer_covers_larger_top_k_and_text_is_normalized():
+    api = OjApiClient("http://test")
+    api._request = AsyncMock(return_value=_similar(3))
+
+    await api.search_similar_by_text("Shortest  path in a grid ", "leetcode", top_k=5)
+    result = await api.search_similar_by_text("shortest path in a GRID", "leetcode", top_k=10)
+    await api.search_similar_by_text("shortest path in a grid", None, top_k=5)
+
+    assert len(result["results"]) == 3
+    assert api._request.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_similar_search_is_not_cached():
+    api = OjApiClient("http://test")
+    api._request = AsyncMock(side_effect=[ApiNetworkError("timeout", is_timeout=True), _similar(5)])
+
+    with pytest.raises(ApiNetworkError):
+        await api.search_similar_by_id("leetcode", "1")
+    assert len((await api.search_similar_by_id("leetcode", "1"))["results"]) == 5
+    assert api._request.await_count == 2
+
+
+# -- Negative caching --
+
+
+@pytest.mark.asyncio
+async def test_not_found_lookups_are_negatively_cached():
+    api = OjApiClient("http://test")
+    api._request = AsyncMock(return_value=None)
+
+    for _ in range(3):
+        assert await api.resolve("not-a-problem") is None
+        assert await api.get_problem("leetcode", "999999") is None
+
+    assert api._request.await_count == 2
+    assert api.cache_stats()["not_found"]["hits"] == 4
+
+
+@pytest.mark.asyncio
+async def test_negative_entry_expires_and_is_cleared_by_positive_result():
+    api = OjApiClient("http://test", config=ApiClientConfig(negative_cache_ttl=0))
+    api._request = AsyncMock(side_effect=[None, _problem()])
+
+    assert await api.get_problem("leetcode", "1") is None
+    assert await api.get_problem("leetcode", "1") == _problem()
+
+    assert "problem:leetcode/1" not in api._negative_cache
+    assert api._request.await_count == 2
+
+
+# -- Bulk lookups --
+
+
+@pytest.mark.asyncio
+async def test_get_problems_bulk_dedupes_and_preserves_order():
+    api = OjApiClient("http://test")
+
+    async def request(method, path, **kwargs):
+        return None if path.endswith("/404") else {"path": path}
+
+    api._request = AsyncMock(side_effect=request)
+    await api.get_problem("leetcode", "1")
+    api._request.reset_mock()
+
+    refs = [("leetcode", "2"), ("leetcode", "1"), ("leetcode", "404"), ("leetcode", "2")]
+    results = await api.get_problems_bulk(refs)
+
+    assert results == [
+        {"path": "problems/leetcode/2"},
+        {"path": "problems/leetcode/1"},
+        None,
+        {"path": "problems/leetcode/2"},
+    ]
+    assert sorted(call.args[1] for call in api._request.await_args_list) == [
+        "problems/leetcode/2",
+        "problems/leetcode/404",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_resolve_many_limits_parallel_requests():
+    api = OjApiClient("http://test")
+    active = 0
+    peak = 0
+
+    async def request(method, path, **kwargs):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return {"problem": {"id": path}}
+
+    api._request = request
+
+    results = await api.resolve_many([f"slug-{i}" for i in range(12)])
+
+    assert [result["problem"]["id"] for result in results] == [f"resolve/slug-{i}" for i in range(12)]
+    assert peak == api.concurrency_stats()["limit"] == ApiClientConfig().concurrency_initial
+
+
+# -- Micro-batching --
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_dispatches_one_batch_with_per_key_results():
+    batches = []
+
+    async def dispatch(keys):
+        batches.append(keys)
+        return [ValueError(key) if key == "bad" else key.upper() for key in keys]
+
+    batcher = MicroBatcher(dispatch, window=0.01)
+    loads = [batcher.load(key) for key in ("a", "bad", "b", "a")]
+    results = await asyncio.gather(*loads, return_exceptions=True)
+
+    assert batches == [["a", "bad", "b"]]
+    assert results[0] == results[3] == "A" and results[2] == "B"
+    assert isinstance(results[1], ValueError)
+    assert batcher.stats() == {"loads": 4, "batches": 1, "keys": 3, "pending": 0, "avg_batch": 3.0}
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_flushes_full_batches_and_fails_whole_batch_on_dispatch_error():
+    async def dispatch(keys):
+        if "boom" in keys:
+            raise RuntimeError("bulk failed")
+        return keys
+
+    batcher = MicroBatcher(dispatch, window=60, max_size=2)
+    assert await asyncio.gather(batcher.load(1), batcher.load(2)) == [1, 2]
+
+    failed = [batcher.load("boom"), batcher.load("other")]
+    for future in failed:
+        with pytest.raises(RuntimeError, match="bulk failed"):
+            await future
+
+    pending = batcher.load("never")
+    batcher.close()
+    assert pending.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_are_batched_with_their_own_results_and_errors():
+    api = OjApiClient("http://test", config=ApiClientConfig(batch_window=0.01))
+
+    async def request(method, path, **kwargs):
+        if path.endswith("/500"):
+            raise ApiNetworkError("upstream down")
+        if path.startswith("resolve/"):
+            return {"source": "leetcode", "id": "1", "problem": _problem()}
+        return {"id": path.rsplit("/", 1)[1], "source": "leetcode"}
+
+    api._request = AsyncMock(side_effect=request)
+
+    results = await asyncio.gather(
+        api.get_problem("leetcode", "2"),
+        api.get_problem("leetcode", "500"),
+        api.get_problem("leetcode", "2"),
+        api.resolve("Two Sum"),
+        api.resolve("two sum "),
+        api.resolve("leetcode:3"),
+        return_exceptions=True,
+    )
+
+    assert results[0] == results[2] == {"id": "2", "source": "leetcode"}
+    assert isinstance(results[1], ApiNetworkError)
+    assert results[3] == results[4] and results[3]["problem"] == _problem()
+    assert results[5]["problem"] == {"id": "3", "source": "leetcode"}
+    assert sorted(call.args[1] for call in api._request.await_args_list) == [
+        "problems/leetcode/2",
+        "problems/leetcode/3",
+        "problems/leetcode/500",
+        "resolve/Two%20Sum",
+    ]
+    assert api.batch_stats()["problems"]["batches"] == 1
+    assert api.batch_stats()["resolve"] == {"loads": 3, "batches": 1, "keys": 3, "pending": 0, "avg_batch": 3.0}
+
+
+@pytest.mark.asyncio
+async def test_cache_hits_and_background_lookups_skip_the_batch_window():
+    api = OjApiClient("http://test", config=ApiClientConfig(batch_window=60))
+    api._request = AsyncMock(side_effect=lambda method, path, **kwargs: {"path": path})
+    api._problem_cache.set("problem:leetcode/1", _problem())
+
+    assert await api.get_problem("leetcode", "1") == _problem()
+    assert (await asyncio.wait_for(api.resolve("1"), timeout=1))["problem"] == _problem()
+    with traffic_lane(LANE_BACKGROUND):
+        assert await api.get_problem("leetcode", "2") == {"path": "problems/leetcode/2"}
+    assert api.batch_stats()["problems"]["loads"] == 0
+    assert api.batch_stats()["resolve"]["loads"] == 0
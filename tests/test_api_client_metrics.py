@@ -0,0 +1,85 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import aiohttp
+import pytest
+
+from bot.api_client import ApiNetworkError, OjApiClient
+from bot.utils.metrics import Histogram
+
+
+def _session_with_response(status: int, body, content_length: int | None = None):
+    response = AsyncMock()
+    response.status = status
+    response.headers = {}
+    response.content_length = content_length
+    response.json.return_value = body
+    context = AsyncMock()
+    context.__aenter__.return_value = response
+    session = MagicMock()
+    session.request.return_value = context
+    return session
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot["buckets"] == {"0.1": 2, "1.0": 1, "+Inf": 1}
+    assert snapshot["count"] == 4
+    assert snapshot["p50"] == 0.1
+    assert snapshot["p99"] == float("inf")
+    assert Histogram((1.0,)).quantile(0.5) is None
+
+
+@pytest.mark.asyncio
+async def test_endpoint_stats_record_latency_status_and_bytes():
+    api = OjApiClient("http://test")
+    api._session = _session_with_response(200, {"id": "1"}, content_length=2048)
+
+    await api._do_request("GET", "problems/leetcode/1")
+    api._session = _session_with_response(404, {"detail": "missing"})
+    await api._do_request("GET", "problems/leetcode/2")
+
+    stats = api.endpoint_stats()["problems"]
+    assert stats["requests"] == 2
+    assert stats["statuses"] == {200: 1, 404: 1}
+    assert stats["response_bytes"]["count"] == 1
+    assert stats["response_bytes"]["buckets"]["4096"] == 1
+
+
+@pytest.mark.asyncio
+async def test_endpoint_stats_count_timeouts_and_network_errors():
+    api = OjApiClient("http://test")
+    api._session = MagicMock()
+    api._session.request.side_effect = [asyncio.TimeoutError(), aiohttp.ClientConnectionError("reset")]
+
+    for _ in range(2):
+        with pytest.raises(ApiNetworkError):
+            await api._do_request("GET", "daily")
+
+    stats = api.endpoint_stats()["daily"]
+    assert stats["timeouts"] == 1
+    assert stats["network_errors"] == 1
+    assert stats["statuses"] == {}
+
+
+@pytest.mark.asyncio
+async def test_endpoint_stats_count_coalesced_waiters():
+    api = OjApiClient("http://test")
+    release = asyncio.Event()
+
+    async def do_request(method, path, **kwargs):
+        await release.wait()
+        return {"id": "1"}
+
+    api._do_request = do_request
+    tasks = [asyncio.create_task(api._request("GET", "resolve/two-sum")) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert api.endpoint_stats()["resolve"]["coalesced"] == 2
@@ -0,0 +1,701 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import aiohttp
+import pytest
+
+from bot.api_client import (
+    LANE_BACKGROUND,
+    LANE_INTERACTIVE,
+    ApiEmbeddingError,
+    ApiError,
+    ApiNetworkError,
+    ApiProcessingError,
+    ApiRateLimitError,
+    OjApiClient,
+    traffic_lane,
+)
+from bot.utils.config import ApiClientConfig, ConfigManager
+from bot.utils.deadline import deadline_scope
+from bot.utils.resilience import (
+    AdaptiveLimiter,
+    CircuitBreaker,
+    RateLimiter,
+    RetryBudget,
+    RetryPolicy,
+    TokenBucket,
+)
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _session_with_responses(*responses):
+    contexts = []
+    for status, headers, body in responses:
+        response = AsyncMock()
+        response.status = status
+        response.headers = headers
+        response.json.return_value = body
+        context = AsyncMock()
+        context.__aenter__.return_value = response
+        contexts.append(context)
+    session = MagicMock()
+    session.request.side_effect = contexts
+    return session
+
+
+# -- Rate limiting --
+
+
+def test_token_bucket_refills_at_configured_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=2, clock=clock)
+
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == pytest.approx(0.5)
+    clock.now += 0.5
+    assert bucket.try_acquire() == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_pause_holds_back_every_family():
+    limiter = RateLimiter(rate=0, burst=1)
+    limiter.pause(0.05)
+
+    tasks = [asyncio.create_task(limiter.acquire(family)) for family in ("problems", "daily", "similar")]
+    await asyncio.sleep(0.01)
+
+    assert limiter.stats()["queued"] == 3
+    assert limiter.stats()["waiting"] == {"problems": 1, "daily": 1, "similar": 1}
+    assert not any(task.done() for task in tasks)
+
+    await asyncio.gather(*tasks)
+    assert limiter.stats()["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_applies_per_family_overrides():
+    limiter = RateLimiter(rate=0, burst=1, family_limits={"similar": (1, 1)})
+
+    await limiter.acquire("similar")
+    blocked = asyncio.create_task(limiter.acquire("similar"))
+    await asyncio.sleep(0.01)
+
+    assert not blocked.done()
+    await limiter.acquire("problems")
+    blocked.cancel()
+
+
+def test_family_overrides_inherit_top_level_rate_and_burst(monkeypatch):
+    monkeypatch.setattr(ConfigManager, "_load_config", lambda self: None)
+    monkeypatch.setattr(ConfigManager, "_apply_env_overrides", lambda self: None)
+    manager = ConfigManager()
+    manager._config = {"api": {"rate_limit": {"rate": 5, "burst": 8, "similar": {"burst": 2}, "daily": {"rate": 1}}}}
+
+    families = manager.get_api_client_config().rate_limit_families
+
+    assert families == {"similar": (5, 2), "daily": (1, 8)}
+
+
+@pytest.mark.asyncio
+async def test_do_request_429_pauses_all_callers_before_retrying():
+    api = OjApiClient("http://test")
+    api._session = _session_with_responses(
+        (429, {"Retry-After": "0.05"}, None),
+        (200, {}, {"id": "1"}),
+    )
+
+    result_task = asyncio.create_task(api._do_request("GET", "problems/leetcode/1"))
+    await asyncio.sleep(0.01)
+
+    assert api.rate_limit_stats()["paused_for"] > 0
+    assert api.rate_limit_stats()["waiting"] == {"problems": 1}
+    assert await result_task == {"id": "1"}
+
+
+@pytest.mark.asyncio
+async def test_do_request_raises_rate_limit_error_when_retry_is_also_limited():
+    api = OjApiClient("http://test", config=ApiClientConfig(rate_limit=0))
+    api._session = _session_with_responses(
+        (429, {"Retry-After": "0"}, None),
+        (429, {"Retry-After": "7"}, None),
+    )
+
+    with pytest.raises(ApiRateLimitError) as exc_info:
+        await api._do_request("GET", "daily")
+
+    assert exc_info.value.retry_after == 7
+    assert api.rate_limit_stats()["paused_for"] > 6
+
+
+def test_parse_retry_after_accepts_http_dates_and_defaults():
+    assert OjApiClient._parse_retry_after("3") == 3
+    assert OjApiClient._parse_retry_after(None) == 5
+    assert OjApiClient._parse_retry_after("not a date") == 5
+    assert OjApiClient._parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+
+
+def test_endpoint_family_uses_top_level_path_segment():
+    assert OjApiClient._endpoint_family("problems/leetcode/1") == "problems"
+    assert OjApiClient._endpoint_family("similar") == "similar"
+    assert OjApiClient._endpoint_family("resolve/two-sum") == "resolve"
+
+
+# -- Circuit breaker --
+
+
+def test_circuit_breaker_opens_after_consecutive_failures_and_probes_once():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+    clock.now += 30
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.stats()["rejected"] == 2
+
+
+def test_circuit_breaker_failed_probe_reopens_circuit():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now += 10
+
+    assert breaker.allow_request()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.retry_in == 10
+
+
+def test_circuit_breaker_released_probe_can_be_retried():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now += 10
+
+    assert breaker.allow_request()
+    breaker.release()
+    assert breaker.allow_request()
+
+
+@pytest.mark.asyncio
+async def test_open_similar_circuit_fails_fast_without_touching_other_families():
+    api = OjApiClient("http://test", config=ApiClientConfig(circuit_failure_threshold=2))
+    api._session = _session_with_responses(
+        (502, {}, {"detail": "embedding down"}),
+        (502, {}, {"detail": "embedding down"}),
+        (200, {}, {"id": "1"}),
+    )
+
+    for _ in range(2):
+        with pytest.raises(ApiEmbeddingError):
+            await api._do_request("GET", "similar/leetcode/1")
+
+    with pytest.raises(ApiEmbeddingError, match="circuit open"):
+        await api._do_request("GET", "similar/leetcode/1")
+    assert await api._do_request("GET", "problems/leetcode/1") == {"id": "1"}
+
+    assert api._session.request.call_count == 3
+    assert api.circuit_stats()["similar"]["state"] == CircuitBreaker.OPEN
+    assert api.circuit_stats()["problems"]["state"] == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_open_non_similar_circuit_raises_network_error():
+    api = OjApiClient("http://test", config=ApiClientConfig(circuit_failure_threshold=1))
+    api._session = _session_with_responses((500, {}, {"detail": "boom"}))
+
+    with pytest.raises(ApiError):
+        await api._do_request("GET", "daily")
+    with pytest.raises(ApiNetworkError, match="circuit open"):
+        await api._do_request("GET", "daily")
+
+
+@pytest.mark.asyncio
+async def test_client_errors_do_not_trip_the_circuit():
+    api = OjApiClient("http://test", config=ApiClientConfig(circuit_failure_threshold=1))
+    api._session = _session_with_responses((400, {}, {"detail": "bad tag"}), (200, {}, ["Array"]))
+
+    with pytest.raises(ApiError):
+        await api._do_request("GET", "tags/leetcode")
+
+    assert await api._do_request("GET", "tags/leetcode") == ["Array"]
+
+
+# -- Retry policy --
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr("bot.api_client.asyncio.sleep", sleep)
+    return delays
+
+
+def test_retry_policy_uses_capped_decorrelated_jitter():
+    policy = RetryPolicy(base_delay=1, max_delay=5, rng=lambda low, high: high)
+
+    delays = [policy.next_delay(0)]
+    for _ in range(3):
+        delays.append(policy.next_delay(delays[-1]))
+
+    assert delays == [1, 3, 5, 5]
+
+
+def test_retry_budget_limits_retries_to_share_of_recent_traffic():
+    clock = FakeClock()
+    budget = RetryBudget(ratio=0.5, min_retries=1, window=10, clock=clock)
+    for _ in range(4):
+        budget.record_request()
+
+    assert [budget.try_spend() for _ in range(3)] == [True, True, False]
+    clock.now += 11
+    assert budget.try_spend()
+    assert budget.stats() == {"requests": 0, "retries": 1, "exhausted": 1}
+
+
+@pytest.mark.asyncio
+async def test_get_is_retried_after_server_error_and_processing(no_sleep):
+    api = OjApiClient("http://test", config=ApiClientConfig(retry_max_attempts=3))
+    api._session = _session_with_responses(
+        (500, {}, {"detail": "boom"}),
+        (202, {}, {"detail": "processing"}),
+        (200, {}, {"id": "1"}),
+    )
+
+    assert await api._request("GET", "problems/leetcode/1") == {"id": "1"}
+    assert len(no_sleep) == 2
+    assert all(1.0 <= delay <= 8.0 for delay in no_sleep)
+
+
+@pytest.mark.asyncio
+async def test_retries_stop_at_max_attempts(no_sleep):
+    api = OjApiClient("http://test", config=ApiClientConfig(retry_max_attempts=2))
+    api._session = _session_with_responses((202, {}, {"detail": "processing"}), (202, {}, {"detail": "processing"}))
+
+    with pytest.raises(ApiProcessingError):
+        await api._request("GET", "daily")
+    assert api._session.request.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_client_errors_timeouts_and_posts_are_not_retried(no_sleep):
+    api = OjApiClient("http://test")
+    api._do_request = AsyncMock(side_effect=[ApiError(400, "bad"), ApiNetworkError("slow", is_timeout=True)])
+
+    with pytest.raises(ApiError):
+        await api._request("GET", "tags/leetcode")
+    with pytest.raises(ApiNetworkError):
+        await api._request("GET", "tags/leetcode")
+
+    api._do_request = AsyncMock(side_effect=ApiNetworkError("reset"))
+    with pytest.raises(ApiNetworkError):
+        await api._request("POST", "similar", json={"query": "x"})
+    assert api._do_request.await_count == 1
+    assert no_sleep == []
+
+
+@pytest.mark.asyncio
+async def test_retry_stops_once_circuit_opens(no_sleep):
+    api = OjApiClient("http://test", config=ApiClientConfig(circuit_failure_threshold=1, retry_max_attempts=5))
+    api._session = _session_with_responses((503, {}, {"detail": "down"}))
+
+    with pytest.raises(ApiError):
+        await api._request("GET", "daily")
+    assert api._session.request.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_exhausted_retry_budget_fails_without_retrying(no_sleep):
+    api = OjApiClient("http://test", config=ApiClientConfig(retry_budget_ratio=0, retry_budget_min_retries=0))
+    api._do_request = AsyncMock(side_effect=ApiNetworkError("reset"))
+
+    with pytest.raises(ApiNetworkError):
+        await api._request("GET", "daily")
+    assert api._do_request.await_count == 1
+    assert api.retry_stats()["exhausted"] == 1
+
+
+# -- Processing polls --
+
+
+def _polling_config(**kwargs):
+    return ApiClientConfig(processing_poll=True, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_processing_poll_honours_retry_after_location_and_backoff(no_sleep):
+    api = OjApiClient("http://test/api/v1", config=_polling_config())
+    api._session = _session_with_responses(
+        (202, {"Retry-After": "3", "Location": "/api/v1/jobs/7"}, {"detail": "processing"}),
+        (202, {}, {"detail": "processing"}),
+        (202, {}, {"detail": "processing"}),
+        (200, {}, {"id": "1"}),
+    )
+
+    assert await api._request("GET", "problems/leetcode/1", params={"lang": "en"}) == {"id": "1"}
+    assert no_sleep == [3.0, 1.0, 2.0]
+    paths = [call.args[1] for call in api._session.request.call_args_list]
+    assert paths == ["problems/leetcode/1", "jobs/7", "jobs/7", "jobs/7"]
+    assert "params" not in api._session.request.call_args_list[1].kwargs
+    assert api.processing_stats() == {"started": 1, "polls": 3, "ready": 1, "gave_up": 0}
+
+
+@pytest.mark.asyncio
+async def test_processing_poll_gives_up_at_timeout_or_deadline(no_sleep):
+    api = OjApiClient("http://test", config=_polling_config(processing_poll_timeout=3))
+    api._session = _session_with_responses(*[(202, {}, {"detail": "processing"})] * 3)
+
+    with pytest.raises(ApiProcessingError):
+        await api._request("GET", "daily")
+    assert no_sleep == [1.0, 2.0]
+
+    api._session = _session_with_responses((202, {"Retry-After": "5"}, {"detail": "processing"}))
+    with deadline_scope(2), pytest.raises(ApiProcessingError):
+        await api._request("GET", "daily")
+    assert no_sleep == [1.0, 2.0]
+    assert api.processing_stats()["gave_up"] == 2
+
+
+@pytest.mark.asyncio
+async def test_processing_poll_ignores_locations_outside_the_api(no_sleep):
+    api = OjApiClient("http://test/api/v1", config=_polling_config())
+    api._session = _session_with_responses(
+        (202, {"Location": "http://elsewhere/jobs/7"}, {"detail": "processing"}),
+        (200, {}, {"id": "1"}),
+    )
+
+    assert await api._request("GET", "daily") == {"id": "1"}
+    assert api._session.request.call_args_list[1].args[1] == "daily"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_waiters_share_one_processing_poller():
+    api = OjApiClient("http://test", config=_polling_config(processing_poll_initial_delay=0.01))
+    api._session = _session_with_responses((202, {}, {"detail": "processing"}), (200, {}, {"id": "1"}))
+
+    results = await asyncio.gather(*(api._request("GET", "problems/leetcode/1") for _ in range(3)))
+
+    assert results == [{"id": "1"}] * 3
+    assert api._session.request.call_count == 2
+    assert api.processing_stats()["started"] == 1
+
+
+# -- Hedged requests --
+
+
+def _hedging_client(**overrides) -> OjApiClient:
+    config = ApiClientConfig(hedge_enabled=True, hedge_min_samples=1, hedge_min_delay=0.01, **overrides)
+    api = OjApiClient("http://test", config=config)
+    api._latency("problems").record(0.01)
+    return api
+
+
+@pytest.mark.asyncio
+async def test_slow_request_is_hedged_and_loser_cancelled():
+    api = _hedging_client()
+    cancelled = []
+    calls = 0
+
+    async def do_request(method, path, *, meta=None, **kwargs):
+        nonlocal calls
+        calls += 1
+        attempt = calls
+        try:
+            await asyncio.sleep(1 if attempt == 1 else 0)
+        except asyncio.CancelledError:
+            cancelled.append(attempt)
+            raise
+        meta["status"] = 200
+        meta["validator"] = f'"v{attempt}"'
+        return {"attempt": attempt}
+
+    api._do_request = do_request
+    meta = {}
+
+    assert await api._request("GET", "problems/leetcode/1", meta=meta) == {"attempt": 2}
+    assert meta["validator"] == '"v2"'
+    assert cancelled == [1]
+    assert api.hedge_stats()["sent"] == 1
+    assert api.hedge_stats()["won"] == 1
+
+
+@pytest.mark.asyncio
+async def test_fast_request_and_non_hedged_families_are_not_hedged():
+    api = _hedging_client()
+    api._do_request = AsyncMock(return_value={"id": "1"})
+
+    assert await api._request("GET", "problems/leetcode/1") == {"id": "1"}
+    assert await api._request("GET", "similar/leetcode/1") == {"id": "1"}
+
+    assert api._do_request.await_count == 2
+    assert api.hedge_stats()["sent"] == 0
+
+
+@pytest.mark.asyncio
+async def test_hedging_respects_budget():
+    api = _hedging_client(hedge_budget_ratio=0)
+
+    async def do_request(method, path, *, meta=None, **kwargs):
+        await asyncio.sleep(0.03)
+        return {"id": "1"}
+
+    api._do_request = AsyncMock(side_effect=do_request)
+
+    assert await api._request("GET", "problems/leetcode/1") == {"id": "1"}
+    assert api._do_request.await_count == 1
+    assert api.hedge_stats()["sent"] == 0
+
+
+# -- Connection warming --
+
+
+@pytest.mark.asyncio
+async def test_warm_up_opens_connections_concurrently_and_tolerates_failures():
+    api = OjApiClient("http://test", config=ApiClientConfig(warm_connections=3))
+    response = AsyncMock()
+    ok = AsyncMock()
+    ok.__aenter__.return_value = response
+    failing = MagicMock()
+    failing.__aenter__ = AsyncMock(side_effect=aiohttp.ClientConnectionError("refused"))
+    failing.__aexit__ = AsyncMock(return_value=False)
+    api._session = MagicMock()
+    api._session.closed = False
+    api._session.request.side_effect = [ok, ok, failing]
+
+    assert await api.warm_up() == 2
+
+    assert [call.args for call in api._session.request.call_args_list] == [("HEAD", "")] * 3
+    assert api.endpoint_stats() == {}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_warm_ups_share_one_round_of_pings():
+    api = OjApiClient("http://test", config=ApiClientConfig(warm_connections=2))
+    context = AsyncMock()
+    api._session = MagicMock()
+    api._session.closed = False
+    api._session.request.return_value = context
+
+    assert await asyncio.gather(api.warm_up(), api.warm_up()) == [2, 2]
+    assert api._session.request.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_start_configures_connector_and_close_stops_warming():
+    config = ApiClientConfig(connector_limit=8, connector_limit_per_host=4, dns_cache_ttl=120, warm_interval=0)
+    api = OjApiClient("http://test", config=config)
+    api.warm_up = AsyncMock(return_value=0)
+
+    await api.start()
+    connector = api._session.connector
+    try:
+        assert connector.limit == 8
+        assert connector.limit_per_host == 4
+        assert connector.use_dns_cache
+        await asyncio.sleep(0)
+        api.warm_up.assert_awaited_once()
+    finally:
+        await api.close()
+    assert api._warm_task is None
+
+
+# -- Priority lanes --
+
+
+@pytest.mark.asyncio
+async def test_background_lane_is_capped_without_blocking_interactive_requests():
+    api = OjApiClient("http://test", config=ApiClientConfig(background_concurrency=1, rate_limit=0))
+    release = asyncio.Event()
+    response = AsyncMock()
+    response.status = 200
+    response.headers = {}
+    response.json.return_value = {"ok": True}
+
+    class SlowContext:
+        async def __aenter__(self):
+            await release.wait()
+            return response
+
+        async def __aexit__(self, *exc):
+            return False
+
+    api._session = MagicMock()
+    api._session.request.side_effect = lambda *args, **kwargs: SlowContext()
+
+    with traffic_lane(LANE_BACKGROUND):
+        background = [asyncio.create_task(api._do_request("GET", f"daily?d={i}")) for i in range(3)]
+    interactive = asyncio.create_task(api._do_request("GET", "problems/leetcode/1"))
+    await asyncio.sleep(0.01)
+
+    stats = api.lane_stats()
+    assert stats[LANE_BACKGROUND]["active"] == 1
+    assert stats[LANE_BACKGROUND]["queued"] == 2
+    assert stats[LANE_INTERACTIVE]["active"] == 1
+    assert stats[LANE_INTERACTIVE]["queued"] == 0
+
+    release.set()
+    await asyncio.gather(interactive, *background)
+    assert api.lane_stats()[LANE_BACKGROUND]["completed"] == 3
+
+
+@pytest.mark.asyncio
+async def test_background_requests_are_not_hedged():
+    api = _hedging_client()
+    api._do_request = AsyncMock(return_value={"id": "1"})
+
+    with traffic_lane(LANE_BACKGROUND):
+        assert not api._should_hedge("problems")
+    assert api._should_hedge("problems")
+
+
+# -- Adaptive concurrency --
+
+
+async def test_adaptive_limit_grows_while_latency_is_stable():
+    clock = FakeClock()
+    limiter = AdaptiveLimiter(4, min_limit=1, max_limit=6, clock=clock)
+
+    for _ in range(40):
+        admitted = [await limiter.acquire() for _ in range(limiter.current)]
+        clock.now += 0.05
+        for started in admitted:
+            limiter.release(started)
+
+    assert limiter.current == 6
+    assert limiter.stats()["baselines_ms"] == {"default": 50.0}
+
+    # Idle capacity is no evidence the upstream could take more.
+    limiter.limit = 5.0
+    for _ in range(20):
+        started = await limiter.acquire()
+        clock.now += 0.05
+        limiter.release(started)
+    assert limiter.current == 5
+
+
+async def test_adaptive_limit_backs_off_once_per_burst_of_overload():
+    clock = FakeClock()
+    limiter = AdaptiveLimiter(8, min_limit=2, backoff=0.5, clock=clock)
+    admitted = [await limiter.acquire() for _ in range(4)]
+    clock.now += 0.05
+    limiter.release(admitted.pop(), overloaded=False)
+
+    # A response far slower than the baseline backs off; the rest of the burst does not.
+    clock.now += 1.0
+    for started in admitted:
+        limiter.release(started, overloaded=True)
+    assert limiter.current == 4
+    assert limiter.stats()["decreases"] == 1
+
+    for _ in range(3):
+        limiter.release(await limiter.acquire(), overloaded=True)
+    assert limiter.current == 2
+
+    limiter.release(await limiter.acquire(), overloaded=None)
+    assert limiter.current == 2
+    assert limiter.stats()["active"] == 0
+
+
+async def test_slow_endpoint_family_is_judged_against_its_own_latency():
+    clock = FakeClock()
+    limiter = AdaptiveLimiter(4, min_limit=1, max_limit=8, clock=clock)
+
+    # Fast problem lookups and multi-second similar searches share the limiter.
+    for _ in range(20):
+        problem, similar = await limiter.acquire(), await limiter.acquire()
+        clock.now += 0.05
+        limiter.release(problem, family="problems")
+        clock.now += 2.0
+        limiter.release(similar, family="similar")
+
+    stats = limiter.stats()
+    assert stats["decreases"] == 0
+    assert limiter.current >= 4
+    assert stats["baselines_ms"] == {"problems": 50.0, "similar": 2050.0}
+
+    # A similar search that is slow for a similar search is still overload.
+    started = await limiter.acquire()
+    clock.now += 10.0
+    limiter.release(started, family="similar")
+    assert limiter.stats()["decreases"] == 1
+
+
+async def test_adaptive_limiter_queues_beyond_the_limit_and_survives_cancellation():
+    limiter = AdaptiveLimiter(1, min_limit=1, max_limit=1)
+    first = await limiter.acquire()
+    cancelled = asyncio.create_task(limiter.acquire())
+    waiting = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.stats()["queued"] == 2
+
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    limiter.release(first, overloaded=None)
+    second = await waiting
+    assert limiter.stats()["active"] == 1 and limiter.stats()["queued"] == 0
+    limiter.release(second, overloaded=None)
+    assert limiter.stats()["active"] == 0
+
+
+async def test_background_cannot_fill_a_backed_off_limit():
+    limiter = AdaptiveLimiter(2, min_limit=2, max_limit=2)
+    first = await limiter.acquire(background=True)
+    queued_background = asyncio.create_task(limiter.acquire(background=True))
+    await asyncio.sleep(0)
+    assert limiter.stats()["background_active"] == 1 and limiter.stats()["queued"] == 1
+
+    # One slot stays free for interactive traffic at min_limit.
+    interactive = await asyncio.wait_for(limiter.acquire(), timeout=1)
+    queued_interactive = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    # Interactive waiters are admitted before background ones queued earlier.
+    limiter.release(first, overloaded=None, background=True)
+    await asyncio.sleep(0)
+    assert queued_interactive.done() and not queued_background.done()
+
+    limiter.release(interactive, overloaded=None)
+    limiter.release(await queued_interactive, overloaded=None)
+    limiter.release(await queued_background, overloaded=None, background=True)
+    assert limiter.stats()["active"] == limiter.stats()["background_active"] == 0
+
+
+async def test_server_errors_lower_the_client_concurrency_limit(no_sleep):
+    config = ApiClientConfig(concurrency_initial=8, concurrency_backoff=0.5, retry_max_attempts=1, rate_limit=0)
+    api = OjApiClient("http://test", config=config)
+    api._session = _session_with_responses((503, {}, {"detail": "down"}), (200, {}, {"id": "1"}))
+
+    with pytest.raises(ApiError):
+        await api._do_request("GET", "problems/leetcode/2")
+    assert api.concurrency_stats()["limit"] == 4
+
+    assert await api._do_request("GET", "problems/leetcode/1") == {"id": "1"}
+    assert api.concurrency_stats()["active"] == 0
+
+
+def test_fixed_concurrency_when_adaptive_is_disabled():
+    api = OjApiClient("http://test", config=ApiClientConfig(adaptive_concurrency=False, concurrency_initial=3))
+    limiter = api._concurrency
+    assert limiter.min_limit == limiter.max_limit == limiter.current == 3
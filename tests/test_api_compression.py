@@ -0,0 +1,91 @@
+import gzip
+import json
+import zlib
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from bot.api_client import ApiError, OjApiClient
+from bot.utils import compression
+from bot.utils.config import ApiClientConfig
+
+PROBLEM = {"id": "1", "source": "leetcode", "title": "Two Sum", "content": "<p>" + "x" * 20000 + "</p>"}
+
+
+def test_accept_encoding_lists_available_codecs():
+    offered = compression.accept_encoding().split(", ")
+    assert "gzip" in offered and "deflate" in offered
+    assert "x-gzip" not in offered
+    assert ("zstd" in offered) == (compression.zstandard is not None)
+    assert ("br" in offered) == (compression.brotli is not None)
+
+
+def test_decompress_handles_chains_and_raw_deflate():
+    data = b'{"ok": true}'
+    assert compression.decompress(data, None) == data
+    assert compression.decompress(gzip.compress(data), "gzip") == data
+    assert compression.decompress(gzip.compress(zlib.compress(data)), "deflate, gzip") == data
+    raw = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    assert compression.decompress(raw.compress(data) + raw.flush(), "identity, deflate") == data
+    with pytest.raises(ValueError, match="Unsupported"):
+        compression.decompress(data, "compress")
+
+
+@pytest.fixture
+async def gzip_server():
+    seen = {}
+
+    def gzipped(payload, status=200):
+        body = gzip.compress(json.dumps(payload).encode())
+        return web.Response(
+            body=body, status=status, content_type="application/json", headers={"Content-Encoding": "gzip"}
+        )
+
+    async def problem(request):
+        seen["accept_encoding"] = request.headers.get("Accept-Encoding")
+        return gzipped(PROBLEM)
+
+    async def broken(request):
+        return gzipped({"detail": "Upstream exploded"}, status=500)
+
+    app = web.Application()
+    app.router.add_get("/api/v1/problems/leetcode/1", problem)
+    app.router.add_get("/api/v1/problems/leetcode/500", broken)
+    server = TestServer(app)
+    await server.start_server()
+    server.seen = seen
+    yield server
+    await server.close()
+
+
+@pytest.mark.parametrize("offload_bytes", [1 << 20, 0])
+async def test_compressed_bodies_are_decoded_and_both_sizes_recorded(gzip_server, offload_bytes):
+    config = ApiClientConfig(
+        persistent_cache=False, warm_connections=0, retry_max_attempts=1, decompress_offload_bytes=offload_bytes
+    )
+    client = OjApiClient(str(gzip_server.make_url("/api/v1")), config=config)
+    await client.start()
+    try:
+        assert await client.get_problem("leetcode", "1") == PROBLEM
+        with pytest.raises(ApiError, match="Upstream exploded"):
+            await client.get_problem("leetcode", "500")
+    finally:
+        await client.close()
+
+    assert gzip_server.seen["accept_encoding"] == compression.accept_encoding()
+    stats = client.endpoint_stats()["problems"]
+    assert stats["decoded_bytes"] == len(json.dumps(PROBLEM))
+    assert 0 < stats["wire_bytes"] < stats["decoded_bytes"]
+    assert stats["compression_ratio"] > 10
+
+
+async def test_compression_can_be_disabled(gzip_server):
+    config = ApiClientConfig(persistent_cache=False, warm_connections=0, compression=False)
+    client = OjApiClient(str(gzip_server.make_url("/api/v1")), config=config)
+    await client.start()
+    try:
+        await client.get_problem("leetcode", "1")
+    finally:
+        await client.close()
+    assert gzip_server.seen["accept_encoding"] == "identity"
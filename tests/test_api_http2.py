@@ -0,0 +1,99 @@
+import asyncio
+import gzip
+import json
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from bot.api_client import ApiNetworkError, OjApiClient
+from bot.utils import httpx_session
+from bot.utils.config import ApiClientConfig
+from bot.utils.httpx_session import HttpxSession
+
+pytestmark = pytest.mark.skipif(httpx_session.httpx is None, reason="httpx is not installed")
+
+PROBLEM = {"id": "1", "source": "leetcode", "title": "Two Sum", "content": "<p>" + "x" * 5000 + "</p>"}
+
+
+@pytest.fixture
+async def server():
+    seen = {}
+
+    async def problem(request):
+        seen["accept_encoding"] = request.headers.get("Accept-Encoding")
+        seen["params"] = dict(request.query)
+        body = gzip.compress(json.dumps(PROBLEM).encode())
+        return web.Response(body=body, content_type="application/json", headers={"Content-Encoding": "gzip"})
+
+    async def slow(request):
+        await asyncio.sleep(1)
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_get("/api/v1/problems/leetcode/1", problem)
+    app.router.add_get("/api/v1/problems/leetcode/slow", slow)
+    server = TestServer(app)
+    await server.start_server()
+    server.seen = seen
+    yield server
+    await server.close()
+
+
+def _client(url, **overrides) -> OjApiClient:
+    config = ApiClientConfig(persistent_cache=False, warm_connections=0, retry_max_attempts=1, **overrides)
+    return OjApiClient(str(url), config=config)
+
+
+async def test_httpx_session_serves_the_client_with_raw_bodies(server):
+    api = _client(server.make_url("/api/v1"))
+    # HTTP/1.1 against the stand-in server; the adapter is the same with HTTP/2 on.
+    api._session = HttpxSession(
+        str(server.make_url("/api/v1/")), headers={"Accept-Encoding": "gzip"}, timeout=5, http2=False
+    )
+    try:
+        assert await api.get_problem("leetcode", "1") == PROBLEM
+        async with api._session.request("GET", "problems/leetcode/1", params={"a": "1"}) as resp:
+            assert resp.status == 200
+            assert resp.headers.get("content-encoding") == "gzip"
+            assert gzip.decompress(await resp.read()) == json.dumps(PROBLEM).encode()
+    finally:
+        await api._session.close()
+
+    assert api._session.closed
+    assert server.seen == {"accept_encoding": "gzip", "params": {"a": "1"}}
+    stats = api.endpoint_stats()["problems"]
+    assert 0 < stats["wire_bytes"] < stats["decoded_bytes"]
+
+
+async def test_httpx_errors_surface_as_network_errors(server):
+    session = HttpxSession(str(server.make_url("/api/v1/")), timeout=5, http2=False)
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            async with session.request("GET", "problems/leetcode/slow", timeout=aiohttp.ClientTimeout(total=0.05)):
+                pass
+    finally:
+        await session.close()
+
+    url = server.make_url("/api/v1")
+    await server.close()
+    api = _client(url)
+    api._session = HttpxSession(str(url) + "/", timeout=5, http2=False)
+    try:
+        with pytest.raises(ApiNetworkError):
+            await api.get_problem("leetcode", "1")
+    finally:
+        await api._session.close()
+
+
+async def test_http2_transport_falls_back_to_http1_without_h2(monkeypatch):
+    monkeypatch.setattr(httpx_session, "h2", None)
+    api = _client("http://test", transport="http2")
+    await api.start()
+    try:
+        assert isinstance(api._session, aiohttp.ClientSession)
+    finally:
+        await api.close()
+    with pytest.raises(RuntimeError, match="httpx"):
+        HttpxSession("http://test/")
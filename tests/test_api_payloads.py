@@ -0,0 +1,84 @@
+import json
+import pickle
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from bot.api_client import OjApiClient
+from bot.utils import codec
+from bot.utils.payloads import ProblemRecord, SimilarResult, problem_record, similar_payload
+
+PROBLEM = {
+    "id": "1",
+    "source": "leetcode",
+    "title": "Two Sum",
+    "difficulty": "Easy",
+    "tags": ["Array"],
+    "content": "<p>Given an array</p>",
+    "is_premium": False,
+}
+
+
+def test_problem_record_behaves_like_a_read_only_dict():
+    record = ProblemRecord(PROBLEM)
+
+    assert record == PROBLEM
+    assert dict(record) == PROBLEM
+    assert record["title"] == "Two Sum"
+    assert record.get("rating") is None
+    assert record.get("is_premium") is False
+    assert "rating" not in record
+    assert "is_premium" in record
+    assert len(record) == len(PROBLEM)
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(KeyError):
+        record["rating"]
+    with pytest.raises(AttributeError):
+        record.title = "changed"
+
+
+def test_problem_record_copy_is_mutable_and_pickle_round_trips():
+    record = ProblemRecord(PROBLEM)
+
+    info = record.copy()
+    info["description"] = "text"
+
+    assert isinstance(info, dict)
+    assert "description" not in record
+    assert pickle.loads(pickle.dumps(record)) == record
+
+
+def test_wrappers_leave_other_shapes_alone():
+    assert problem_record(None) is None
+    assert problem_record(["a"]) == ["a"]
+    wrapped = similar_payload({"results": [{"id": "2", "similarity": 0.9}], "total": 1})
+    assert isinstance(wrapped["results"][0], SimilarResult)
+    assert wrapped == {"results": [{"id": "2", "similarity": 0.9}], "total": 1}
+
+
+def test_codec_round_trips_records():
+    encoded = codec.dumps({"problem": ProblemRecord(PROBLEM)})
+
+    assert json.loads(encoded) == {"problem": PROBLEM}
+    assert codec.loads(encoded.encode()) == {"problem": PROBLEM}
+    assert codec.BACKEND in {"orjson", "msgspec", "json"}
+
+
+@pytest.mark.asyncio
+async def test_responses_are_decoded_from_raw_bytes_into_records():
+    response = AsyncMock()
+    response.status = 200
+    response.headers = {}
+    response.read.return_value = json.dumps(PROBLEM).encode()
+    context = AsyncMock()
+    context.__aenter__.return_value = response
+    api = OjApiClient("http://test")
+    api._session = MagicMock()
+    api._session.request.return_value = context
+
+    problem = await api.get_problem("leetcode", "1")
+
+    assert isinstance(problem, ProblemRecord)
+    assert problem == PROBLEM
+    response.json.assert_not_awaited()
+    assert api._problem_cache.peek("problem:leetcode/1")[0] is problem
@@ -0,0 +1,163 @@
+import asyncio
+from collections import Counter
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from bot.api_client import OjApiClient
+from bot.utils.config import ApiClientConfig
+from bot.utils.routing import Replica, ReplicaRouter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+# -- Router --
+
+
+def test_router_prefers_low_latency_weighted_by_inflight():
+    fast, slow = Replica("fast"), Replica("slow")
+    router = ReplicaRouter([slow, fast], alpha=0.5)
+    router.record_success(fast, 0.01)
+    router.record_success(slow, 0.1)
+    assert router.pick() is fast
+    fast.inflight = 20
+    assert router.pick() is slow
+    assert router.pick(exclude=[slow]) is fast
+
+    router.record_success(slow, 0.3)
+    assert slow.ewma == pytest.approx(0.2)
+
+
+def test_router_ejects_after_consecutive_failures_until_recovered():
+    clock = FakeClock()
+    a, b = Replica("a"), Replica("b")
+    router = ReplicaRouter([a, b], eject_after=2, eject_duration=30, clock=clock)
+    router.record_success(a, 0.01)
+    router.record_success(b, 0.5)
+
+    router.record_failure(a)
+    assert router.is_healthy(a)
+    assert router.pick() is b  # a failed since its last success
+    router.record_failure(a)
+    assert not router.is_healthy(a)
+
+    router.record_failure(b)
+    router.record_failure(b)
+    assert router.pick() is a  # all ejected: the one back soonest
+    clock.now = 31
+    assert router.is_healthy(a) and router.is_healthy(b)
+
+    router.mark_up(a)
+    assert router.pick() is a
+    assert router.stats()["a"] == {"healthy": True, "ewma_ms": 10.0, "inflight": 0, "requests": 3, "failures": 2}
+
+
+# -- Client against stand-in servers --
+
+
+async def _start(handler_delay=0.0, status=lambda: 200):
+    hits = Counter()
+
+    async def problem(request):
+        hits[request.method] += 1
+        await asyncio.sleep(handler_delay)
+        pid = request.match_info["pid"]
+        return web.json_response({"id": pid, "source": "leetcode", "title": f"Problem {pid}"}, status=status())
+
+    async def health(request):
+        hits["probe"] += 1
+        return web.Response(status=status())
+
+    app = web.Application()
+    app.router.add_get("/api/v1/problems/leetcode/{pid}", problem)
+    app.router.add_get("/api/v1/health", health)
+    server = TestServer(app)
+    await server.start_server()
+    server.hits = hits
+    return server
+
+
+def _client(primary, *replicas, **overrides):
+    config = ApiClientConfig(
+        persistent_cache=False,
+        warm_connections=0,
+        retry_max_attempts=1,
+        replicas=[str(url) for url in replicas],
+        **overrides,
+    )
+    return OjApiClient(str(primary), config=config)
+
+
+async def test_requests_fail_over_from_unreachable_replica():
+    live = await _start()
+    dead = await _start()
+    dead_url = dead.make_url("/api/v1")
+    live_url = live.make_url("/api/v1")
+    await dead.close()
+    client = _client(dead_url, live_url, routing_eject_after=1, routing_probe_interval=0)
+    await client.start()
+    try:
+        for pid in range(1, 4):
+            assert (await client.get_problem("leetcode", str(pid)))["id"] == str(pid)
+        stats = client.replica_stats()
+    finally:
+        await client.close()
+        await live.close()
+
+    assert live.hits["GET"] == 3
+    assert stats[str(dead_url)] == {"healthy": False, "ewma_ms": None, "inflight": 0, "requests": 1, "failures": 1}
+    assert stats[str(live_url)]["requests"] == 3
+
+
+async def test_requests_prefer_the_faster_replica():
+    fast = await _start()
+    slow = await _start(handler_delay=0.05)
+    client = _client(slow.make_url("/api/v1"), fast.make_url("/api/v1"), routing_probe_interval=0)
+    await client.start()
+    try:
+        for pid in range(1, 13):
+            await client.get_problem("leetcode", str(pid))
+    finally:
+        await client.close()
+        await fast.close()
+        await slow.close()
+
+    assert slow.hits["GET"] == 1  # sampled once, then avoided
+    assert fast.hits["GET"] == 11
+
+
+async def test_probes_bring_a_recovered_replica_back():
+    broken = {"flag": True}
+    flaky = await _start(status=lambda: 503 if broken["flag"] else 200)
+    backup = await _start()
+    flaky_url = str(flaky.make_url("/api/v1"))
+    client = _client(
+        flaky_url,
+        backup.make_url("/api/v1"),
+        routing_eject_after=1,
+        routing_probe_interval=0.02,
+        routing_probe_path="health",
+    )
+    await client.start()
+    try:
+        await asyncio.sleep(0.05)
+        assert not client.replica_stats()[flaky_url]["healthy"]
+        assert (await client.get_problem("leetcode", "1"))["id"] == "1"
+        assert flaky.hits["GET"] == 0
+
+        broken["flag"] = False
+        await asyncio.sleep(0.05)
+        assert client.replica_stats()[flaky_url]["healthy"]
+    finally:
+        await client.close()
+        await flaky.close()
+        await backup.close()
+
+    assert flaky.hits["probe"] >= 2
@@ -13,6 +13,7 @@ TARGET_TABLES = {
     "server_settings",
     "llm_translate_results",
     "llm_inspire_results",
+    "api_cache",
 }
 LEGACY_TABLES = {
     "problems",
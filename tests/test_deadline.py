@@ -0,0 +1,119 @@
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from bot.api_client import ApiNetworkError, OjApiClient
+from bot.llms.gemini import GeminiLLM
+from bot.utils import deadline
+
+
+def test_set_deadline_keeps_the_earlier_deadline():
+    with deadline.deadline_scope(5):
+        deadline.set_deadline(60)
+        assert deadline.remaining() <= 5
+        assert deadline.clamp_timeout(300) <= 5
+        assert deadline.clamp_timeout(1) == 1
+    assert deadline.remaining() is None
+    assert deadline.clamp_timeout(300) == 300
+
+
+def test_start_interaction_deadline_uses_followup_window_or_budget():
+    with deadline.deadline_scope(10_000):
+        deadline.start_interaction_deadline()
+        assert deadline.remaining() == pytest.approx(deadline.FOLLOWUP_WINDOW - deadline.FOLLOWUP_MARGIN, abs=1)
+        deadline.start_interaction_deadline(budget=30)
+        assert deadline.remaining() == pytest.approx(30, abs=1)
+
+
+@pytest.mark.asyncio
+async def test_within_deadline_cancels_slow_work():
+    cancelled = asyncio.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with deadline.deadline_scope(0.01):
+        with pytest.raises(deadline.DeadlineExceeded):
+            await deadline.within_deadline(slow())
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_api_request_fails_fast_once_deadline_passed():
+    api = OjApiClient("http://test")
+    api._session = MagicMock()
+
+    with deadline.deadline_scope(0):
+        with pytest.raises(ApiNetworkError) as exc_info:
+            await api._request("GET", "problems/leetcode/1")
+
+    assert exc_info.value.is_timeout
+    api._session.request.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_api_request_timeout_is_clamped_to_deadline():
+    api = OjApiClient("http://test", timeout=300)
+    seen = {}
+
+    async def do_request(method, path, **kwargs):
+        seen.update(kwargs)
+        return {"id": "1"}
+
+    api._do_request = do_request
+
+    with deadline.deadline_scope(2):
+        await api._request("GET", "problems/leetcode/1")
+
+    assert 0 < seen["timeout"].total <= 2
+
+
+@pytest.mark.asyncio
+async def test_coalesced_waiter_gives_up_at_its_own_deadline():
+    api = OjApiClient("http://test")
+    release = asyncio.Event()
+
+    async def do_request(method, path, **kwargs):
+        await release.wait()
+        return {"id": "1"}
+
+    api._do_request = do_request
+    leader = asyncio.create_task(api._request("GET", "resolve/two-sum"))
+    await asyncio.sleep(0)
+
+    with deadline.deadline_scope(0.01):
+        with pytest.raises(ApiNetworkError):
+            await api._request("GET", "resolve/two-sum")
+
+    release.set()
+    assert await leader == {"id": "1"}
+
+
+@pytest.mark.asyncio
+async def test_gemini_request_timeout_follows_deadline():
+    llm = GeminiLLM(api_key="test-key")
+    llm.genai_client = MagicMock()
+    llm.genai_client.models.generate_content.return_value = MagicMock(text="ok")
+
+    with deadline.deadline_scope(20):
+        assert await llm.generate("hi") == "ok"
+
+    config = llm.genai_client.models.generate_content.call_args.kwargs["config"]
+    assert 0 < config["http_options"]["timeout"] <= 20_000
+
+
+@pytest.mark.asyncio
+async def test_gemini_gives_up_when_deadline_passes():
+    llm = GeminiLLM(api_key="test-key")
+    llm.genai_client = MagicMock()
+    llm.genai_client.models.generate_content.side_effect = lambda **kwargs: time.sleep(0.2)
+
+    with deadline.deadline_scope(0.01):
+        with pytest.raises(deadline.DeadlineExceeded):
+            await llm.generate("hi")
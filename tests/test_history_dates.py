@@ -7,6 +7,7 @@ from unittest.mock import AsyncMock
 
 import pytest
 
+from bot.api_client import LANE_BACKGROUND, LANE_INTERACTIVE, _current_lane, traffic_lane
 from bot.leetcode import generate_history_dates
 from bot.utils.ui_helpers import _fetch_daily_history
 
@@ -53,3 +54,20 @@ async def test_fetch_daily_history_uses_module_level_generate_history_dates():
         "2022-01-07",
         "2021-01-07",
     ]
+
+
+@pytest.mark.asyncio
+async def test_fetch_daily_history_runs_in_the_callers_lane():
+    lanes = []
+
+    async def get_daily(domain, day):
+        lanes.append(_current_lane.get())
+        return {"date": day}
+
+    bot = SimpleNamespace(api=SimpleNamespace(get_daily=get_daily))
+
+    await _fetch_daily_history(bot, "com", "2026-01-07")
+    with traffic_lane(LANE_BACKGROUND):
+        await _fetch_daily_history(bot, "com", "2026-01-07")
+
+    assert lanes == [LANE_INTERACTIVE] * 5 + [LANE_BACKGROUND] * 5
@@ -0,0 +1,79 @@
+import pytest
+
+from bot.utils.problem_refs import normalize_query, parse_problem_ref
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "two-sum",
+        "  Two-Sum  ",
+        "two-sum/",
+        "leetcode:two-sum",
+        "LeetCode: Two-Sum",
+        "https://leetcode.com/problems/two-sum/",
+        "https://www.leetcode.com/problems/two-sum/description/?envType=daily",
+        "leetcode.com/problems/Two-Sum",
+    ],
+)
+def test_spellings_of_the_same_leetcode_problem_share_a_key(query):
+    assert normalize_query(query) == "two-sum"
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("Codeforces:1234A", "codeforces:1234a"),
+        ("atcoder : abc300_a ", "atcoder:abc300_a"),
+        ("https://leetcode.cn/problems/two-sum/", "leetcode.cn/problems/two-sum"),
+        ("HTTPS://Codeforces.com/problemset/problem/1234/A/#x", "codeforces.com/problemset/problem/1234/a"),
+        ("1", "1"),
+    ],
+)
+def test_other_references_keep_source_and_host(query, expected):
+    assert normalize_query(query) == expected
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("https://codeforces.com/contest/1234/problem/a1", ("codeforces", "1234A1")),
+        ("codeforces.com/problemset/problem/4/A", ("codeforces", "4A")),
+        ("https://atcoder.jp/contests/abc300/tasks/abc300_a", ("atcoder", "abc300_a")),
+        ("https://www.luogu.com.cn/problem/P1001", ("luogu", "P1001")),
+        ("https://www.spoj.com/problems/prime1/", ("spoj", "PRIME1")),
+        (" Luogu: P1001 ", ("luogu", "P1001")),
+        ("codeforces:4a", ("codeforces", "4A")),
+        ("atcoder:ABC300_A", ("atcoder", "abc300_a")),
+        ("luogu:p1001", ("luogu", "P1001")),
+        ("luogu:at_ABC300_a", ("luogu", "AT_abc300_a")),
+        ("spoj:prime1", ("spoj", "PRIME1")),
+        ("leetcode:1", ("leetcode", "1")),
+        ("42", ("leetcode", "42")),
+    ],
+)
+def test_unambiguous_references_are_parsed_locally(query, expected):
+    assert parse_problem_ref(query) == expected
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "two-sum",
+        "leetcode:two-sum",
+        "https://leetcode.com/problems/Two-Sum/description/",
+        "leetcode.cn/problems/two-sum",
+        "codeforces:watermelon",
+        "luogu:two sum",
+        "atcoder:two sum",
+        "spoj:prime generator",
+        "https://www.luogu.com.cn/problem/two-sum",
+        "abc100_a",
+        "P1001",
+        "unknown:1",
+        "https://example.com/problems/1",
+        "Two Sum",
+    ],
+)
+def test_ambiguous_references_are_left_to_resolve(query):
+    assert parse_problem_ref(query) is None
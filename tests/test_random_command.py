@@ -1,4 +1,5 @@
 import asyncio
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import aiohttp
@@ -16,6 +17,10 @@ from bot.api_client import (
     OjApiClient,
 )
 from bot.cogs.slash_commands_cog import SlashCommandsCog
+from bot.utils.cache import PrefetchPool
+from bot.utils.config import ApiClientConfig
+from bot.utils.database import ApiCacheDatabaseManager
+from bot.utils.tag_index import TagIndex
 
 # -- helpers --
 
@@ -294,6 +299,8 @@ async def test_request_inflight_key_includes_timeout():
 
 # -- get_random_problem tests --
 
+# Problems are fetched in pooled batches of ApiClientConfig.random_pool_batch (10 by default).
+
 
 @pytest.mark.asyncio
 async def test_get_random_problem_returns_none_on_empty_results():
@@ -304,7 +311,7 @@ async def test_get_random_problem_returns_none_on_empty_results():
     result = await api.get_random_problem()
 
     assert result is None
-    api._request.assert_called_once_with("GET", "random", params={"count": 1})
+    api._request.assert_called_once_with("GET", "random", params={"count": 10})
 
 
 @pytest.mark.asyncio
@@ -329,7 +336,7 @@ async def test_get_random_problem_swaps_rating_when_min_exceeds_max():
     api._request.assert_called_once_with(
         "GET",
         "random",
-        params={"count": 1, "rating_min": 1500, "rating_max": 2000},
+        params={"count": 10, "rating_min": 1500, "rating_max": 2000},
     )
 
 
@@ -345,7 +352,7 @@ async def test_get_random_problem_passes_all_filters():
         "GET",
         "random",
         params={
-            "count": 1,
+            "count": 10,
             "source": "leetcode",
             "difficulty": "medium",
             "tags": "Array",
@@ -363,7 +370,7 @@ async def test_get_random_problem_source_default_omitted():
 
     await api.get_random_problem()
 
-    api._request.assert_called_once_with("GET", "random", params={"count": 1})
+    api._request.assert_called_once_with("GET", "random", params={"count": 10})
 
 
 @pytest.mark.asyncio
@@ -374,7 +381,7 @@ async def test_get_random_problem_source_all_omitted():
 
     await api.get_random_problem(source="all")
 
-    api._request.assert_called_once_with("GET", "random", params={"count": 1})
+    api._request.assert_called_once_with("GET", "random", params={"count": 10})
 
 
 @pytest.mark.asyncio
@@ -419,6 +426,55 @@ async def test_get_random_problem_accepts_legacy_results_shape():
     assert result == _sample_problem()
 
 
+@pytest.mark.asyncio
+async def test_random_pool_serves_locally_and_refills_below_low_water():
+    api = OjApiClient("http://test", config=ApiClientConfig(random_pool_batch=4, random_pool_low_water=1))
+    batches = iter([[_sample_problem(str(i)) for i in range(n, n + 4)] for n in (0, 4)])
+    api._request = AsyncMock(side_effect=lambda *args, **kwargs: {"results": next(batches)})
+
+    first = [await api.get_random_problem(source="leetcode", tags="DP, Array") for _ in range(3)]
+    assert [problem["id"] for problem in first] == ["0", "1", "2"]
+    await asyncio.sleep(0)
+    nxt = await api.get_random_problem(source="leetcode", tags="Array,DP")
+
+    assert nxt["id"] == "3"
+    assert api._request.await_count == 2
+    assert api._request.await_args.kwargs["params"] == {"count": 4, "source": "leetcode", "tags": "Array,DP"}
+    stats = api.random_pool_stats()
+    assert (stats["hits"], stats["misses"], stats["refills"], stats["buffered"]) == (3, 1, 2, 4)
+
+
+@pytest.mark.asyncio
+async def test_random_pool_shares_cold_fetch_and_reports_no_match():
+    api = OjApiClient("http://test", config=ApiClientConfig(random_pool_low_water=0))
+
+    async def request(method, path, params):
+        await asyncio.sleep(0.01)
+        return {"results": [_sample_problem(str(i)) for i in range(5)] if params.get("source") else []}
+
+    api._request = AsyncMock(side_effect=request)
+
+    problems = await asyncio.gather(*(api.get_random_problem(source="atcoder") for _ in range(3)))
+    assert [problem["id"] for problem in problems] == ["0", "1", "2"]
+    assert await api.get_random_problem(difficulty="Hard") is None
+    assert api._request.await_count == 2
+
+
+def test_prefetch_pool_drops_idle_and_least_recently_used_keys():
+    clock = [0.0]
+    pool = PrefetchPool(AsyncMock(return_value=[1, 2, 3]), low_water=0, max_keys=2, idle_ttl=60, clock=lambda: clock[0])
+
+    async def take(key):
+        return await pool.get(key)
+
+    for key in ("a", "b", "c"):
+        asyncio.run(take(key))
+    assert pool.stats()["keys"] == 2 and pool.stats()["evictions"] == 1
+    clock[0] = 120
+    asyncio.run(take("a"))
+    assert pool.stats()["keys"] == 1
+
+
 # -- /random command tests --
 
 
@@ -789,13 +845,68 @@ async def test_get_tags_cached_no_cache_api_failure_returns_empty():
     assert result == []
 
 
+@pytest.mark.asyncio
+async def test_tags_survive_restart_and_refresh_in_background_when_expired(tmp_path):
+    cache_db = ApiCacheDatabaseManager(db_path=str(tmp_path / "cache.db"))
+    first = OjApiClient("http://test", cache_db=cache_db)
+    first._request = AsyncMock(return_value=["Array", "DP"])
+    await first.get_tags_cached("leetcode")
+
+    restarted = OjApiClient("http://test", cache_db=cache_db)
+    restarted._request = AsyncMock(return_value=["Array", "DP", "Graph"])
+    assert (await restarted.get_tag_index("leetcode")).tags == ["Array", "DP"]
+    restarted._request.assert_not_awaited()
+
+    with patch("time.time", return_value=time.time() + 86401):
+        index = await restarted.get_tag_index("leetcode")
+        assert index.tags == ["Array", "DP"]
+        await asyncio.gather(*restarted._refresh_tasks.values())
+    assert (await restarted.get_tag_index("leetcode")).tags == ["Array", "DP", "Graph"]
+    restarted._request.assert_awaited_once_with("GET", "tags/leetcode")
+
+
+@pytest.mark.asyncio
+async def test_tags_outlive_the_startup_prune_after_long_downtime(tmp_path):
+    cache_db = ApiCacheDatabaseManager(db_path=str(tmp_path / "cache.db"))
+    two_days_ago = time.time() - 2 * 86400
+    cache_db.save_entry("tags:leetcode", ["Array", "DP"], fetched_at=two_days_ago)
+    cache_db.save_entry("problem:leetcode/1", {"id": "1"}, fetched_at=two_days_ago)
+
+    restarted = OjApiClient("http://test", cache_db=cache_db, config=ApiClientConfig(warm_connections=0))
+    restarted._request = AsyncMock(side_effect=ApiNetworkError("down"))
+    await restarted.start()
+    try:
+        assert cache_db.get_entry("problem:leetcode/1") is None
+        assert (await restarted.get_tag_index("leetcode")).tags == ["Array", "DP"]
+        await asyncio.gather(*restarted._refresh_tasks.values())
+        assert (await restarted.get_tag_index("leetcode")).tags == ["Array", "DP"]
+    finally:
+        await restarted.close()
+
+
+@pytest.mark.asyncio
+async def test_tag_index_for_all_merges_sources_and_is_reused():
+    api = OjApiClient("http://test")
+
+    async def request(method, path, **kwargs):
+        return {"tags/leetcode": ["Array", "Graph"], "tags/codeforces": ["graphs", "Array"]}.get(path, [])
+
+    api._request = AsyncMock(side_effect=request)
+
+    index = await api.get_tag_index("all")
+
+    assert index.search("graph") == ["Graph", "graphs"]
+    assert index.tags.count("Array") == 1
+    assert await api.get_tag_index("all") is index
+
+
 # -- tags autocomplete tests --
 
 
 @pytest.mark.asyncio
 async def test_tags_autocomplete_returns_filtered_choices():
     bot = _make_bot()
-    bot.api.get_tags_cached = AsyncMock(return_value=["Array", "DP", "Graph", "Tree", "Sort"])
+    bot.api.get_tag_index = AsyncMock(return_value=TagIndex(["Array", "DP", "Graph", "Tree", "Sort"]))
     cog = SlashCommandsCog(bot)
     interaction = _make_interaction()
     interaction.namespace = MagicMock()
@@ -811,7 +922,7 @@ async def test_tags_autocomplete_returns_filtered_choices():
 @pytest.mark.asyncio
 async def test_tags_autocomplete_defaults_to_leetcode():
     bot = _make_bot()
-    bot.api.get_tags_cached = AsyncMock(return_value=["Array", "DP"])
+    bot.api.get_tag_index = AsyncMock(return_value=TagIndex(["Array", "DP"]))
     cog = SlashCommandsCog(bot)
     interaction = _make_interaction()
     interaction.namespace = MagicMock()
@@ -819,26 +930,26 @@ async def test_tags_autocomplete_defaults_to_leetcode():
 
     await cog.random_tags_autocomplete(interaction, "a")
 
-    bot.api.get_tags_cached.assert_awaited_once_with("leetcode")
+    bot.api.get_tag_index.assert_awaited_once_with("leetcode")
 
 
 @pytest.mark.asyncio
 async def test_tags_autocomplete_no_namespace_defaults_to_leetcode():
     bot = _make_bot()
-    bot.api.get_tags_cached = AsyncMock(return_value=["Array"])
+    bot.api.get_tag_index = AsyncMock(return_value=TagIndex(["Array"]))
     cog = SlashCommandsCog(bot)
     interaction = _make_interaction()
     interaction.namespace = None
 
     await cog.random_tags_autocomplete(interaction, "a")
 
-    bot.api.get_tags_cached.assert_awaited_once_with("leetcode")
+    bot.api.get_tag_index.assert_awaited_once_with("leetcode")
 
 
 @pytest.mark.asyncio
 async def test_tags_autocomplete_api_failure_returns_empty():
     bot = _make_bot()
-    bot.api.get_tags_cached = AsyncMock(side_effect=ApiNetworkError("timeout"))
+    bot.api.get_tag_index = AsyncMock(side_effect=ApiNetworkError("timeout"))
     cog = SlashCommandsCog(bot)
     interaction = _make_interaction()
     interaction.namespace = MagicMock()
@@ -852,7 +963,7 @@ async def test_tags_autocomplete_api_failure_returns_empty():
 @pytest.mark.asyncio
 async def test_tags_autocomplete_no_matches_returns_empty():
     bot = _make_bot()
-    bot.api.get_tags_cached = AsyncMock(return_value=["Array", "DP"])
+    bot.api.get_tag_index = AsyncMock(return_value=TagIndex(["Array", "DP"]))
     cog = SlashCommandsCog(bot)
     interaction = _make_interaction()
     interaction.namespace = MagicMock()
@@ -866,7 +977,7 @@ async def test_tags_autocomplete_no_matches_returns_empty():
 @pytest.mark.asyncio
 async def test_tags_autocomplete_respects_source_change():
     bot = _make_bot()
-    bot.api.get_tags_cached = AsyncMock(return_value=["Brute Force", "Greedy"])
+    bot.api.get_tag_index = AsyncMock(return_value=TagIndex(["Brute Force", "Greedy"]))
     cog = SlashCommandsCog(bot)
     interaction = _make_interaction()
     interaction.namespace = MagicMock()
@@ -874,13 +985,13 @@ async def test_tags_autocomplete_respects_source_change():
 
     await cog.random_tags_autocomplete(interaction, "g")
 
-    bot.api.get_tags_cached.assert_awaited_once_with("codeforces")
+    bot.api.get_tag_index.assert_awaited_once_with("codeforces")
 
 
 @pytest.mark.asyncio
-async def test_tags_autocomplete_source_all_defaults_to_leetcode():
+async def test_tags_autocomplete_source_all_searches_every_source():
     bot = _make_bot()
-    bot.api.get_tags_cached = AsyncMock(return_value=["Array"])
+    bot.api.get_tag_index = AsyncMock(return_value=TagIndex(["Array"]))
     cog = SlashCommandsCog(bot)
     interaction = _make_interaction()
     interaction.namespace = MagicMock()
@@ -888,14 +999,14 @@ async def test_tags_autocomplete_source_all_defaults_to_leetcode():
 
     await cog.random_tags_autocomplete(interaction, "a")
 
-    bot.api.get_tags_cached.assert_awaited_once_with("leetcode")
+    bot.api.get_tag_index.assert_awaited_once_with("all")
 
 
 @pytest.mark.asyncio
 async def test_tags_autocomplete_limits_to_25():
     bot = _make_bot()
     tags = [f"Tag{i}" for i in range(50)]
-    bot.api.get_tags_cached = AsyncMock(return_value=tags)
+    bot.api.get_tag_index = AsyncMock(return_value=TagIndex(tags))
     cog = SlashCommandsCog(bot)
     interaction = _make_interaction()
     interaction.namespace = MagicMock()
@@ -7,6 +7,7 @@ import pytest
 import pytz
 from discord.ext import commands
 
+from bot.api_client import ApiProcessingError
 from bot.cogs import schedule_manager_cog as schedule_module
 from bot.cogs.schedule_manager_cog import ScheduleManagerCog
 
@@ -109,3 +110,65 @@ async def test_scheduled_delivery_guard_cleans_up_after_exception(monkeypatch):
 
     await cog.send_daily_challenge_job(123, 456, 789)
     assert cog.scheduled_deliveries_in_progress == set()
+
+
+@pytest.mark.asyncio
+async def test_add_server_schedule_prewarms_api_before_post_time(monkeypatch):
+    cog = ScheduleManagerCog(_make_bot())
+    add_job = MagicMock()
+    monkeypatch.setattr(cog.scheduler, "add_job", add_job)
+    monkeypatch.setattr(cog.scheduler, "get_job", MagicMock(return_value=None))
+
+    await cog.add_server_schedule({"server_id": 123, "channel_id": 456, "post_time": "00:00", "timezone": "UTC"})
+
+    prewarm = next(call.kwargs for call in add_job.call_args_list if call.kwargs["id"] == "prewarm_123")
+    assert prewarm["func"] == cog.prewarm_api_connections
+    assert str(prewarm["trigger"].fields[5]) == "23"
+    assert str(prewarm["trigger"].fields[6]) == "59"
+
+
+@pytest.mark.asyncio
+async def test_scheduled_delivery_keeps_retrying_while_api_is_processing(monkeypatch):
+    cog = ScheduleManagerCog(_make_bot())
+    attempts = 0
+    sleeps = []
+
+    async def send_daily_challenge(**kwargs):
+        nonlocal attempts
+        attempts += 1
+        if attempts < 4:
+            raise ApiProcessingError()
+        return {"title": "Two Sum"}
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(schedule_module, "send_daily_challenge", send_daily_challenge)
+    monkeypatch.setattr(schedule_module.asyncio, "sleep", fake_sleep)
+
+    await cog.send_daily_challenge_job(123, 456, 789)
+
+    assert attempts == 4
+    assert [round(delay) for delay in sleeps] == [2, 4, 8]
+    assert cog.scheduled_deliveries_in_progress == set()
+
+
+@pytest.mark.asyncio
+async def test_scheduled_delivery_gives_up_after_processing_retries(monkeypatch):
+    cog = ScheduleManagerCog(_make_bot())
+    attempts = 0
+
+    async def send_daily_challenge(**kwargs):
+        nonlocal attempts
+        attempts += 1
+        raise ApiProcessingError()
+
+    async def fake_sleep(delay):
+        pass
+
+    monkeypatch.setattr(schedule_module, "send_daily_challenge", send_daily_challenge)
+    monkeypatch.setattr(schedule_module.asyncio, "sleep", fake_sleep)
+
+    await cog.send_daily_challenge_job(123, 456, 789)
+
+    assert attempts == len(schedule_module.PROCESSING_RETRY_DELAYS) + 1
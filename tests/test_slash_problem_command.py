@@ -100,6 +100,15 @@ def _make_bot():
     bot.i18n = MagicMock()
     bot.i18n.t = MagicMock(side_effect=_i18n_t)
     bot.i18n.resolve_locale = MagicMock(return_value="zh-TW")
+
+    async def _resolve_many(queries):
+        return [await bot.api.resolve(query) for query in queries]
+
+    async def _get_problems_bulk(refs):
+        return [await bot.api.get_problem(source, problem_id) for source, problem_id in refs]
+
+    bot.api.resolve_many.side_effect = _resolve_many
+    bot.api.get_problems_bulk.side_effect = _get_problems_bulk
     return bot
 
 
@@ -530,3 +539,39 @@ async def test_daily_by_date_not_found_keeps_date_specific_error(monkeypatch):
     interaction.response.defer.assert_awaited_once_with(ephemeral=True)
     get_payload.assert_awaited_once_with(bot, "com", "2026-06-03")
     interaction.followup.send.assert_awaited_once_with("errors.validation.not_found_for_date", ephemeral=True)
+
+
+@pytest.mark.asyncio
+async def test_problem_command_falls_back_to_leetcode_lookup_only_for_unresolved_ids():
+    bot = _make_bot()
+
+    async def _resolve(query):
+        return {"problem": _make_atcoder_problem(query)} if query.startswith("abc") else None
+
+    async def _get_problem(source, problem_id):
+        return {**_make_atcoder_problem(problem_id), "source": source}
+
+    bot.api.resolve.side_effect = _resolve
+    bot.api.get_problem.side_effect = _get_problem
+    cog = SlashCommandsCog(bot)
+    interaction = _make_interaction()
+
+    await cog.problem_command.callback(
+        cog,
+        interaction,
+        problem_ids="abc436_g,1,abc436_f",
+        domain="com",
+        public=False,
+        message=None,
+        title=None,
+        source=None,
+    )
+
+    bot.api.resolve_many.assert_awaited_once_with(["abc436_g", "1", "abc436_f"])
+    bot.api.get_problems_bulk.assert_awaited_once_with([("leetcode", "1")])
+    _, kwargs = interaction.followup.send.call_args
+    assert [button.custom_id for button in kwargs["view"].children] == [
+        "problem|atcoder|abc436_g|view",
+        "problem|leetcode|1|view",
+        "problem|atcoder|abc436_f|view",
+    ]
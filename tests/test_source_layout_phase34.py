@@ -6,6 +6,7 @@ import pytest
 from discord.ext import commands
 
 from bot import app
+from bot.utils.config import ApiClientConfig
 
 
 class DummyLogger:
@@ -137,6 +138,9 @@ async def test_create_bot_runtime_checks_token_before_starting_api(monkeypatch):
         def get_llm_model_config(self, _model_type):
             return {}
 
+        def get_api_client_config(self):
+            return ApiClientConfig()
+
     class DummyBot:
         def __init__(self):
             self.tree = SimpleNamespace(sync=AsyncMock(return_value=[]))
@@ -159,6 +163,7 @@ async def test_create_bot_runtime_checks_token_before_starting_api(monkeypatch):
     monkeypatch.setattr(bot_utils, "SettingsDatabaseManager", lambda *args, **kwargs: SimpleNamespace())
     monkeypatch.setattr(database_module, "LLMTranslateDatabaseManager", lambda *args, **kwargs: SimpleNamespace())
     monkeypatch.setattr(database_module, "LLMInspireDatabaseManager", lambda *args, **kwargs: SimpleNamespace())
+    monkeypatch.setattr(database_module, "ApiCacheDatabaseManager", lambda *args, **kwargs: SimpleNamespace())
     monkeypatch.setattr(app.commands, "Bot", lambda *args, **kwargs: bot)
     monkeypatch.setattr(app, "_register_runtime_handlers", lambda _bot: None)
     monkeypatch.setattr(app, "load_extensions", AsyncMock())
@@ -0,0 +1,34 @@
+from bot.utils.tag_index import TagIndex
+
+TAGS = ["Array", "Binary Search", "Dynamic Programming", "Graph", "Prefix Sum", "Sorting", "Binary Tree", "Search"]
+
+
+def test_matches_rank_exact_then_prefix_then_word_prefix_then_substring():
+    index = TagIndex(TAGS)
+
+    assert index.search("search") == ["Search", "Binary Search"]
+    assert index.search("bin") == ["Binary Search", "Binary Tree"]
+    assert index.search("ar") == ["Array", "Binary Search", "Binary Tree", "Search"]
+    assert index.search("gram") == ["Dynamic Programming"]
+
+
+def test_search_is_case_insensitive_and_trims_query():
+    index = TagIndex(TAGS)
+
+    assert index.search("  SORT ") == ["Sorting"]
+    assert index.search("ing") == ["Dynamic Programming", "Sorting"]
+
+
+def test_empty_query_lists_tags_in_catalog_order_up_to_limit():
+    index = TagIndex(TAGS + ["Array"])
+
+    assert index.search("", limit=3) == ["Array", "Binary Search", "Dynamic Programming"]
+    assert len(index) == len(TAGS)
+
+
+def test_no_match_and_limit():
+    index = TagIndex([f"Tag{i}" for i in range(50)])
+
+    assert index.search("xyz") == []
+    assert len(index.search("tag")) == 25
+    assert index.search("tag1", limit=3) == ["Tag1", "Tag10", "Tag11"]